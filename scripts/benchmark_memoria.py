@@ -0,0 +1,184 @@
+"""
+Módulo benchmark_memoria.py
+===========================
+Script para medir cuánta memoria ocupa cada producto del inventario de
+AgroCol SAS según la forma en que se guarda.
+
+Representaciones que se comparan:
+---------------------------------
+- Producto con __dict__  : cómo era Producto antes de usar __slots__
+                           (referencia armada con los mismos atributos)
+- Producto con __slots__ : la clase Producto actual
+- ResumenProducto        : tupla liviana de la carga perezosa
+- AlmacenColumnar        : una fila del almacén por columnas
+
+¿Cómo ejecutar este archivo?
+-----------------------------
+Desde la carpeta raíz del proyecto:
+    python -m scripts.benchmark_memoria
+    python -m scripts.benchmark_memoria 200000   (cantidad de productos)
+
+¿Qué se mide?
+-------------
+Los textos de cada producto (código, nombre, fecha) se crean ANTES de medir
+y son los mismos para todas las representaciones, así que la diferencia que
+se ve es solo lo que cuesta guardarlos: el objeto, su __dict__, la fila, etc.
+Los números sí se crean al medir (como float), igual que al leer el JSON:
+los objetos guardan un float por atributo y el almacén columnar no.
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# ==================== IMPORTACIONES ====================
+
+import sys          # Para leer argumentos de la línea de comandos
+import tracemalloc  # Para medir la memoria usada
+
+# Importar las clases necesarias desde nuestros módulos
+from src.modelos import Proveedor, Producto, ResumenProducto, AlmacenColumnar
+
+
+# ==================== CLASE DE REFERENCIA ====================
+
+def crear_clase_con_diccionario(clase: type) -> type:
+    """
+    Crea una clase común (con __dict__) con los mismos atributos que otra
+    =====================================================================
+    Sirve de referencia del "antes": los objetos guardan los mismos
+    atributos que la clase con __slots__, pero en su __dict__.
+
+    Parámetros:
+    -----------
+    clase : type
+        Clase con __slots__ (Producto o Proveedor)
+
+    Retorna:
+    --------
+    type : Clase nueva cuyo constructor recibe los valores en el orden de __slots__
+    """
+    nombres = clase.__slots__
+
+    def __init__(self, *valores):
+        # setattr en el mismo orden en todas las instancias, igual que un
+        # constructor normal (así Python comparte las claves entre objetos)
+        for nombre, valor in zip(nombres, valores):
+            setattr(self, nombre, valor)
+
+    return type(clase.__name__ + "ConDiccionario", (), {'__init__': __init__})
+
+
+# ==================== DATOS DE PRUEBA ====================
+
+def crear_datos(cantidad: int) -> list[tuple]:
+    """
+    Crea los datos de los productos (sin medir su memoria)
+    ======================================================
+
+    Parámetros:
+    -----------
+    cantidad : int
+        Cantidad de productos
+
+    Retorna:
+    --------
+    list[tuple] : (codigo, nombre, unidad, fecha, precio, cantidad, stock_minimo)
+                  con los números como int (se convierten a float al medir)
+    """
+    unidades = ["kg", "litros", "unidades", "bultos"]
+    return [(f"PROD{i:07d}", f"Insumo agrícola número {i}", unidades[i % len(unidades)],
+             f"2025-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}", 1000 + (i * 37) % 90000,
+             (i * 13) % 500, 20)
+            for i in range(cantidad)]
+
+
+# ==================== MEDICIÓN ====================
+
+def medir_bytes(funcion) -> int:
+    """
+    Retorna los bytes que quedan ocupados después de ejecutar la función
+    ====================================================================
+    El resultado de la función se conserva mientras se mide, para que
+    su memoria cuente.
+
+    Parámetros:
+    -----------
+    funcion : función sin parámetros
+        Función que crea la estructura a medir
+
+    Retorna:
+    --------
+    int : Bytes ocupados por lo que creó la función
+    """
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcion()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del resultado
+    return despues - antes
+
+
+def ejecutar_benchmark(cantidad: int = 100000):
+    """
+    Compara la memoria por producto de cada representación
+    ======================================================
+
+    Parámetros:
+    -----------
+    cantidad : int, opcional
+        Cantidad de productos a crear
+    """
+    print("="*70)
+    print("BENCHMARK DE MEMORIA POR PRODUCTO - AGROCOL SAS")
+    print("="*70)
+
+    print(f"\n📦 Preparando los datos de {cantidad} productos...")
+    datos = crear_datos(cantidad)
+    proveedor = Proveedor("PROV0001", "Agrícola del Valle", "3001234567", "ventas@valle.com")
+    ProductoConDiccionario = crear_clase_con_diccionario(Producto)
+
+    def con_diccionario():
+        # Mismo orden de atributos que Producto.__slots__
+        return [ProductoConDiccionario(c, n, u, f, proveedor, float(p), float(q),
+                                       float(m), False, None)
+                for c, n, u, f, p, q, m in datos]
+
+    def con_slots():
+        return [Producto(c, n, u, f, proveedor, float(p), float(q), float(m))
+                for c, n, u, f, p, q, m in datos]
+
+    def resumenes():
+        return [ResumenProducto(c, n, u, f, proveedor.id_proveedor,
+                                float(p), float(q), float(m))
+                for c, n, u, f, p, q, m in datos]
+
+    def columnar():
+        almacen = AlmacenColumnar()
+        for c, n, u, f, p, q, m in datos:
+            almacen[c] = ResumenProducto(c, n, u, f, proveedor.id_proveedor,
+                                         float(p), float(q), float(m))
+        return almacen
+
+    mediciones = {
+        'Producto con __dict__': medir_bytes(con_diccionario),
+        'Producto con __slots__': medir_bytes(con_slots),
+        'ResumenProducto': medir_bytes(resumenes),
+        'AlmacenColumnar (fila)': medir_bytes(columnar),
+    }
+
+    print("\n🧠 Memoria por producto (sin contar los textos, que son los mismos):")
+    print("-" * 70)
+    base = mediciones['Producto con __dict__']
+    for nombre, total in mediciones.items():
+        print(f"  {nombre:<26} {total / cantidad:>8.1f} bytes {total / base:>8.0%}")
+
+    print("\n" + "="*70)
+
+
+# ==================== PUNTO DE ENTRADA ====================
+
+if __name__ == "__main__":
+    # El primer argumento (opcional) es la cantidad de productos
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ejecutar_benchmark(cantidad)
@@ -0,0 +1,233 @@
+"""
+Módulo benchmark_persistencia.py
+================================
+Script para medir el costo de guardar y cargar el inventario de AgroCol SAS
+con cada perfil de salida del GestorPersistencia.
+
+Perfiles que se comparan:
+-------------------------
+- legible : JSON con sangría (indent=4), el formato de siempre
+- compacto: JSON sin espacios ni saltos de línea
+- gzip    : JSON compacto comprimido con gzip (.json.gz)
+
+¿Cómo ejecutar este archivo?
+-----------------------------
+Desde la carpeta raíz del proyecto:
+    python -m scripts.benchmark_persistencia
+    python -m scripts.benchmark_persistencia 20000   (cantidad de productos)
+
+¿Qué hace este archivo?
+------------------------
+1. Crea un catálogo sintético con muchos productos y proveedores
+2. Lo guarda y lo vuelve a cargar con cada perfil (en una carpeta temporal)
+3. Muestra los bytes en disco y el tiempo de guardado y de carga
+4. Compara la memoria máxima de la carga por bloques (la que usa el
+   GestorPersistencia) con la carga de siempre (json.load + from_dict)
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# ==================== IMPORTACIONES ====================
+
+import json         # Para la carga de siempre (json.load)
+import os           # Para rutas y tamaño de archivos
+import sys          # Para leer argumentos de la línea de comandos
+import tempfile     # Para crear una carpeta temporal que se borra sola
+import time         # Para medir tiempos
+import tracemalloc  # Para medir la memoria máxima usada
+
+# Importar las clases necesarias desde nuestros módulos
+from src.modelos import Proveedor, Producto, Inventario
+from src.persistencia import GestorPersistencia
+
+
+# ==================== DATOS SINTÉTICOS ====================
+
+def crear_inventario_sintetico(cantidad_productos: int = 5000,
+                               cantidad_proveedores: int = 50) -> Inventario:
+    """
+    Crea un inventario grande con datos inventados
+    ==============================================
+
+    Parámetros:
+    -----------
+    cantidad_productos : int, opcional
+        Cantidad de productos a crear (por defecto 5000)
+    cantidad_proveedores : int, opcional
+        Cantidad de proveedores a crear (por defecto 50)
+
+    Retorna:
+    --------
+    Inventario : Inventario con los datos generados
+    """
+    inventario = Inventario()
+
+    proveedores = []
+    for i in range(cantidad_proveedores):
+        proveedor = Proveedor(f"PROV{i:04d}", f"Proveedor Agrícola {i}",
+                              f"300{i:07d}", f"ventas{i}@proveedor.com")
+        inventario.agregar_proveedor(proveedor)
+        proveedores.append(proveedor)
+
+    unidades = ["kg", "litros", "unidades", "bultos"]
+    for i in range(cantidad_productos):
+        producto = Producto(
+            codigo=f"PROD{i:06d}",
+            nombre=f"Insumo agrícola número {i}",
+            unidad_medida=unidades[i % len(unidades)],
+            fecha_ingreso=f"2025-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}",
+            proveedor=proveedores[i % len(proveedores)],
+            precio_costo=1000 + (i * 37) % 90000,
+            cantidad=(i * 13) % 500,
+            stock_minimo=20
+        )
+        inventario.agregar_producto(producto)
+
+    # El inventario recién creado no tiene cambios pendientes que medir
+    inventario.confirmar_cambios_guardados()
+    return inventario
+
+
+# ==================== MEDICIÓN ====================
+
+def medir_perfil(inventario: Inventario, carpeta: str, formato: str,
+                 repeticiones: int = 3) -> dict:
+    """
+    Guarda y carga el inventario con un perfil y mide el resultado
+    ==============================================================
+    Se toma el MEJOR tiempo de varias repeticiones, para que no influya
+    lo que esté haciendo el computador en ese momento.
+
+    Parámetros:
+    -----------
+    inventario : Inventario
+        Inventario a guardar
+    carpeta : str
+        Carpeta donde se escriben los archivos
+    formato : str
+        Perfil de salida ('legible', 'compacto' o 'gzip')
+    repeticiones : int, opcional
+        Cuántas veces se repite cada medición
+
+    Retorna:
+    --------
+    dict : Bytes en disco y tiempos (en milisegundos) de guardado y carga
+    """
+    extension = ".json.gz" if formato == 'gzip' else ".json"
+    ruta = os.path.join(carpeta, f"inventario_{formato}{extension}")
+    gestor = GestorPersistencia(ruta, formato=formato)
+
+    mejor_guardado = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        gestor.guardar_inventario(inventario)
+        mejor_guardado = min(mejor_guardado, time.perf_counter() - inicio)
+
+    mejor_carga = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        cargado = gestor.cargar_inventario()
+        mejor_carga = min(mejor_carga, time.perf_counter() - inicio)
+
+    # Verificar que no se perdió nada en el camino
+    assert cargado is not None
+    assert cargado.obtener_cantidad_total_productos() == inventario.obtener_cantidad_total_productos()
+
+    return {
+        'bytes': os.path.getsize(ruta),
+        'guardar_ms': mejor_guardado * 1000,
+        'cargar_ms': mejor_carga * 1000
+    }
+
+
+def medir_memoria_carga(inventario: Inventario, carpeta: str) -> dict:
+    """
+    Mide la memoria máxima usada al cargar el inventario
+    ====================================================
+    tracemalloc registra cuánta memoria pide Python; el "pico" es el máximo
+    alcanzado durante la carga.
+
+    Parámetros:
+    -----------
+    inventario : Inventario
+        Inventario a guardar y volver a cargar
+    carpeta : str
+        Carpeta donde se escribe el archivo
+
+    Retorna:
+    --------
+    dict : Pico de memoria (en MB) de cada forma de cargar
+    """
+    ruta = os.path.join(carpeta, "inventario_memoria.json")
+    gestor = GestorPersistencia(ruta)
+    gestor.guardar_inventario(inventario)
+
+    def pico_mb(funcion) -> float:
+        tracemalloc.start()
+        resultado = funcion()
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del resultado
+        return pico / (1024 * 1024)
+
+    def carga_completa():
+        # La carga de siempre: todo el JSON en diccionarios y luego los objetos
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            return Inventario.from_dict(json.load(archivo))
+
+    return {
+        'json.load + from_dict': pico_mb(carga_completa),
+        'por bloques (gestor)': pico_mb(gestor.cargar_inventario)
+    }
+
+
+# ==================== FUNCIÓN PRINCIPAL ====================
+
+def ejecutar_benchmark(cantidad_productos: int = 5000):
+    """
+    Compara todos los perfiles de salida y muestra una tabla
+    ========================================================
+
+    Parámetros:
+    -----------
+    cantidad_productos : int, opcional
+        Tamaño del catálogo sintético
+    """
+    print("="*70)
+    print("BENCHMARK DE PERSISTENCIA - AGROCOL SAS")
+    print("="*70)
+
+    print(f"\n📦 Generando {cantidad_productos} productos sintéticos...")
+    inventario = crear_inventario_sintetico(cantidad_productos)
+
+    print("\n⏱️  Midiendo cada perfil (mejor de 3 repeticiones)...")
+    print("-" * 70)
+    print(f"  {'Perfil':<10} {'Bytes':>14} {'Relativo':>10} {'Guardar':>12} {'Cargar':>12}")
+    print("-" * 70)
+
+    # TemporaryDirectory borra la carpeta y sus archivos al terminar
+    with tempfile.TemporaryDirectory() as carpeta:
+        resultados = {formato: medir_perfil(inventario, carpeta, formato)
+                      for formato in GestorPersistencia.FORMATOS}
+        memoria = medir_memoria_carga(inventario, carpeta)
+
+    base = resultados['legible']['bytes']
+    for formato, r in resultados.items():
+        print(f"  {formato:<10} {r['bytes']:>14,} {r['bytes'] / base:>9.0%} "
+              f"{r['guardar_ms']:>9.1f} ms {r['cargar_ms']:>9.1f} ms")
+
+    print("\n🧠 Memoria máxima al cargar (perfil legible):")
+    print("-" * 70)
+    for forma, pico in memoria.items():
+        print(f"  {forma:<24} {pico:>10.1f} MB")
+
+    print("\n" + "="*70)
+
+
+# ==================== PUNTO DE ENTRADA ====================
+
+if __name__ == "__main__":
+    # El primer argumento (opcional) es la cantidad de productos
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ejecutar_benchmark(cantidad)
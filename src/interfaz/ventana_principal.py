@@ -38,6 +38,9 @@ from tkinter import ttk, messagebox, simpledialog
 # Importar datetime: para trabajar con fechas y horas
 from datetime import datetime
 
+# Importar os: para leer la configuración de guardado (variables de entorno)
+import os
+
 # Importar typing: para especificar tipos de datos (ayuda a prevenir errores)
 from typing import Optional
 
@@ -45,7 +48,11 @@ from typing import Optional
 from ..modelos.producto import Producto
 from ..modelos.proveedor import Proveedor
 from ..modelos.inventario import Inventario
+from ..modelos.resumen_producto import ResumenProducto
+from ..modelos.consulta import Filtro
 from ..persistencia.persistencia import GestorPersistencia
+from ..persistencia.trabajador import TrabajadorGuardado
+from ..persistencia.planificador import PlanificadorGuardado
 
 
 # ==================== CLASE VENTANA PRINCIPAL ====================
@@ -75,6 +82,9 @@ class VentanaPrincipal:
     - tabla_productos: La tabla donde se muestran los productos
     """
 
+    # Cantidad de productos que se agregan a la tabla por página
+    TAMANO_PAGINA = 200
+
     def __init__(self, root: tk.Tk):
         """
         Constructor de la clase
@@ -112,7 +122,11 @@ class VentanaPrincipal:
         # ========== INICIALIZAR GESTOR DE PERSISTENCIA E INVENTARIO ==========
 
         # Crear el objeto que maneja guardar/cargar datos
-        self.gestor_persistencia = GestorPersistencia()
+        # modo_diario=True: cada guardado solo agrega los cambios nuevos al
+        # diario en lugar de reescribir todo el archivo JSON
+        # carga_perezosa=True: al abrir solo se leen los datos de cada producto;
+        # el objeto Producto completo se crea cuando se edita o se consulta
+        self.gestor_persistencia = GestorPersistencia(modo_diario=True, carga_perezosa=True)
 
         # Intentar cargar el inventario desde el archivo
         self.inventario = self.gestor_persistencia.cargar_inventario()
@@ -125,6 +139,23 @@ class VentanaPrincipal:
             messagebox.showwarning("Advertencia",
                                    "No se pudo cargar el inventario. Se creará uno nuevo.")
 
+        # Los guardados se escriben en un hilo aparte para que la ventana
+        # no se congele mientras se escribe el archivo
+        self.trabajador_guardado = TrabajadorGuardado(self.gestor_persistencia,
+                                                      al_terminar=self._al_terminar_guardado)
+
+        # El planificador decide cuándo guardar: por defecto espera 500 ms sin
+        # cambios, así una ráfaga de movimientos de stock produce un solo
+        # guardado. Cada instalación puede elegir otra política con la
+        # variable de entorno AGROCOL_GUARDADO (ej: "inmediato", "lotes:50:10")
+        politica = os.environ.get('AGROCOL_GUARDADO', 'debounce:500')
+        try:
+            self.planificador_guardado = PlanificadorGuardado.desde_texto(
+                self.trabajador_guardado, politica)
+        except ValueError as e:
+            print(f"{str(e)}. Se usará la política inmediato.")
+            self.planificador_guardado = PlanificadorGuardado(self.trabajador_guardado)
+
         # ========== CONFIGURAR Y CREAR LA INTERFAZ ==========
 
         # Configurar los colores y fuentes de la aplicación
@@ -144,6 +175,9 @@ class VentanaPrincipal:
         # Verificar si hay productos con stock bajo y mostrar alerta
         self.verificar_alertas_stock()
 
+        # Empezar a revisar periódicamente los guardados terminados
+        self._revisar_guardados()
+
     def configurar_estilo(self):
         """
         Configurar el estilo visual de la aplicación
@@ -207,7 +241,7 @@ class VentanaPrincipal:
         menubar.add_cascade(label="Archivo", menu=menu_archivo)
 
         # Agregar opciones al menú Archivo
-        menu_archivo.add_command(label="Guardar", command=self.guardar_inventario)
+        menu_archivo.add_command(label="Guardar", command=self.guardar_inventario_ahora)
         menu_archivo.add_command(label="Crear Backup", command=self.crear_backup)
         menu_archivo.add_separator()  # Línea separadora
         menu_archivo.add_command(label="Salir", command=self.salir)
@@ -286,13 +320,16 @@ class VentanaPrincipal:
         # Etiqueta "Buscar:"
         ttk.Label(frame_controles, text="Buscar:").grid(row=0, column=0, padx=5)
 
-        # Campo de texto para búsqueda
-        self.entry_busqueda = ttk.Entry(frame_controles, width=30)
+        # Campo de texto para búsqueda (un Combobox: se escribe igual que en
+        # un Entry y además despliega códigos sugeridos)
+        self.entry_busqueda = ttk.Combobox(frame_controles, width=30)
         self.entry_busqueda.grid(row=0, column=1, padx=5)
 
         # Asociar el evento KeyRelease (cuando se suelta una tecla) con buscar_productos
         # Esto hace que busque automáticamente mientras escribimos
         self.entry_busqueda.bind('<KeyRelease>', self.buscar_productos)
+        # Al elegir un código sugerido, buscar ese código
+        self.entry_busqueda.bind('<<ComboboxSelected>>', self.buscar_productos)
 
         # ========== BOTONES DE ACCIÓN ==========
 
@@ -362,6 +399,26 @@ class VentanaPrincipal:
         scrollbar_y.grid(row=0, column=1, sticky=(tk.N, tk.S))
         scrollbar_x.grid(row=1, column=0, sticky=(tk.W, tk.E))
 
+        # ========== PAGINACIÓN ==========
+
+        # La tabla muestra los productos por páginas (ver actualizar_tabla_productos):
+        # este botón agrega la página siguiente al final de la tabla
+        frame_paginacion = ttk.Frame(frame_tabla)
+        frame_paginacion.grid(row=2, column=0, sticky=tk.W, pady=5)
+
+        self.boton_mostrar_mas = ttk.Button(frame_paginacion, text="Mostrar más",
+                                            command=self.mostrar_mas_productos)
+        self.boton_mostrar_mas.grid(row=0, column=0, padx=5)
+
+        # Etiqueta: cuántas filas hay en la tabla
+        self.label_filas = ttk.Label(frame_paginacion, text="")
+        self.label_filas.grid(row=0, column=1, padx=5)
+
+        # Estado de la paginación: filtro de la tabla (None = todos) y cursor
+        # de la página siguiente (None = no hay más)
+        self.filtro_tabla = None
+        self.cursor_tabla = None
+
         # ========== FRAME DE ESTADÍSTICAS ==========
 
         # Crear contenedor para las estadísticas en la parte inferior
@@ -384,7 +441,11 @@ class VentanaPrincipal:
                                        foreground='red')
         self.label_alertas.grid(row=0, column=2, padx=10)
 
-    def actualizar_tabla_productos(self, productos: list = None):
+        # Etiqueta: Estado del último guardado (se actualiza al terminar cada uno)
+        self.label_guardado = ttk.Label(frame_estadisticas, text="")
+        self.label_guardado.grid(row=0, column=3, padx=10)
+
+    def actualizar_tabla_productos(self, productos: list = None, filtro: Filtro = None):
         """
         Actualizar la tabla de productos
         =================================
@@ -394,52 +455,40 @@ class VentanaPrincipal:
         Parámetros:
         ----------
         productos : list, opcional
-            Lista de productos a mostrar. Si es None, muestra todos los productos.
+            Lista de productos a mostrar (se muestran todos de una vez).
+        filtro : Filtro, opcional
+            Si no se pasa una lista, mostrar solo los productos que cumplen
+            este filtro. Si ambos son None, se muestran todos los productos.
 
         ¿Qué hace?
         ----------
         1. Limpia todos los elementos actuales de la tabla
-        2. Obtiene la lista de productos a mostrar
-        3. Por cada producto, crea una fila en la tabla
+        2. Si se pasó una lista, la muestra completa
+        3. Si no, muestra solo la PRIMERA PÁGINA de productos (ordenados por
+           código); el botón "Mostrar más" agrega las siguientes. Así abrir
+           un catálogo grande no copia ni inserta todos los productos
         4. Si un producto está bajo stock, lo marca en rojo
         5. Actualiza las estadísticas
         """
         # ========== LIMPIAR TABLA ==========
 
         # Eliminar todos los elementos actuales de la tabla
-        for item in self.tabla_productos.get_children():
-            self.tabla_productos.delete(item)
-
-        # ========== OBTENER PRODUCTOS A MOSTRAR ==========
-
-        # Si no se especificó una lista, obtener todos los productos
-        if productos is None:
-            productos = self.inventario.listar_productos()
+        self.tabla_productos.delete(*self.tabla_productos.get_children())
 
         # ========== AGREGAR PRODUCTOS A LA TABLA ==========
 
-        # Por cada producto en la lista
-        for producto in productos:
-            # Crear tupla con los valores a mostrar en cada columna
-            valores = (
-                producto.codigo,
-                producto.nombre,
-                f"{producto.cantidad:.2f}",  # :.2f formatea a 2 decimales
-                producto.unidad_medida,
-                f"{producto.stock_minimo:.2f}",
-                f"${producto.precio_costo:,.2f}",  # :,.2f agrega comas como separador de miles
-                f"${producto.valor_total_inventario():,.2f}",
-                producto.proveedor.nombre,
-                producto.fecha_ingreso
-            )
-
-            # Verificar si el producto está bajo stock
-            if producto.esta_bajo_stock():
-                # Insertar fila con tag 'bajo_stock' para colorearla
-                item = self.tabla_productos.insert('', 'end', values=valores, tags=('bajo_stock',))
-            else:
-                # Insertar fila normal
-                item = self.tabla_productos.insert('', 'end', values=valores)
+        if productos is not None:
+            # Lista ya armada (por ejemplo, la búsqueda aproximada): sin páginas
+            self.filtro_tabla = None
+            self.cursor_tabla = None
+            for producto in productos:
+                self._insertar_fila(ResumenProducto.desde_producto(producto))
+            self._actualizar_paginacion()
+        else:
+            # Empezar desde la primera página
+            self.filtro_tabla = filtro
+            self.cursor_tabla = None
+            self.mostrar_mas_productos()
 
         # ========== CONFIGURAR COLORES ==========
 
@@ -450,6 +499,76 @@ class VentanaPrincipal:
 
         self.actualizar_estadisticas()
 
+    def mostrar_mas_productos(self):
+        """
+        Agregar a la tabla la página siguiente de productos
+        ===================================================
+
+        Pide al inventario solo TAMANO_PAGINA productos, a partir del cursor
+        de la página anterior. El cursor recuerda el último código mostrado,
+        así que aunque se agreguen o eliminen productos entre una página y
+        otra, ninguno se repite ni se salta.
+        """
+        # Sin cursor y con filas en la tabla: ya se mostró la última página
+        # (sin cursor y con la tabla vacía: se pide la primera)
+        if self.cursor_tabla is None and self.tabla_productos.get_children():
+            return
+
+        pagina = self.inventario.listar_pagina(self.TAMANO_PAGINA, self.cursor_tabla,
+                                               self.filtro_tabla)
+        for resumen in pagina.productos:
+            self._insertar_fila(resumen)
+
+        # Guardar el cursor para la próxima página (None = ya no hay más)
+        self.cursor_tabla = pagina.siguiente
+        self._actualizar_paginacion()
+
+    def _insertar_fila(self, producto: ResumenProducto):
+        """
+        Insertar una fila en la tabla con los datos de un producto
+        ==========================================================
+
+        Parámetros:
+        ----------
+        producto : ResumenProducto
+            Datos del producto a mostrar
+        """
+        # El resumen solo tiene el ID del proveedor; el nombre sale del inventario
+        proveedor = self.inventario.obtener_proveedor(producto.id_proveedor)
+
+        # Crear tupla con los valores a mostrar en cada columna
+        valores = (
+            producto.codigo,
+            producto.nombre,
+            f"{producto.cantidad:.2f}",  # :.2f formatea a 2 decimales
+            producto.unidad_medida,
+            f"{producto.stock_minimo:.2f}",
+            f"${producto.precio_costo:,.2f}",  # :,.2f agrega comas como separador de miles
+            f"${producto.valor_total_inventario():,.2f}",
+            proveedor.nombre if proveedor is not None else producto.id_proveedor,
+            producto.fecha_ingreso
+        )
+
+        # Verificar si el producto está bajo stock
+        if producto.esta_bajo_stock():
+            # Insertar fila con tag 'bajo_stock' para colorearla
+            self.tabla_productos.insert('', 'end', values=valores, tags=('bajo_stock',))
+        else:
+            # Insertar fila normal
+            self.tabla_productos.insert('', 'end', values=valores)
+
+    def _actualizar_paginacion(self):
+        """
+        Actualizar el botón "Mostrar más" y la cantidad de filas mostradas
+        """
+        filas = len(self.tabla_productos.get_children())
+        if self.cursor_tabla is None:
+            self.boton_mostrar_mas.state(['disabled'])
+            self.label_filas.config(text=f"Mostrando {filas} productos")
+        else:
+            self.boton_mostrar_mas.state(['!disabled'])
+            self.label_filas.config(text=f"Mostrando {filas} productos (hay más)")
+
     def actualizar_estadisticas(self):
         """
         Actualizar las etiquetas de estadísticas
@@ -460,10 +579,11 @@ class VentanaPrincipal:
         - Valor total del inventario
         - Cantidad de productos bajo stock
         """
-        # Obtener los valores actuales del inventario
+        # Obtener los valores actuales del inventario (el inventario mantiene
+        # estos totales al día con cada cambio: no recorre los productos)
         total_productos = self.inventario.obtener_cantidad_total_productos()
         valor_total = self.inventario.obtener_valor_total_inventario()
-        productos_bajo_stock = len(self.inventario.obtener_productos_bajo_stock())
+        productos_bajo_stock = self.inventario.obtener_cantidad_bajo_stock()
 
         # Actualizar el texto de cada etiqueta
         self.label_total_productos.config(text=f"Total de productos: {total_productos}")
@@ -485,14 +605,21 @@ class VentanaPrincipal:
         # Obtener el texto del campo de búsqueda
         termino = self.entry_busqueda.get()
 
+        # Sugerir códigos que empiezan con lo escrito (autocompletado)
+        self.entry_busqueda['values'] = self.inventario.autocompletar_codigo(termino)
+
         # Si el campo está vacío, mostrar todos los productos
         if termino.strip() == "":
             self.actualizar_tabla_productos()
         else:
-            # Buscar productos que coincidan con el término
-            productos = self.inventario.buscar_productos(termino)
-            # Actualizar la tabla solo con los productos encontrados
-            self.actualizar_tabla_productos(productos)
+            # Mostrar (por páginas) los productos que coincidan con el término
+            # (sin importar tildes: "organico" también encuentra "Orgánico")
+            self.actualizar_tabla_productos(filtro=Filtro.texto(termino, ignorar_acentos=True))
+            # Si no hay coincidencias exactas, puede ser un error de escritura:
+            # mostrar los productos más parecidos
+            if not self.tabla_productos.get_children():
+                self.actualizar_tabla_productos(
+                    self.inventario.buscar_productos_aproximado(termino))
 
     def abrir_ventana_agregar_producto(self):
         """
@@ -602,8 +729,9 @@ class VentanaPrincipal:
                                             minvalue=0.01)
             if cantidad:
                 try:
-                    # Agregar stock al producto
-                    producto.agregar_stock(cantidad)
+                    # Agregar stock al producto (a través del inventario para
+                    # que el movimiento quede registrado como cambio pendiente)
+                    self.inventario.agregar_stock(producto.codigo, cantidad)
 
                     # Guardar y actualizar
                     self.guardar_inventario()
@@ -639,8 +767,9 @@ class VentanaPrincipal:
                                             minvalue=0.01)
             if cantidad:
                 try:
-                    # Retirar stock del producto
-                    producto.retirar_stock(cantidad)
+                    # Retirar stock del producto (a través del inventario para
+                    # que el movimiento quede registrado como cambio pendiente)
+                    self.inventario.retirar_stock(producto.codigo, cantidad)
 
                     # Guardar y actualizar
                     self.guardar_inventario()
@@ -669,7 +798,8 @@ class VentanaPrincipal:
         ========================================
 
         Crea una ventana emergente con una tabla mostrando todos los productos
-        que tienen una cantidad menor a su stock mínimo.
+        que tienen una cantidad menor a su stock mínimo, del más crítico al
+        menos crítico.
         """
         # Obtener productos bajo stock
         productos = self.inventario.obtener_productos_bajo_stock()
@@ -722,11 +852,31 @@ class VentanaPrincipal:
         Muestra un cuadro de diálogo con estadísticas generales del inventario.
         """
         # Obtener estadísticas
-        total_productos = self.inventario.obtener_cantidad_total_productos()
-        valor_total = self.inventario.obtener_valor_total_inventario()
-        productos_bajo_stock = len(self.inventario.obtener_productos_bajo_stock())
+        estadisticas = self.inventario.obtener_estadisticas()
+        total_productos = estadisticas['total_productos']
+        valor_total = estadisticas['valor_total']
+        productos_bajo_stock = estadisticas['productos_bajo_stock']
         total_proveedores = len(self.inventario.listar_proveedores())
 
+        # Valor por proveedor (de mayor a menor, los 5 primeros)
+        valor_por_proveedor = sorted(estadisticas['valor_por_proveedor'].items(),
+                                     key=lambda item: item[1], reverse=True)[:5]
+        lineas_proveedores = ""
+        for id_proveedor, valor in valor_por_proveedor:
+            proveedor = self.inventario.obtener_proveedor(id_proveedor)
+            nombre = proveedor.nombre if proveedor is not None else id_proveedor
+            lineas_proveedores += f"  - {nombre}: ${valor:,.2f}\n"
+
+        # Cantidad total por unidad de medida
+        lineas_unidades = ""
+        for unidad, cantidad in estadisticas['cantidad_por_unidad'].items():
+            lineas_unidades += f"  - {unidad}: {cantidad:,.2f}\n"
+
+        # Percentiles del valor de cada producto
+        lineas_percentiles = ""
+        for percentil, valor in estadisticas['percentiles_valor'].items():
+            lineas_percentiles += f"  - P{percentil}: ${valor:,.2f}\n"
+
         # Crear mensaje con formato
         mensaje = f"""
 RESUMEN DEL INVENTARIO - AgroCol SAS
@@ -738,6 +888,12 @@ Productos bajo stock: {productos_bajo_stock}
 
 Valor total del inventario: ${valor_total:,.2f}
 
+Proveedores con mayor valor en stock:
+{lineas_proveedores}
+Cantidad por unidad de medida:
+{lineas_unidades}
+Valor por producto (percentiles):
+{lineas_percentiles}
 Fecha del reporte: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
         """
 
@@ -774,8 +930,10 @@ Fecha del reporte: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
 
         # Llenar lista
         for proveedor in proveedores:
-            productos = self.inventario.obtener_productos_por_proveedor(proveedor.id_proveedor)
-            lista_proveedores.insert(tk.END, f"{proveedor.nombre} ({len(productos)} productos)")
+            # Solo se necesita cuántos productos tiene (O(1), sin crearlos)
+            cantidad = self.inventario.obtener_cantidad_productos_por_proveedor(
+                proveedor.id_proveedor)
+            lista_proveedores.insert(tk.END, f"{proveedor.nombre} ({cantidad} productos)")
 
         def mostrar_detalle():
             """Función interna para mostrar detalle del proveedor seleccionado"""
@@ -800,17 +958,18 @@ Fecha del reporte: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
         Muestra una advertencia si hay productos con stock bajo.
         Se ejecuta al iniciar la aplicación y después de retirar stock.
         """
-        productos_bajo_stock = self.inventario.obtener_productos_bajo_stock()
+        total_bajo_stock = self.inventario.obtener_cantidad_bajo_stock()
 
-        if productos_bajo_stock:
+        if total_bajo_stock:
             mensaje = "Los siguientes productos están bajo stock:\n\n"
 
-            # Mostrar solo los primeros 5 para no saturar
-            for producto in productos_bajo_stock[:5]:
+            # Mostrar solo los 5 más críticos para no saturar (el inventario
+            # los tiene ordenados, así que no se recorre la lista completa)
+            for producto in self.inventario.obtener_productos_bajo_stock(cantidad=5):
                 mensaje += f"- {producto.nombre}: {producto.cantidad} {producto.unidad_medida}\n"
 
-            if len(productos_bajo_stock) > 5:
-                mensaje += f"\n... y {len(productos_bajo_stock) - 5} más"
+            if total_bajo_stock > 5:
+                mensaje += f"\n... y {total_bajo_stock - 5} más"
 
             messagebox.showwarning("Alerta de Stock Bajo", mensaje)
 
@@ -819,19 +978,70 @@ Fecha del reporte: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
         Guardar el inventario en el archivo
         ===================================
 
-        Usa el gestor de persistencia para guardar todos los datos
-        del inventario en el archivo JSON.
+        Avisa al planificador que el inventario cambió. El planificador pide
+        el guardado según su política (de inmediato, tras una pausa o por
+        lotes) y el trabajador lo escribe en segundo plano. El método
+        retorna enseguida; el resultado se informa en _al_terminar_guardado.
 
         Retorna:
         -------
         bool
-            True si se guardó correctamente, False si hubo error
+            True (el guardado quedó programado)
         """
-        if self.gestor_persistencia.guardar_inventario(self.inventario):
-            return True
+        self.planificador_guardado.registrar_cambio(self.inventario)
+        self._mostrar_guardado_pendiente()
+        return True
+
+    def guardar_inventario_ahora(self):
+        """
+        Guardar el inventario sin esperar a la política
+        ===============================================
+
+        Se usa desde el menú Archivo > Guardar.
+        """
+        self.planificador_guardado.registrar_cambio(self.inventario)
+        self.planificador_guardado.guardar_ahora()
+        self._mostrar_guardado_pendiente()
+
+    def _mostrar_guardado_pendiente(self):
+        """
+        Indicar en la barra inferior que hay un guardado en camino
+        """
+        if (self.planificador_guardado.hay_cambios_sin_guardar()
+                or self.trabajador_guardado.hay_guardado_pendiente()):
+            self.label_guardado.config(text="Guardando...", foreground='gray')
+
+    def _revisar_guardados(self):
+        """
+        Revisar si terminó algún guardado en segundo plano
+        ==================================================
+
+        Tkinter no se puede usar desde otro hilo, así que la ventana pregunta
+        cada 100 ms si el trabajador terminó. root.after() programa la
+        siguiente revisión sin bloquear la interfaz.
+        """
+        self.planificador_guardado.revisar()
+        self.trabajador_guardado.procesar()
+        self.root.after(100, self._revisar_guardados)
+
+    def _al_terminar_guardado(self, exito: bool, error: Optional[str]):
+        """
+        Mostrar el resultado de un guardado en segundo plano
+        ====================================================
+
+        Parámetros:
+        ----------
+        exito : bool
+            True si el inventario se escribió correctamente
+        error : str | None
+            Mensaje de error si el guardado falló
+        """
+        if exito:
+            hora = datetime.now().strftime("%H:%M:%S")
+            self.label_guardado.config(text=f"Guardado a las {hora}", foreground='green')
         else:
-            messagebox.showerror("Error", "No se pudo guardar el inventario")
-            return False
+            self.label_guardado.config(text="Error al guardar", foreground='red')
+            messagebox.showerror("Error", f"No se pudo guardar el inventario:\n{error}")
 
     def crear_backup(self):
         """
@@ -840,6 +1050,10 @@ Fecha del reporte: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
 
         Crea una copia de seguridad del archivo de inventario con la fecha actual.
         """
+        # Escribir los guardados programados, para respaldar el inventario
+        # tal como está ahora
+        self.planificador_guardado.vaciar()
+
         if self.gestor_persistencia.crear_backup():
             messagebox.showinfo("Éxito", "Backup creado correctamente")
         else:
@@ -875,8 +1089,21 @@ Características:
 
         Pregunta si desea guardar antes de salir y cierra la aplicación.
         """
-        if messagebox.askyesno("Salir", "¿Desea guardar antes de salir?"):
-            self.guardar_inventario()
+        # Escribir los guardados programados (aunque la política todavía
+        # estuviera esperando) y terminar los que ya están en curso
+        self.planificador_guardado.vaciar()
+
+        # Solo preguntar si hay cambios que todavía no se guardaron
+        if (self.inventario.hay_cambios_pendientes()
+                and messagebox.askyesno("Salir", "¿Desea guardar antes de salir?")):
+            self.guardar_inventario_ahora()
+            self.planificador_guardado.vaciar()
+        self.trabajador_guardado.detener()
+
+        # Asegurar que el último grupo de cambios del diario llegue al disco
+        # y dar unos segundos a una compactación en curso para terminar
+        self.gestor_persistencia.sincronizar()
+        self.gestor_persistencia.esperar_compactacion(tiempo_maximo=5)
 
         # Cerrar la aplicación
         self.root.quit()
@@ -443,9 +443,12 @@ class VentanaProducto:
                 self.producto.stock_minimo = stock_minimo
                 self.producto.proveedor = proveedor
 
+                # Avisar al inventario para que registre el cambio pendiente
+                self.ventana_principal.inventario.actualizar_producto(self.producto)
+
             # ========== GUARDAR Y ACTUALIZAR ==========
 
-            # Guardar inventario en archivo
+            # Programar el guardado del inventario (según la política de guardado)
             self.ventana_principal.guardar_inventario()
 
             # Actualizar tabla de productos en ventana principal
@@ -222,7 +222,7 @@ class VentanaProveedorSimple:
             # Nota: esto puede lanzar una excepción si el ID ya existe
             self.ventana_producto.ventana_principal.inventario.agregar_proveedor(proveedor)
 
-            # Guardar inventario en archivo
+            # Programar el guardado del inventario (según la política de guardado)
             self.ventana_producto.ventana_principal.guardar_inventario()
 
             # Actualizar combo de proveedores en la ventana de producto
@@ -395,14 +395,16 @@ class VentanaProveedores:
         # ========== OBTENER PROVEEDORES ==========
 
         # Obtener lista de todos los proveedores del inventario
-        proveedores = self.ventana_principal.inventario.listar_proveedores()
+        inventario = self.ventana_principal.inventario
+        proveedores = inventario.listar_proveedores()
 
         # ========== LLENAR TABLA ==========
 
         # Por cada proveedor
         for proveedor in proveedores:
-            # Obtener lista de productos de este proveedor
-            productos = self.ventana_principal.inventario.obtener_productos_por_proveedor(
+            # Cantidad de productos de este proveedor (el inventario la
+            # tiene en su índice por proveedor, no hace falta listarlos)
+            cantidad_productos = inventario.obtener_cantidad_productos_por_proveedor(
                 proveedor.id_proveedor)
 
             # Crear tupla con los valores de la fila
@@ -411,7 +413,7 @@ class VentanaProveedores:
                 proveedor.nombre,
                 proveedor.telefono,
                 proveedor.email,
-                len(productos)  # Cantidad de productos
+                cantidad_productos  # Cantidad de productos
             )
 
             # Insertar fila en la tabla
@@ -6,7 +6,14 @@ Contiene las clases del dominio del negocio (entidades principales).
 Estas clases representan los conceptos fundamentales del sistema:
 - Proveedor: Empresa que suministra productos
 - Producto: Insumo agrícola en el inventario
+- ResumenProducto: Datos livianos de un producto (carga perezosa y tablas)
 - Inventario: Colección de productos y proveedores
+- AlmacenColumnar: Productos guardados por columnas (inventarios grandes)
+- AnaliticaInventario: Estadísticas sobre columnas (con NumPy si está instalado)
+- IndiceTexto: Índice de trigramas para buscar productos por nombre o código
+- IndiceCodigos: Códigos ordenados para consultas por prefijo y por rango
+- Filtro, Consulta: Consultas combinadas (Y/O, orden y límite) que usan los índices
+- PaginaProductos: Una página del catálogo con el cursor de la siguiente
 - Usuario: Usuarios del sistema (con roles Cajero y Administrador)
 
 ¿Qué es una clase del dominio?
@@ -25,6 +32,13 @@ Autor: Estudiante de Ingeniería en Desarrollo de Software
 # Importar las clases del dominio para facilitar su uso
 from .proveedor import Proveedor
 from .producto import Producto
+from .resumen_producto import ResumenProducto
+from .almacen_columnar import AlmacenColumnar
+from .analitica import AnaliticaInventario
+from .indice_texto import IndiceTexto
+from .indice_codigos import IndiceCodigos
+from .consulta import Filtro, Consulta
+from .pagina_productos import PaginaProductos
 from .inventario import Inventario
 from .usuario import Usuario, Cajero, Administrador
 
@@ -32,7 +46,15 @@ from .usuario import Usuario, Cajero, Administrador
 __all__ = [
     'Proveedor',
     'Producto',
+    'ResumenProducto',
     'Inventario',
+    'AlmacenColumnar',
+    'AnaliticaInventario',
+    'IndiceTexto',
+    'IndiceCodigos',
+    'Filtro',
+    'Consulta',
+    'PaginaProductos',
     'Usuario',
     'Cajero',
     'Administrador'
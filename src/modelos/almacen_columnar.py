@@ -0,0 +1,324 @@
+"""
+Módulo almacen_columnar.py
+==========================
+Archivo que contiene la clase AlmacenColumnar para el sistema de gestión de
+inventario AgroCol SAS.
+
+Normalmente el inventario guarda un diccionario {codigo: Producto}, y cada
+Producto es un objeto con ocho atributos. Para catálogos muy grandes eso
+ocupa mucha memoria, y sumar o filtrar obliga a recorrer los objetos uno
+por uno pasando por sus propiedades.
+
+El almacén columnar guarda los mismos datos "por columnas":
+- cantidad, precio_costo y stock_minimo en arreglos array('d') (8 bytes
+  por producto cada uno, uno detrás de otro en memoria)
+- unidad_medida e id_proveedor como números que apuntan a una tabla de
+  textos sin repetir (hay pocas unidades y pocos proveedores)
+- codigo, nombre y fecha_ingreso en listas de textos
+- un diccionario codigo -> fila para encontrar cada producto
+
+Así cada producto ocupa mucha menos memoria. Las consultas del inventario
+(valor total, stock bajo, productos de un proveedor) usan los totales e
+índices que el Inventario mantiene al día, no las columnas; las columnas
+numéricas se entregan sin copiar a las estadísticas (ver columnas()).
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+from array import array  # Arreglos compactos de números
+from collections.abc import MutableMapping  # Para comportarse como un diccionario
+from typing import Iterator, Union
+
+# Importar las clases del dominio
+from .producto import Producto
+from .resumen_producto import ResumenProducto
+
+
+class AlmacenColumnar(MutableMapping):
+    """
+    Clase AlmacenColumnar
+    =====================
+    Diccionario {codigo: producto} que guarda los datos por columnas.
+
+    Se usa igual que un diccionario (hereda de MutableMapping): se puede
+    asignar, leer, borrar y recorrer por código, y conserva el orden de
+    inserción. Al asignar se acepta un Producto o un ResumenProducto:
+
+    - Con un ResumenProducto solo se guardan sus datos en las columnas.
+    - Con un Producto se guardan sus datos y además el objeto, para que
+      leer ese código retorne siempre el MISMO objeto.
+
+    Al leer un código se retorna el Producto guardado, o si no hay, un
+    ResumenProducto armado con los datos de su fila.
+
+    Importante: si un Producto guardado cambia, hay que avisar con
+    escribir_fila() para que las columnas queden al día (el Inventario lo
+    hace desde su observador de productos).
+
+    Atributos:
+    ----------
+    _filas : dict[str, int]
+        Índice codigo -> fila (en el mismo orden que las filas) (privado)
+    _codigos, _nombres, _fechas : list[str]
+        Columnas de texto (privado)
+    _unidades, _id_proveedores : array('I')
+        Posición de cada texto en su tabla de textos sin repetir (privado)
+    _tabla_unidades, _tabla_proveedores : list[str]
+        Textos sin repetir de unidad_medida e id_proveedor (privado)
+    _indice_unidades, _indice_proveedores : dict[str, int]
+        Texto -> posición en su tabla (privado)
+    _cantidad, _precio_costo, _stock_minimo : array('d')
+        Columnas numéricas (privado)
+    _vivas : bytearray
+        1 si la fila está en uso, 0 si su producto se borró (privado)
+    _objetos : dict[int, Producto]
+        Objetos Producto guardados, por fila (privado)
+    _borradas : int
+        Cantidad de filas borradas que todavía ocupan lugar (privado)
+
+    Ejemplo de uso:
+    ---------------
+    >>> almacen = AlmacenColumnar()
+    >>> almacen["FERT001"] = producto
+    >>> almacen["FERT001"].cantidad
+    """
+
+    # Filas borradas a partir de las cuales se reconstruyen las columnas
+    MIN_BORRADAS_COMPACTAR = 1024
+
+    def __init__(self):
+        """
+        Constructor de la clase AlmacenColumnar
+        =======================================
+        Crea un almacén vacío.
+        """
+        self._filas: dict[str, int] = {}
+        self._codigos: list[str] = []
+        self._nombres: list[str] = []
+        self._fechas: list[str] = []
+        self._unidades = array('I')
+        self._id_proveedores = array('I')
+        self._tabla_unidades: list[str] = []
+        self._tabla_proveedores: list[str] = []
+        self._indice_unidades: dict[str, int] = {}
+        self._indice_proveedores: dict[str, int] = {}
+        self._cantidad = array('d')
+        self._precio_costo = array('d')
+        self._stock_minimo = array('d')
+        self._vivas = bytearray()
+        self._objetos: dict[int, Producto] = {}
+        self._borradas = 0
+
+    # ==================== MÉTODOS DE DICCIONARIO ====================
+
+    def __getitem__(self, codigo: str) -> Union[Producto, ResumenProducto]:
+        """
+        Retorna el Producto guardado o el resumen de la fila del código
+
+        Excepciones:
+        ------------
+        KeyError : Si el código no existe
+        """
+        fila = self._filas[codigo]
+        producto = self._objetos.get(fila)
+        if producto is not None:
+            return producto
+        return self.resumen(fila)
+
+    def __setitem__(self, codigo: str, valor: Union[Producto, ResumenProducto]) -> None:
+        """
+        Guarda un producto (o su resumen); si el código existe, en su misma fila
+        """
+        fila = self._filas.get(codigo)
+        if fila is None:
+            fila = self._agregar_fila(codigo)
+
+        self._escribir_columnas(fila, valor)
+        if isinstance(valor, Producto):
+            self._objetos[fila] = valor
+        else:
+            self._objetos.pop(fila, None)
+
+    def __delitem__(self, codigo: str) -> None:
+        """
+        Borra un producto (su fila queda marcada como libre)
+
+        Excepciones:
+        ------------
+        KeyError : Si el código no existe
+        """
+        fila = self._filas.pop(codigo)
+        self._vivas[fila] = 0
+        self._objetos.pop(fila, None)
+        # Soltar los textos para liberar memoria
+        self._nombres[fila] = ''
+        self._fechas[fila] = ''
+        self._borradas += 1
+
+        # Si más de la mitad de las filas están borradas, reconstruir
+        if (self._borradas >= self.MIN_BORRADAS_COMPACTAR
+                and self._borradas * 2 > len(self._vivas)):
+            self._compactar()
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Recorre los códigos en orden de inserción
+        """
+        # _filas conserva el orden de las filas: las nuevas van al final y
+        # reemplazar un código existente no lo mueve
+        return iter(self._filas)
+
+    def __len__(self) -> int:
+        """
+        Retorna la cantidad de productos
+        """
+        return len(self._filas)
+
+    def __contains__(self, codigo) -> bool:
+        """
+        Indica si el código existe (sin armar el resumen)
+        """
+        return codigo in self._filas
+
+    # ==================== ACCESO A LAS COLUMNAS ====================
+
+    def columnas(self) -> dict:
+        """
+        Retorna las columnas numéricas y de posiciones, sin copiarlas
+        =============================================================
+        Son los mismos arreglos que usa el almacén (no una copia), con una
+        posición por producto en el orden de inserción. Si hay filas
+        borradas, antes se compactan para que todas las filas estén en uso.
+
+        Como no son copias, hay que leerlas antes de volver a cambiar el
+        almacén (ver AnaliticaInventario.desde_almacen).
+
+        Retorna:
+        --------
+        dict : {'cantidad', 'precio_costo', 'stock_minimo': array('d'),
+                'unidad_medida', 'id_proveedor': array('I') con la posición
+                en 'tabla_unidades' / 'tabla_proveedores': list[str]}
+        """
+        if self._borradas:
+            self._compactar()
+
+        return {
+            'cantidad': self._cantidad,
+            'precio_costo': self._precio_costo,
+            'stock_minimo': self._stock_minimo,
+            'unidad_medida': self._unidades,
+            'id_proveedor': self._id_proveedores,
+            'tabla_unidades': self._tabla_unidades,
+            'tabla_proveedores': self._tabla_proveedores
+        }
+
+    def resumen(self, fila: int) -> ResumenProducto:
+        """
+        Arma el resumen de una fila
+
+        Parámetros:
+        -----------
+        fila : int
+            Número de fila
+
+        Retorna:
+        --------
+        ResumenProducto : Datos de la fila
+        """
+        return ResumenProducto(
+            self._codigos[fila], self._nombres[fila],
+            self._tabla_unidades[self._unidades[fila]], self._fechas[fila],
+            self._tabla_proveedores[self._id_proveedores[fila]],
+            self._precio_costo[fila], self._cantidad[fila], self._stock_minimo[fila])
+
+    def escribir_fila(self, producto: Producto) -> None:
+        """
+        Copia a las columnas los datos actuales de un Producto guardado
+        ===============================================================
+        Se llama cada vez que un Producto guardado cambia.
+
+        Parámetros:
+        -----------
+        producto : Producto
+            Producto que cambió (su código debe existir)
+        """
+        self._escribir_columnas(self._filas[producto.codigo], producto)
+
+    # ==================== MÉTODOS INTERNOS ====================
+
+    def _agregar_fila(self, codigo: str) -> int:
+        """
+        Agrega una fila vacía al final de todas las columnas (privado)
+
+        Retorna:
+        --------
+        int : Número de la fila nueva
+        """
+        fila = len(self._vivas)
+        self._filas[codigo] = fila
+        self._codigos.append(codigo)
+        self._nombres.append('')
+        self._fechas.append('')
+        self._unidades.append(0)
+        self._id_proveedores.append(0)
+        self._cantidad.append(0.0)
+        self._precio_costo.append(0.0)
+        self._stock_minimo.append(0.0)
+        self._vivas.append(1)
+        return fila
+
+    def _escribir_columnas(self, fila: int, valor: Union[Producto, ResumenProducto]) -> None:
+        """
+        Escribe los datos de un producto o resumen en una fila (privado)
+        """
+        if isinstance(valor, ResumenProducto):
+            id_proveedor = valor.id_proveedor
+        else:
+            id_proveedor = valor.proveedor.id_proveedor
+
+        self._nombres[fila] = valor.nombre
+        self._fechas[fila] = valor.fecha_ingreso
+        self._unidades[fila] = self._posicion_en_tabla(
+            self._tabla_unidades, self._indice_unidades, valor.unidad_medida)
+        self._id_proveedores[fila] = self._posicion_en_tabla(
+            self._tabla_proveedores, self._indice_proveedores, id_proveedor)
+        self._cantidad[fila] = valor.cantidad
+        self._precio_costo[fila] = valor.precio_costo
+        self._stock_minimo[fila] = valor.stock_minimo
+
+    @staticmethod
+    def _posicion_en_tabla(tabla: list[str], indice: dict[str, int], texto: str) -> int:
+        """
+        Retorna la posición de un texto en su tabla, agregándolo si falta (privado)
+        """
+        posicion = indice.get(texto)
+        if posicion is None:
+            posicion = len(tabla)
+            tabla.append(texto)
+            indice[texto] = posicion
+        return posicion
+
+    def _compactar(self) -> None:
+        """
+        Reconstruye las columnas sin las filas borradas (privado)
+        ========================================================
+        Conserva el orden de los productos; solo cambian los números de fila.
+        """
+        filas = list(self._filas.values())
+
+        self._codigos = [self._codigos[f] for f in filas]
+        self._nombres = [self._nombres[f] for f in filas]
+        self._fechas = [self._fechas[f] for f in filas]
+        self._unidades = array('I', (self._unidades[f] for f in filas))
+        self._id_proveedores = array('I', (self._id_proveedores[f] for f in filas))
+        self._cantidad = array('d', (self._cantidad[f] for f in filas))
+        self._precio_costo = array('d', (self._precio_costo[f] for f in filas))
+        self._stock_minimo = array('d', (self._stock_minimo[f] for f in filas))
+        self._vivas = bytearray(b'\x01' * len(filas))
+
+        nuevas = {anterior: nueva for nueva, anterior in enumerate(filas)}
+        self._objetos = {nuevas[f]: p for f, p in self._objetos.items()}
+        self._filas = {codigo: nueva for nueva, codigo in enumerate(self._codigos)}
+        self._borradas = 0
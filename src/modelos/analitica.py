@@ -0,0 +1,323 @@
+"""
+Módulo analitica.py
+===================
+Archivo que contiene la clase AnaliticaInventario para el sistema de gestión
+de inventario AgroCol SAS.
+
+Calcula las estadísticas del inventario (valor total, stock bajo, totales
+por proveedor y por unidad, percentiles) sobre columnas de números en lugar
+de recorrer los objetos Producto uno por uno.
+
+NumPy es OPCIONAL:
+------------------
+- Si NumPy está instalado, las columnas son arreglos de NumPy y cada
+  estadística es una sola operación vectorizada.
+- Si no está, las columnas son array('d') de la librería estándar y las
+  mismas estadísticas se calculan con Python puro. El resultado es el mismo
+  (salvo diferencias mínimas de redondeo en las sumas).
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import math      # Para redondear posiciones en los percentiles
+import operator  # Para operar columnas completas con map()
+from array import array  # Columnas compactas cuando no hay NumPy
+from typing import Iterable, Union
+
+# NumPy es opcional: si no está instalado se usa Python puro
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Importar las clases del dominio
+from .producto import Producto
+from .resumen_producto import ResumenProducto
+
+# True si las estadísticas se calculan con NumPy
+HAY_NUMPY = np is not None
+
+
+class AnaliticaInventario:
+    """
+    Clase AnaliticaInventario
+    =========================
+    Columnas numéricas de un inventario, listas para calcular estadísticas.
+
+    Se crea con uno de sus dos constructores alternativos:
+    - desde_productos(): una sola pasada por los productos (o resúmenes)
+      que llena las columnas sin crear ningún objeto intermedio.
+    - desde_almacen(): usa DIRECTAMENTE las columnas de un AlmacenColumnar,
+      sin copiarlas. Con NumPy se envuelven con numpy.frombuffer, que lee
+      la misma memoria del array('d').
+
+    Es una "foto" de los productos en el momento en que se calcula:
+    Inventario.obtener_estadisticas la crea, calcula todo de una vez, la
+    descarta y guarda el resultado mientras no haya cambios.
+
+    Atributos:
+    ----------
+    _cantidad, _precio_costo, _stock_minimo : numpy.ndarray | array('d')
+        Columnas numéricas (privado)
+    _valor : numpy.ndarray | array('d')
+        cantidad × precio_costo de cada fila (privado)
+    _proveedores, _unidades : list[str]
+        Textos sin repetir de id_proveedor y unidad_medida (privado)
+    _fila_proveedor, _fila_unidad : numpy.ndarray | array('I')
+        Posición del proveedor y la unidad de cada fila en su lista (privado)
+
+    Ejemplo de uso:
+    ---------------
+    >>> analitica = AnaliticaInventario.desde_productos(productos)
+    >>> print(analitica.valor_total())
+    >>> print(analitica.totales_por_proveedor())
+    """
+
+    # Percentiles que muestra el reporte por defecto
+    PERCENTILES = (25, 50, 75, 90)
+
+    def __init__(self, cantidad: array, precio_costo: array, stock_minimo: array,
+                 fila_proveedor: array, proveedores: list[str],
+                 fila_unidad: array, unidades: list[str]):
+        """
+        Constructor de la clase AnaliticaInventario
+        ===========================================
+        Recibe las columnas ya armadas (normalmente se usa desde_productos
+        o desde_almacen). Todas deben tener el mismo largo: una posición
+        por producto.
+
+        Con NumPy las columnas NO se copian: numpy.frombuffer crea arreglos
+        que leen la memoria de los array recibidos. Mientras este objeto
+        exista esos array no pueden crecer (Python no deja agrandar un
+        arreglo cuya memoria está prestada), por eso conviene calcular y
+        soltarlo enseguida, como hace Inventario.obtener_estadisticas.
+
+        Parámetros:
+        -----------
+        cantidad, precio_costo, stock_minimo : array('d')
+            Columnas numéricas
+        fila_proveedor : array('I')
+            Posición en 'proveedores' del proveedor de cada fila
+        proveedores : list[str]
+            IDs de proveedor sin repetir
+        fila_unidad : array('I')
+            Posición en 'unidades' de la unidad de medida de cada fila
+        unidades : list[str]
+            Unidades de medida sin repetir
+        """
+        self._proveedores = proveedores
+        self._unidades = unidades
+
+        if HAY_NUMPY:
+            # np.dtype entiende los mismos códigos que array ('d', 'I')
+            self._cantidad = np.frombuffer(cantidad, dtype=np.dtype(cantidad.typecode))
+            self._precio_costo = np.frombuffer(precio_costo, dtype=np.dtype(precio_costo.typecode))
+            self._stock_minimo = np.frombuffer(stock_minimo, dtype=np.dtype(stock_minimo.typecode))
+            self._fila_proveedor = np.frombuffer(fila_proveedor,
+                                                 dtype=np.dtype(fila_proveedor.typecode))
+            self._fila_unidad = np.frombuffer(fila_unidad, dtype=np.dtype(fila_unidad.typecode))
+            self._valor = self._cantidad * self._precio_costo
+        else:
+            self._cantidad = cantidad
+            self._precio_costo = precio_costo
+            self._stock_minimo = stock_minimo
+            self._fila_proveedor = fila_proveedor
+            self._fila_unidad = fila_unidad
+            self._valor = array('d', map(operator.mul, cantidad, precio_costo))
+
+    @classmethod
+    def desde_productos(cls, productos: Iterable[Union[Producto, ResumenProducto]]
+                        ) -> 'AnaliticaInventario':
+        """
+        Arma las columnas recorriendo los productos una sola vez
+        ========================================================
+        Acepta Producto o ResumenProducto (un inventario perezoso tiene de
+        los dos) y no crea resúmenes ni listas intermedias: cada dato va
+        directo a su columna.
+
+        Parámetros:
+        -----------
+        productos : iterable de Producto | ResumenProducto
+            Productos del inventario
+
+        Retorna:
+        --------
+        AnaliticaInventario : Columnas de esos productos
+
+        Ejemplo:
+        --------
+        >>> analitica = AnaliticaInventario.desde_productos(inventario.listar_resumenes())
+        """
+        cantidad = array('d')
+        precio_costo = array('d')
+        stock_minimo = array('d')
+        fila_proveedor = array('I')
+        fila_unidad = array('I')
+        # Textos sin repetir: cada fila guarda solo la posición en la lista
+        posicion_proveedor: dict[str, int] = {}
+        posicion_unidad: dict[str, int] = {}
+
+        for valor in productos:
+            if isinstance(valor, ResumenProducto):
+                id_proveedor = valor.id_proveedor
+            else:
+                id_proveedor = valor.proveedor.id_proveedor
+            cantidad.append(valor.cantidad)
+            precio_costo.append(valor.precio_costo)
+            stock_minimo.append(valor.stock_minimo)
+            fila_proveedor.append(posicion_proveedor.setdefault(
+                id_proveedor, len(posicion_proveedor)))
+            fila_unidad.append(posicion_unidad.setdefault(
+                valor.unidad_medida, len(posicion_unidad)))
+
+        return cls(cantidad, precio_costo, stock_minimo,
+                   fila_proveedor, list(posicion_proveedor),
+                   fila_unidad, list(posicion_unidad))
+
+    @classmethod
+    def desde_almacen(cls, almacen) -> 'AnaliticaInventario':
+        """
+        Usa las columnas de un AlmacenColumnar sin copiarlas
+        ====================================================
+        Ver AlmacenColumnar.columnas() y la nota del constructor: mientras
+        el objeto retornado exista, no se pueden agregar productos al
+        almacén.
+
+        Parámetros:
+        -----------
+        almacen : AlmacenColumnar
+            Almacén del inventario
+
+        Retorna:
+        --------
+        AnaliticaInventario : Columnas del almacén
+
+        Ejemplo:
+        --------
+        >>> analitica = AnaliticaInventario.desde_almacen(almacen)
+        """
+        columnas = almacen.columnas()
+        return cls(columnas['cantidad'], columnas['precio_costo'], columnas['stock_minimo'],
+                   columnas['id_proveedor'], columnas['tabla_proveedores'],
+                   columnas['unidad_medida'], columnas['tabla_unidades'])
+
+    # ==================== ESTADÍSTICAS ====================
+
+    def cantidad_productos(self) -> int:
+        """
+        Retorna la cantidad de productos (filas)
+        """
+        return len(self._cantidad)
+
+    def valor_total(self) -> float:
+        """
+        Suma el valor (cantidad × precio_costo) de todos los productos
+
+        Retorna:
+        --------
+        float : Valor total del inventario
+        """
+        if HAY_NUMPY:
+            return float(self._valor.sum())
+        return float(sum(self._valor))
+
+    def cantidad_bajo_stock(self) -> int:
+        """
+        Cuenta los productos con stock bajo
+
+        Retorna:
+        --------
+        int : Cantidad de productos con cantidad <= stock mínimo
+        """
+        if HAY_NUMPY:
+            return int(np.count_nonzero(self._cantidad <= self._stock_minimo))
+        return sum(map(operator.le, self._cantidad, self._stock_minimo))
+
+    def totales_por_proveedor(self) -> dict[str, float]:
+        """
+        Suma el valor de los productos de cada proveedor
+
+        Retorna:
+        --------
+        dict[str, float] : {id_proveedor: valor total de sus productos}
+        """
+        return self._totales_por_grupo(self._proveedores, self._fila_proveedor)
+
+    def totales_por_unidad(self) -> dict[str, float]:
+        """
+        Suma la cantidad en stock de los productos de cada unidad de medida
+
+        Se suman cantidades (no dinero): por ejemplo, cuántos kg hay en total.
+
+        Retorna:
+        --------
+        dict[str, float] : {unidad_medida: cantidad total}
+        """
+        return self._totales_por_grupo(self._unidades, self._fila_unidad, self._cantidad)
+
+    def _totales_por_grupo(self, grupos: list[str], filas, valores=None) -> dict[str, float]:
+        """
+        Suma una columna agrupando las filas por su grupo (privado)
+
+        Parámetros:
+        -----------
+        grupos : list[str]
+            Nombre de cada grupo
+        filas :
+            Posición del grupo de cada fila
+        valores : opcional
+            Columna que se suma (por defecto, el valor de cada producto)
+        """
+        if valores is None:
+            valores = self._valor
+
+        if HAY_NUMPY:
+            # bincount suma los pesos de las filas que tienen el mismo grupo
+            # (sin pesos, cuenta las filas)
+            sumas = np.bincount(filas, weights=valores, minlength=len(grupos)).tolist()
+            cuentas = np.bincount(filas, minlength=len(grupos)).tolist()
+        else:
+            sumas = [0.0] * len(grupos)
+            cuentas = [0] * len(grupos)
+            for grupo, valor in zip(filas, valores):
+                sumas[grupo] += valor
+                cuentas[grupo] += 1
+
+        # Las tablas del almacén columnar pueden tener textos que ya no usa
+        # ningún producto: esos grupos no se incluyen
+        return {grupo: suma for grupo, suma, cuenta in zip(grupos, sumas, cuentas) if cuenta}
+
+    def percentiles_valor(self, percentiles: tuple = PERCENTILES) -> dict[int, float]:
+        """
+        Calcula percentiles del valor de los productos
+        ==============================================
+        Por ejemplo, el percentil 50 es el valor del producto "del medio".
+        Se usa interpolación lineal entre los dos valores más cercanos
+        (el mismo método que numpy.percentile por defecto).
+
+        Parámetros:
+        -----------
+        percentiles : tuple, opcional
+            Percentiles a calcular, entre 0 y 100
+
+        Retorna:
+        --------
+        dict[int, float] : {percentil: valor}; vacío si no hay productos
+        """
+        if not len(self._valor):
+            return {}
+
+        if HAY_NUMPY:
+            return dict(zip(percentiles, np.percentile(self._valor, percentiles).tolist()))
+
+        ordenados = sorted(self._valor)
+        resultado = {}
+        for percentil in percentiles:
+            posicion = (len(ordenados) - 1) * percentil / 100
+            abajo = math.floor(posicion)
+            arriba = math.ceil(posicion)
+            resultado[percentil] = (ordenados[abajo]
+                                    + (ordenados[arriba] - ordenados[abajo]) * (posicion - abajo))
+        return resultado
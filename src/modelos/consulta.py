@@ -0,0 +1,1155 @@
+"""
+Módulo consulta.py
+==================
+Archivo que contiene las clases Filtro y Consulta para el sistema de gestión
+de inventario AgroCol SAS.
+
+Cada reporte nuevo agregaba su propia list comprehension sobre todos los
+productos ("bajo stock de tal proveedor", "kg con precio entre X e Y"...).
+Con estas clases una consulta se arma combinando filtros:
+
+    consulta = (inventario.consultar()
+                .proveedor("PROV001")
+                .bajo_stock()
+                .ordenar_por("cantidad")
+                .limitar(10))
+    for producto in consulta:
+        print(producto.nombre)
+
+¿Cómo se resuelve una consulta?
+-------------------------------
+1. Plan: los filtros que tienen un índice en el Inventario (proveedor,
+   stock bajo, texto, prefijo de código) dicen cuántos productos dejarían
+   pasar. En un Y (AND) se elige el índice MÁS selectivo (el que deja menos
+   productos) y solo se revisan esos. En un O (OR) se usa la unión de los
+   índices de cada parte, si todas tienen índice. Si no hay índice que
+   sirva, se recorre el inventario completo.
+2. Filtro: cada candidato se revisa con TODAS las condiciones sobre sus
+   datos guardados (sin crear el Producto completo).
+3. Resultado: un iterador perezoso; el Producto completo se crea recién
+   cuando el iterador lo entrega.
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import abc  # Para declarar Filtro como clase abstracta
+from datetime import date  # Para aceptar fechas como objetos date
+from typing import Callable, Iterator, Optional, Union
+
+# Importar las clases del dominio
+from .resumen_producto import ResumenProducto
+from .indice_texto import IndiceTexto
+
+
+# ==================== FUNCIONES AUXILIARES ====================
+
+def clave_fecha(fecha: Union[str, date, None]) -> Optional[tuple[int, int, int]]:
+    """
+    Convierte una fecha en una tupla (año, mes, día) que se puede comparar
+    =====================================================================
+    Acepta el formato del formulario (dd/mm/aaaa), el formato ISO
+    (aaaa-mm-dd) y objetos date.
+
+    Parámetros:
+    -----------
+    fecha : str | date | None
+        Fecha a convertir
+
+    Retorna:
+    --------
+    tuple[int, int, int] | None : (año, mes, día), o None si no se reconoce
+
+    Ejemplo:
+    --------
+    >>> clave_fecha("05/10/2025")
+    (2025, 10, 5)
+    """
+    if isinstance(fecha, date):
+        return (fecha.year, fecha.month, fecha.day)
+    if not isinstance(fecha, str):
+        return None
+
+    try:
+        if '/' in fecha:
+            dia, mes, anio = fecha.strip().split('/')
+        else:
+            anio, mes, dia = fecha.strip().split('-')
+        return (int(anio), int(mes), int(dia))
+    except ValueError:
+        # Texto con otro formato (la fecha se escribe a mano en el formulario)
+        return None
+
+
+def _id_proveedor(valor) -> str:
+    """
+    Retorna el ID del proveedor de un Producto o de un ResumenProducto
+    """
+    if isinstance(valor, ResumenProducto):
+        return valor.id_proveedor
+    return valor.proveedor.id_proveedor
+
+
+# Un plan: (productos estimados, descripción, función que da los códigos)
+Plan = tuple[int, str, Callable[[], list[str]]]
+
+
+# ==================== FILTROS ====================
+
+class Filtro(abc.ABC):
+    """
+    Clase Filtro
+    ============
+    Condición que debe cumplir un producto (clase abstracta).
+
+    Los filtros se crean con los métodos de clase (Filtro.proveedor,
+    Filtro.bajo_stock, ...) y se combinan con los operadores & (Y) y | (O):
+
+        Filtro.proveedor("PROV001") & (Filtro.unidad("kg") | Filtro.unidad("litros"))
+
+    Cada filtro sabe:
+    - cumple(valor): si un producto (Producto o ResumenProducto) lo cumple
+      (cada subclase DEBE implementarlo)
+    - plan(inventario): si puede usar un índice del inventario, cuántos
+      productos dejaría pasar y cómo obtener sus códigos (None si no)
+    - preparar(inventario): retorna el filtro listo para UNA ejecución
+
+    Un filtro no cambia después de creado: lo que se calcula para una
+    ejecución queda en el filtro que retorna preparar(). Así el mismo
+    filtro se puede usar en varias consultas a la vez (por ejemplo, dos
+    iteradores perezosos recorridos en paralelo).
+
+    Ejemplo de uso:
+    ---------------
+    >>> filtro = Filtro.bajo_stock() & Filtro.precio_entre(maximo=5000)
+    >>> productos = list(inventario.consultar().donde(filtro))
+    """
+
+    def preparar(self, inventario) -> 'Filtro':
+        """
+        Retorna el filtro listo para una ejecución sobre un inventario
+
+        Se llama una vez al empezar cada consulta, y la consulta usa el
+        filtro retornado. Por defecto es el mismo filtro; los que pueden
+        calcular antes su respuesta completa (texto, prefijo) retornan un
+        filtro nuevo con esa respuesta, sin modificar el original.
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Filtro : Filtro a usar durante esta ejecución
+        """
+        return self
+
+    @abc.abstractmethod
+    def cumple(self, valor) -> bool:
+        """
+        Indica si un producto cumple el filtro
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si lo cumple
+        """
+
+    def plan(self, inventario) -> Optional[Plan]:
+        """
+        Retorna cómo usar un índice para este filtro (None si no hay índice)
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Plan | None : (productos estimados, descripción, función que da
+                      los códigos), o None si hay que recorrer todo
+        """
+        return None
+
+    def describir(self) -> str:
+        """
+        Retorna una descripción corta del filtro (para explicar el plan)
+
+        Retorna:
+        --------
+        str : Descripción del filtro
+        """
+        return type(self).__name__
+
+    def __and__(self, otro: 'Filtro') -> 'Filtro':
+        """
+        filtro_a & filtro_b: deben cumplirse los dos
+        """
+        return _FiltroY(self, otro)
+
+    def __or__(self, otro: 'Filtro') -> 'Filtro':
+        """
+        filtro_a | filtro_b: debe cumplirse al menos uno
+        """
+        return _FiltroO(self, otro)
+
+    # ==================== FILTROS DISPONIBLES ====================
+
+    @staticmethod
+    def proveedor(id_proveedor: str) -> 'Filtro':
+        """
+        Productos de un proveedor (usa el índice de proveedores)
+        """
+        return _FiltroProveedor(id_proveedor)
+
+    @staticmethod
+    def unidad(unidad_medida: str) -> 'Filtro':
+        """
+        Productos de una unidad de medida (sin distinguir mayúsculas)
+        """
+        return _FiltroUnidad(unidad_medida)
+
+    @staticmethod
+    def fecha_entre(desde: Union[str, date, None] = None,
+                    hasta: Union[str, date, None] = None) -> 'Filtro':
+        """
+        Productos ingresados entre dos fechas (ambas incluidas)
+
+        Las fechas pueden ser textos dd/mm/aaaa o aaaa-mm-dd, u objetos
+        date. Los productos con una fecha que no se reconoce no lo cumplen.
+        """
+        return _FiltroFecha(desde, hasta)
+
+    @staticmethod
+    def cantidad_entre(minimo: Optional[float] = None,
+                       maximo: Optional[float] = None) -> 'Filtro':
+        """
+        Productos con cantidad en stock entre dos valores (ambos incluidos)
+        """
+        return _FiltroRango('cantidad', minimo, maximo)
+
+    @staticmethod
+    def precio_entre(minimo: Optional[float] = None,
+                     maximo: Optional[float] = None) -> 'Filtro':
+        """
+        Productos con precio de costo entre dos valores (ambos incluidos)
+        """
+        return _FiltroRango('precio_costo', minimo, maximo)
+
+    @staticmethod
+    def bajo_stock() -> 'Filtro':
+        """
+        Productos con cantidad <= stock mínimo (usa el índice de stock bajo)
+        """
+        return _FiltroBajoStock()
+
+    @staticmethod
+    def texto(termino: str, ignorar_acentos: bool = False) -> 'Filtro':
+        """
+        Productos con el término en el nombre o el código (usa el índice de texto)
+        """
+        return _FiltroTexto(termino, ignorar_acentos)
+
+    @staticmethod
+    def codigo_empieza(prefijo: str) -> 'Filtro':
+        """
+        Productos cuyo código empieza con un prefijo (usa el índice de códigos)
+        """
+        return _FiltroPrefijo(prefijo)
+
+
+class _FiltroY(Filtro):
+    """
+    Se cumple si se cumplen todas sus partes (AND)
+    """
+
+    def __init__(self, *partes: Filtro):
+        """
+        Constructor de la clase _FiltroY
+
+        (a & b) & c se guarda como una sola lista [a, b, c].
+
+        Parámetros:
+        -----------
+        *partes : Filtro
+            Filtros que deben cumplirse
+        """
+        self.partes: list[Filtro] = []
+        for parte in partes:
+            self.partes.extend(parte.partes if isinstance(parte, _FiltroY) else [parte])
+
+    def preparar(self, inventario) -> Filtro:
+        """
+        Retorna un Y nuevo con cada parte preparada
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Filtro : Y de las partes preparadas
+        """
+        return _FiltroY(*(parte.preparar(inventario) for parte in self.partes))
+
+    def cumple(self, valor) -> bool:
+        """
+        Indica si el producto cumple todas las partes
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si cumple todas
+        """
+        return all(parte.cumple(valor) for parte in self.partes)
+
+    def plan(self, inventario) -> Optional[Plan]:
+        """
+        Retorna el plan de la parte más selectiva
+
+        Basta con los candidatos de UNA parte: los demás se descartan al
+        revisarlos con cumple().
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Plan | None : Plan con menos productos estimados, o None si
+                      ninguna parte tiene índice
+        """
+        planes = [p for p in (parte.plan(inventario) for parte in self.partes) if p is not None]
+        if not planes:
+            return None
+        return min(planes, key=lambda plan: plan[0])
+
+    def describir(self) -> str:
+        """
+        Retorna las partes unidas con " Y "
+
+        Retorna:
+        --------
+        str : Descripción entre paréntesis
+        """
+        return "(" + " Y ".join(parte.describir() for parte in self.partes) + ")"
+
+
+class _FiltroO(Filtro):
+    """
+    Se cumple si se cumple al menos una de sus partes (OR)
+    """
+
+    def __init__(self, *partes: Filtro):
+        """
+        Constructor de la clase _FiltroO
+
+        (a | b) | c se guarda como una sola lista [a, b, c].
+
+        Parámetros:
+        -----------
+        *partes : Filtro
+            Filtros de los que debe cumplirse al menos uno
+        """
+        self.partes: list[Filtro] = []
+        for parte in partes:
+            self.partes.extend(parte.partes if isinstance(parte, _FiltroO) else [parte])
+
+    def preparar(self, inventario) -> Filtro:
+        """
+        Retorna un O nuevo con cada parte preparada
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Filtro : O de las partes preparadas
+        """
+        return _FiltroO(*(parte.preparar(inventario) for parte in self.partes))
+
+    def cumple(self, valor) -> bool:
+        """
+        Indica si el producto cumple al menos una parte
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si cumple alguna
+        """
+        return any(parte.cumple(valor) for parte in self.partes)
+
+    def plan(self, inventario) -> Optional[Plan]:
+        """
+        Retorna la unión de los planes de todas las partes
+
+        Solo sirve si TODAS las partes tienen índice (si no, habría que
+        recorrer todo igual para la parte sin índice).
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Plan | None : Plan de la unión, o None si alguna parte no tiene índice
+        """
+        planes = [parte.plan(inventario) for parte in self.partes]
+        if any(plan is None for plan in planes):
+            return None
+
+        def unir() -> list[str]:
+            # dict.fromkeys quita repetidos conservando el orden
+            codigos: dict[str, None] = {}
+            for _, _, obtener in planes:
+                codigos.update(dict.fromkeys(obtener()))
+            return list(codigos)
+
+        estimado = sum(plan[0] for plan in planes)
+        descripcion = "unión de " + ", ".join(plan[1] for plan in planes)
+        return (estimado, descripcion, unir)
+
+    def describir(self) -> str:
+        """
+        Retorna las partes unidas con " O "
+
+        Retorna:
+        --------
+        str : Descripción entre paréntesis
+        """
+        return "(" + " O ".join(parte.describir() for parte in self.partes) + ")"
+
+
+class _FiltroProveedor(Filtro):
+    """
+    Productos de un proveedor
+    """
+
+    def __init__(self, id_proveedor: str):
+        """
+        Constructor de la clase _FiltroProveedor
+
+        Parámetros:
+        -----------
+        id_proveedor : str
+            ID del proveedor
+        """
+        self.id_proveedor = id_proveedor
+
+    def cumple(self, valor) -> bool:
+        """
+        Indica si el producto es del proveedor
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si su proveedor tiene ese ID
+        """
+        return _id_proveedor(valor) == self.id_proveedor
+
+    def plan(self, inventario) -> Optional[Plan]:
+        """
+        Usa el índice de productos por proveedor
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Plan : Cantidad de productos del proveedor y cómo obtener sus códigos
+        """
+        return (inventario.obtener_cantidad_productos_por_proveedor(self.id_proveedor),
+                f"índice de proveedores ({self.id_proveedor})",
+                lambda: inventario.codigos_por_proveedor(self.id_proveedor))
+
+    def describir(self) -> str:
+        """
+        Retorna la descripción del filtro
+
+        Retorna:
+        --------
+        str : Por ejemplo "proveedor = PROV001"
+        """
+        return f"proveedor = {self.id_proveedor}"
+
+
+class _FiltroUnidad(Filtro):
+    """
+    Productos de una unidad de medida
+    """
+
+    def __init__(self, unidad_medida: str):
+        """
+        Constructor de la clase _FiltroUnidad
+
+        Parámetros:
+        -----------
+        unidad_medida : str
+            Unidad buscada (se guarda en minúsculas)
+        """
+        self.unidad_medida = unidad_medida.lower()
+
+    def cumple(self, valor) -> bool:
+        """
+        Indica si el producto usa la unidad (sin distinguir mayúsculas)
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si su unidad de medida coincide
+        """
+        return valor.unidad_medida.lower() == self.unidad_medida
+
+    def describir(self) -> str:
+        """
+        Retorna la descripción del filtro
+
+        Retorna:
+        --------
+        str : Por ejemplo "unidad = kg"
+        """
+        return f"unidad = {self.unidad_medida}"
+
+
+class _FiltroFecha(Filtro):
+    """
+    Productos ingresados entre dos fechas (incluidas)
+    """
+
+    def __init__(self, desde, hasta):
+        """
+        Constructor de la clase _FiltroFecha
+
+        Parámetros:
+        -----------
+        desde : str | date | None
+            Primera fecha aceptada (None = sin límite)
+        hasta : str | date | None
+            Última fecha aceptada (None = sin límite)
+
+        Excepciones:
+        ------------
+        ValueError : Si alguna fecha no se reconoce
+        """
+        self.desde = clave_fecha(desde)
+        self.hasta = clave_fecha(hasta)
+        if (desde is not None and self.desde is None) or (hasta is not None and self.hasta is None):
+            raise ValueError("Fecha no reconocida: use dd/mm/aaaa o aaaa-mm-dd")
+
+    def cumple(self, valor) -> bool:
+        """
+        Indica si el producto ingresó entre las dos fechas
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si su fecha está en el rango (False si no se reconoce)
+        """
+        fecha = clave_fecha(valor.fecha_ingreso)
+        if fecha is None:
+            return False
+        return ((self.desde is None or fecha >= self.desde)
+                and (self.hasta is None or fecha <= self.hasta))
+
+    def describir(self) -> str:
+        """
+        Retorna la descripción del filtro
+
+        Retorna:
+        --------
+        str : Fechas del rango como (año, mes, día)
+        """
+        return f"fecha entre {self.desde} y {self.hasta}"
+
+
+class _FiltroRango(Filtro):
+    """
+    Productos con un atributo numérico entre dos valores (incluidos)
+    """
+
+    def __init__(self, campo: str, minimo: Optional[float], maximo: Optional[float]):
+        """
+        Constructor de la clase _FiltroRango
+
+        Parámetros:
+        -----------
+        campo : str
+            Atributo numérico ('cantidad' o 'precio_costo')
+        minimo : float | None
+            Valor mínimo aceptado (None = sin límite)
+        maximo : float | None
+            Valor máximo aceptado (None = sin límite)
+        """
+        self.campo = campo
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def cumple(self, valor) -> bool:
+        """
+        Indica si el atributo del producto está en el rango
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si minimo <= atributo <= maximo
+        """
+        numero = getattr(valor, self.campo)
+        return ((self.minimo is None or numero >= self.minimo)
+                and (self.maximo is None or numero <= self.maximo))
+
+    def describir(self) -> str:
+        """
+        Retorna la descripción del filtro
+
+        Retorna:
+        --------
+        str : Por ejemplo "cantidad entre 10 y None"
+        """
+        return f"{self.campo} entre {self.minimo} y {self.maximo}"
+
+
+class _FiltroBajoStock(Filtro):
+    """
+    Productos con cantidad <= stock mínimo
+    """
+
+    def cumple(self, valor) -> bool:
+        """
+        Indica si el producto tiene stock bajo
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si cantidad <= stock mínimo
+        """
+        return valor.esta_bajo_stock()
+
+    def plan(self, inventario) -> Optional[Plan]:
+        """
+        Usa el índice de stock bajo
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Plan : Cantidad de productos bajo stock y cómo obtener sus códigos
+        """
+        return (inventario.obtener_cantidad_bajo_stock(), "índice de stock bajo",
+                inventario.codigos_bajo_stock)
+
+    def describir(self) -> str:
+        """
+        Retorna la descripción del filtro
+
+        Retorna:
+        --------
+        str : "bajo stock"
+        """
+        return "bajo stock"
+
+
+class _FiltroTexto(Filtro):
+    """
+    Productos con un término en el nombre o el código
+    """
+
+    def __init__(self, termino: str, ignorar_acentos: bool):
+        """
+        Constructor de la clase _FiltroTexto
+
+        Parámetros:
+        -----------
+        termino : str
+            Texto a buscar (sin distinguir mayúsculas)
+        ignorar_acentos : bool
+            Si es True tampoco distingue tildes
+        """
+        self.termino = termino
+        self.ignorar_acentos = ignorar_acentos
+
+    def preparar(self, inventario) -> Filtro:
+        """
+        Retorna un filtro con la respuesta del índice de texto
+
+        El índice de texto da la respuesta completa de una vez; después
+        revisar un producto es solo buscar su código en un conjunto.
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Filtro : Filtro con los códigos encontrados
+        """
+        return _FiltroCodigos(inventario.codigos_por_texto(self.termino, self.ignorar_acentos),
+                              f"índice de texto ({self.termino!r})", self.describir())
+
+    def cumple(self, valor) -> bool:
+        """
+        Indica si el término está en el nombre o el código del producto
+
+        Compara igual que IndiceTexto.buscar (en minúsculas, y sin tildes
+        si ignorar_acentos es True).
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si el nombre o el código contienen el término
+        """
+        textos = IndiceTexto.textos_de_busqueda(valor.codigo, valor.nombre)
+        if self.ignorar_acentos:
+            termino, en_nombre, en_codigo = IndiceTexto.plegar(self.termino), 2, 3
+        else:
+            termino, en_nombre, en_codigo = IndiceTexto.normalizar(self.termino), 0, 1
+        return termino in textos[en_nombre] or termino in textos[en_codigo]
+
+    def plan(self, inventario) -> Optional[Plan]:
+        """
+        Usa el índice de texto (normalmente a través de preparar)
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Plan : Plan del filtro preparado
+        """
+        return self.preparar(inventario).plan(inventario)
+
+    def describir(self) -> str:
+        """
+        Retorna la descripción del filtro
+
+        Retorna:
+        --------
+        str : Por ejemplo "texto contiene 'urea'"
+        """
+        return f"texto contiene {self.termino!r}"
+
+
+class _FiltroPrefijo(Filtro):
+    """
+    Productos cuyo código empieza con un prefijo
+    """
+
+    def __init__(self, prefijo: str):
+        """
+        Constructor de la clase _FiltroPrefijo
+
+        Parámetros:
+        -----------
+        prefijo : str
+            Inicio del código (sin distinguir mayúsculas)
+        """
+        self.prefijo = prefijo
+
+    def preparar(self, inventario) -> Filtro:
+        """
+        Retorna un filtro con la respuesta del índice de códigos
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Filtro : Filtro con los códigos que tienen el prefijo
+        """
+        return _FiltroCodigos(inventario.codigos_por_prefijo(self.prefijo),
+                              f"índice de códigos ({self.prefijo}*)", self.describir())
+
+    def cumple(self, valor) -> bool:
+        """
+        Indica si el código del producto empieza con el prefijo
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si el código (en minúsculas) empieza con el prefijo
+        """
+        return IndiceTexto.normalizar(valor.codigo).startswith(
+            IndiceTexto.normalizar(self.prefijo))
+
+    def plan(self, inventario) -> Optional[Plan]:
+        """
+        Usa el índice de códigos (normalmente a través de preparar)
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta
+
+        Retorna:
+        --------
+        Plan : Plan del filtro preparado
+        """
+        return self.preparar(inventario).plan(inventario)
+
+    def describir(self) -> str:
+        """
+        Retorna la descripción del filtro
+
+        Retorna:
+        --------
+        str : Por ejemplo "código empieza con 'FERT'"
+        """
+        return f"código empieza con {self.prefijo!r}"
+
+
+class _FiltroCodigos(Filtro):
+    """
+    Productos de una lista fija de códigos
+
+    Es lo que retorna preparar() en los filtros de texto y de prefijo:
+    guarda la respuesta de un índice para una sola ejecución.
+    """
+
+    def __init__(self, codigos: list[str], descripcion_plan: str, descripcion: str):
+        """
+        Constructor de la clase _FiltroCodigos
+
+        Parámetros:
+        -----------
+        codigos : list[str]
+            Códigos que cumplen el filtro, en el orden del índice
+        descripcion_plan : str
+            Descripción del índice usado (para explicar el plan)
+        descripcion : str
+            Descripción del filtro original
+        """
+        self.codigos = codigos
+        self.conjunto = set(codigos)
+        self.descripcion_plan = descripcion_plan
+        self.descripcion = descripcion
+
+    def cumple(self, valor) -> bool:
+        """
+        Indica si el código del producto está en la lista
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Datos guardados del producto
+
+        Retorna:
+        --------
+        bool : True si su código está en la lista
+        """
+        return valor.codigo in self.conjunto
+
+    def plan(self, inventario) -> Optional[Plan]:
+        """
+        Usa la lista de códigos ya calculada
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario sobre el que se hace la consulta (no se usa)
+
+        Retorna:
+        --------
+        Plan : Cantidad de códigos y la lista misma
+        """
+        return (len(self.codigos), self.descripcion_plan, lambda: self.codigos)
+
+    def describir(self) -> str:
+        """
+        Retorna la descripción del filtro original
+
+        Retorna:
+        --------
+        str : Descripción del filtro de texto o de prefijo
+        """
+        return self.descripcion
+
+
+# ==================== CONSULTA ====================
+
+class Consulta:
+    """
+    Clase Consulta
+    ==============
+    Consulta sobre los productos de un inventario: filtros, orden y límite.
+
+    Se crea con Inventario.consultar(). Los métodos de filtro agregan
+    condiciones con Y (AND) y retornan la misma consulta, así se pueden
+    encadenar. Para condiciones con O (OR) se usa donde() con Filtro.
+
+    Recorrer la consulta (for, list(), next()) la ejecuta: es un iterador
+    perezoso que crea cada Producto recién cuando lo entrega.
+
+    Atributos:
+    ----------
+    _inventario : Inventario
+        Inventario consultado (privado)
+    _filtro : Filtro | None
+        Condiciones combinadas (None = todos los productos) (privado)
+    _orden : str | None
+        Campo por el que se ordena (privado)
+    _descendente : bool
+        True para ordenar de mayor a menor (privado)
+    _limite : int | None
+        Cantidad máxima de resultados (privado)
+
+    Ejemplo de uso:
+    ---------------
+    >>> consulta = (inventario.consultar()
+    ...             .donde(Filtro.proveedor("PROV001") | Filtro.proveedor("PROV002"))
+    ...             .precio_entre(1000, 5000)
+    ...             .ordenar_por("precio_costo", descendente=True)
+    ...             .limitar(20))
+    >>> print(consulta.explicar())
+    >>> for producto in consulta:
+    ...     print(producto.codigo, producto.precio_costo)
+    """
+
+    # Campos por los que se puede ordenar ('valor_total' = cantidad × precio)
+    CAMPOS_ORDEN = ('codigo', 'nombre', 'unidad_medida', 'fecha_ingreso',
+                    'precio_costo', 'cantidad', 'stock_minimo', 'valor_total')
+
+    def __init__(self, inventario):
+        """
+        Constructor de la clase Consulta
+        ================================
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario a consultar
+        """
+        self._inventario = inventario
+        self._filtro: Optional[Filtro] = None
+        self._orden: Optional[str] = None
+        self._descendente = False
+        self._limite: Optional[int] = None
+
+    # ==================== FILTROS ====================
+
+    def donde(self, filtro: Filtro) -> 'Consulta':
+        """
+        Agrega una condición (con Y a las que ya había)
+
+        Parámetros:
+        -----------
+        filtro : Filtro
+            Condición a agregar
+
+        Retorna:
+        --------
+        Consulta : La misma consulta (para encadenar)
+        """
+        self._filtro = filtro if self._filtro is None else self._filtro & filtro
+        return self
+
+    def proveedor(self, id_proveedor: str) -> 'Consulta':
+        """Solo productos de un proveedor (ver Filtro.proveedor)"""
+        return self.donde(Filtro.proveedor(id_proveedor))
+
+    def unidad(self, unidad_medida: str) -> 'Consulta':
+        """Solo productos de una unidad de medida (ver Filtro.unidad)"""
+        return self.donde(Filtro.unidad(unidad_medida))
+
+    def fecha_entre(self, desde=None, hasta=None) -> 'Consulta':
+        """Solo productos ingresados entre dos fechas (ver Filtro.fecha_entre)"""
+        return self.donde(Filtro.fecha_entre(desde, hasta))
+
+    def cantidad_entre(self, minimo=None, maximo=None) -> 'Consulta':
+        """Solo productos con cantidad en un rango (ver Filtro.cantidad_entre)"""
+        return self.donde(Filtro.cantidad_entre(minimo, maximo))
+
+    def precio_entre(self, minimo=None, maximo=None) -> 'Consulta':
+        """Solo productos con precio en un rango (ver Filtro.precio_entre)"""
+        return self.donde(Filtro.precio_entre(minimo, maximo))
+
+    def bajo_stock(self) -> 'Consulta':
+        """Solo productos con stock bajo (ver Filtro.bajo_stock)"""
+        return self.donde(Filtro.bajo_stock())
+
+    def texto(self, termino: str, ignorar_acentos: bool = False) -> 'Consulta':
+        """Solo productos con el término en nombre o código (ver Filtro.texto)"""
+        return self.donde(Filtro.texto(termino, ignorar_acentos))
+
+    def codigo_empieza(self, prefijo: str) -> 'Consulta':
+        """Solo productos cuyo código empieza con un prefijo (ver Filtro.codigo_empieza)"""
+        return self.donde(Filtro.codigo_empieza(prefijo))
+
+    # ==================== ORDEN Y LÍMITE ====================
+
+    def ordenar_por(self, campo: str, descendente: bool = False) -> 'Consulta':
+        """
+        Ordena los resultados por un campo
+
+        Sin orden, los productos salen en el orden del índice usado (o del
+        inventario, si se recorre completo).
+
+        Parámetros:
+        -----------
+        campo : str
+            Uno de CAMPOS_ORDEN
+        descendente : bool, opcional
+            True para ordenar de mayor a menor
+
+        Excepciones:
+        ------------
+        ValueError : Si el campo no existe
+        """
+        self.clave_de_orden(campo)  # Valida el campo
+        self._orden = campo
+        self._descendente = descendente
+        return self
+
+    def limitar(self, cantidad: int) -> 'Consulta':
+        """
+        Limita la cantidad de resultados
+
+        Con orden y límite no se ordena todo: se eligen los mejores con un
+        montículo (heapq), que es más rápido.
+
+        Excepciones:
+        ------------
+        ValueError : Si la cantidad es negativa
+        """
+        if cantidad < 0:
+            raise ValueError("El límite no puede ser negativo")
+        self._limite = cantidad
+        return self
+
+    @classmethod
+    def clave_de_orden(cls, campo: str) -> Callable:
+        """
+        Retorna la función que da la clave de orden de un producto
+        ==========================================================
+        Sirve tanto para Producto como para ResumenProducto. Los textos se
+        comparan en minúsculas y las fechas como (año, mes, día); las
+        fechas que no se reconocen quedan al principio.
+
+        Parámetros:
+        -----------
+        campo : str
+            Uno de CAMPOS_ORDEN
+
+        Retorna:
+        --------
+        función : valor -> clave comparable
+        """
+        if campo not in cls.CAMPOS_ORDEN:
+            raise ValueError(f"No se puede ordenar por '{campo}'")
+        if campo == 'valor_total':
+            return lambda valor: valor.valor_total_inventario()
+        if campo == 'fecha_ingreso':
+            return lambda valor: clave_fecha(valor.fecha_ingreso) or (0, 0, 0)
+        if campo in ('codigo', 'nombre', 'unidad_medida'):
+            return lambda valor: getattr(valor, campo).lower()
+        return lambda valor: getattr(valor, campo)
+
+    # ==================== EJECUCIÓN ====================
+
+    def __iter__(self) -> Iterator:
+        """
+        Ejecuta la consulta y retorna un iterador perezoso de Producto
+        """
+        return self._inventario.ejecutar_consulta(
+            self._filtro, self._orden, self._descendente, self._limite)
+
+    def paginar(self, tamano: int = 100, cursor: Optional[str] = None):
+        """
+        Retorna una página de los resultados, ordenados por código
+        ==========================================================
+        Ver Inventario.listar_pagina(). Las páginas siempre van por código
+        (es lo que hace estable al cursor), así que no se combina con
+        ordenar_por() ni con limitar().
+
+        Parámetros:
+        -----------
+        tamano : int, opcional
+            Cantidad máxima de productos de la página (por defecto 100)
+        cursor : str, opcional
+            Cursor de la página anterior (None = primera página)
+
+        Retorna:
+        --------
+        PaginaProductos : Resúmenes de la página y cursor de la siguiente
+
+        Excepciones:
+        ------------
+        ValueError : Si la consulta tiene orden o límite
+        """
+        if self._orden is not None or self._limite is not None:
+            raise ValueError("Las páginas van siempre por código: quite ordenar_por y limitar")
+        return self._inventario.listar_pagina(tamano, cursor, self._filtro)
+
+    def explicar(self) -> str:
+        """
+        Describe cómo se resolvería la consulta (qué índice se usa)
+
+        Retorna:
+        --------
+        str : Por ejemplo "índice de stock bajo (~12 productos), luego filtrar (...)"
+        """
+        if self._filtro is None:
+            return "recorrido completo, sin filtros"
+
+        filtro = self._filtro.preparar(self._inventario)
+        plan = filtro.plan(self._inventario)
+        condiciones = filtro.describir()
+        if plan is None:
+            return f"recorrido completo, luego filtrar {condiciones}"
+        estimado, descripcion, _ = plan
+        return f"{descripcion} (~{estimado} productos), luego filtrar {condiciones}"
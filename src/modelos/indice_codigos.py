@@ -0,0 +1,215 @@
+"""
+Módulo indice_codigos.py
+========================
+Archivo que contiene la clase IndiceCodigos para el sistema de gestión de
+inventario AgroCol SAS.
+
+Los códigos de los productos llevan la categoría al inicio (FERT001,
+SEM004, HERR010). El diccionario del inventario encuentra un código exacto
+al instante, pero no sabe responder "todos los FERT" o "de SEM001 a SEM050"
+sin recorrer y ordenar todos los códigos.
+
+El índice de códigos guarda los códigos ORDENADOS en una lista. Con
+búsqueda binaria (módulo bisect) se encuentra en O(log n) dónde empieza un
+prefijo o un rango, y los resultados son la porción de la lista que sigue.
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+from bisect import bisect_left, bisect_right  # Búsqueda binaria en listas ordenadas
+from typing import Iterable, Optional
+
+# Importar la normalización de las búsquedas (mayúsculas, etc.)
+from .indice_texto import IndiceTexto
+
+
+class IndiceCodigos:
+    """
+    Clase IndiceCodigos
+    ===================
+    Lista ordenada de los códigos de los productos.
+
+    Los códigos se comparan normalizados (igual que en las búsquedas de
+    texto, ver IndiceTexto.normalizar), así que "fert" encuentra FERT001.
+
+    Se guardan dos listas en paralelo: la clave normalizada (para la
+    búsqueda binaria) y el código original (para retornarlo). Agregar o
+    quitar un código cuesta O(log n) para encontrar su lugar más mover los
+    elementos siguientes de la lista (una copia de memoria muy rápida).
+
+    Atributos:
+    ----------
+    _claves : list[str]
+        Códigos normalizados, ordenados (privado)
+    _codigos : list[str]
+        Código original de cada clave, en la misma posición (privado)
+
+    Ejemplo de uso:
+    ---------------
+    >>> indice = IndiceCodigos(["SEM004", "FERT001", "FERT002"])
+    >>> indice.prefijo("fert")
+    ['FERT001', 'FERT002']
+    """
+
+    # Carácter mayor que cualquier otro: prefijo + MAXIMO queda después de
+    # todos los textos que empiezan con ese prefijo
+    MAXIMO = '\U0010ffff'
+
+    def __init__(self, codigos: Iterable[str] = ()):
+        """
+        Constructor de la clase IndiceCodigos
+        =====================================
+        Ordena los códigos una sola vez.
+
+        Parámetros:
+        -----------
+        codigos : iterable de str, opcional
+            Códigos iniciales (en cualquier orden)
+        """
+        pares = sorted((IndiceTexto.normalizar(codigo), codigo) for codigo in codigos)
+        self._claves: list[str] = [clave for clave, _ in pares]
+        self._codigos: list[str] = [codigo for _, codigo in pares]
+
+    # ==================== MANTENIMIENTO ====================
+
+    def agregar(self, codigo: str) -> None:
+        """
+        Agrega un código en su lugar del orden
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código nuevo (no debe estar en el índice)
+        """
+        clave = IndiceTexto.normalizar(codigo)
+        posicion = self._posicion(clave, codigo)
+        self._claves.insert(posicion, clave)
+        self._codigos.insert(posicion, codigo)
+
+    def quitar(self, codigo: str) -> None:
+        """
+        Quita un código del índice (si no estaba, no hace nada)
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código a quitar
+        """
+        posicion = self._posicion(IndiceTexto.normalizar(codigo), codigo)
+        if posicion < len(self._codigos) and self._codigos[posicion] == codigo:
+            del self._claves[posicion]
+            del self._codigos[posicion]
+
+    def _posicion(self, clave: str, codigo: str) -> int:
+        """
+        Retorna dónde está (o dónde iría) un código en el orden (privado)
+        ================================================================
+        Entre códigos con la misma clave (por ejemplo "fert1" y "FERT1")
+        se ordena por el código original.
+        """
+        posicion = bisect_left(self._claves, clave)
+        while (posicion < len(self._claves) and self._claves[posicion] == clave
+               and self._codigos[posicion] < codigo):
+            posicion += 1
+        return posicion
+
+    # ==================== CONSULTAS ====================
+
+    def prefijo(self, prefijo: str, limite: Optional[int] = None) -> list[str]:
+        """
+        Retorna los códigos que empiezan con un prefijo, en orden
+        =========================================================
+
+        Parámetros:
+        -----------
+        prefijo : str
+            Inicio del código (sin distinguir mayúsculas)
+        limite : int, opcional
+            Cantidad máxima de códigos a retornar (None = todos)
+
+        Retorna:
+        --------
+        list[str] : Códigos con ese prefijo
+        """
+        clave = IndiceTexto.normalizar(prefijo)
+        inicio = bisect_left(self._claves, clave)
+        fin = bisect_left(self._claves, clave + self.MAXIMO, inicio)
+        return self._porcion(inicio, fin, limite)
+
+    def rango(self, desde: Optional[str] = None, hasta: Optional[str] = None,
+              limite: Optional[int] = None) -> list[str]:
+        """
+        Retorna los códigos entre dos valores (ambos incluidos), en orden
+        =================================================================
+
+        Parámetros:
+        -----------
+        desde : str, opcional
+            Primer código del rango (None = desde el principio)
+        hasta : str, opcional
+            Último código del rango (None = hasta el final)
+        limite : int, opcional
+            Cantidad máxima de códigos a retornar (None = todos)
+
+        Retorna:
+        --------
+        list[str] : Códigos del rango
+        """
+        inicio = 0 if desde is None else bisect_left(
+            self._claves, IndiceTexto.normalizar(desde))
+        fin = len(self._claves) if hasta is None else bisect_right(
+            self._claves, IndiceTexto.normalizar(hasta))
+        return self._porcion(inicio, fin, limite)
+
+    def despues_de(self, codigo: Optional[str], limite: Optional[int] = None) -> list[str]:
+        """
+        Retorna los códigos que siguen a uno dado en el orden (sin incluirlo)
+        =====================================================================
+        Sirve para recorrer el catálogo por páginas: se pide lo que sigue al
+        último código de la página anterior. Funciona aunque ese código ya
+        no esté en el índice (se busca su lugar en el orden).
+
+        Parámetros:
+        -----------
+        codigo : str | None
+            Último código ya visto (None = desde el principio)
+        limite : int, opcional
+            Cantidad máxima de códigos a retornar (None = todos)
+
+        Retorna:
+        --------
+        list[str] : Códigos siguientes, en orden
+        """
+        if codigo is None:
+            return self._porcion(0, len(self._codigos), limite)
+
+        posicion = self._posicion(IndiceTexto.normalizar(codigo), codigo)
+        if posicion < len(self._codigos) and self._codigos[posicion] == codigo:
+            posicion += 1
+        return self._porcion(posicion, len(self._codigos), limite)
+
+    @staticmethod
+    def clave_de(codigo: str) -> tuple[str, str]:
+        """
+        Retorna la clave con la que se ordena un código en el índice
+
+        Comparar estas claves da el mismo orden que el índice (por ejemplo,
+        para ordenar otra lista de códigos igual).
+        """
+        return (IndiceTexto.normalizar(codigo), codigo)
+
+    def _porcion(self, inicio: int, fin: int, limite: Optional[int]) -> list[str]:
+        """
+        Retorna los códigos de las posiciones [inicio, fin), con límite (privado)
+        """
+        if limite is not None:
+            fin = min(fin, inicio + limite)
+        return self._codigos[inicio:fin]
+
+    def __len__(self) -> int:
+        """
+        Retorna la cantidad de códigos del índice
+        """
+        return len(self._codigos)
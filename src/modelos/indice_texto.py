@@ -0,0 +1,487 @@
+"""
+Módulo indice_texto.py
+======================
+Archivo que contiene la clase IndiceTexto para el sistema de gestión de
+inventario AgroCol SAS.
+
+Buscar "ferti" recorriendo todos los productos obliga a pasar a minúsculas
+el nombre y el código de cada uno en cada tecla que se presiona. Con
+cientos de miles de productos eso se nota.
+
+El índice de texto es un "índice invertido" de trigramas: para cada grupo
+de 3 letras seguidas ("fer", "ert", "rti"...) guarda la lista de productos
+cuyo nombre o código lo contiene. Para buscar "ferti" basta con tomar la
+lista más corta de sus trigramas y revisar solo esos productos, en lugar
+de revisarlos todos.
+
+Ejemplo:
+--------
+    "Fertilizante" -> "fer", "ert", "rti", "til", "ili", "liz", ...
+    Buscar "tiliz" -> trigramas "til", "ili", "liz" -> se revisan solo
+                      los productos de la lista más corta de esas tres.
+
+Además de la forma en minúsculas, cada texto se guarda "plegado": sin
+mayúsculas y sin tildes ("Orgánico" -> "organico"). Así la búsqueda que
+ignora tildes cuesta lo mismo que la normal: el texto plegado se calcula
+una sola vez, al agregar el producto o cambiar su nombre.
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import heapq        # Para quedarse con los mejores resultados sin ordenar todo
+import math         # Para redondear el mínimo de trigramas en común
+import unicodedata  # Para separar las letras de sus tildes
+from array import array  # Listas compactas de números (4 bytes por entrada)
+from collections import Counter  # Para contar trigramas en común por producto
+from typing import Optional
+
+
+class IndiceTexto:
+    """
+    Clase IndiceTexto
+    =================
+    Índice invertido de trigramas sobre el nombre y el código de los productos.
+
+    Las búsquedas dan EXACTAMENTE el mismo resultado que comparar
+    "termino in nombre or termino in codigo" (sin distinguir mayúsculas)
+    producto por producto, y en el mismo orden en que se agregaron los
+    productos (el orden del inventario). Con ignorar_acentos=True la
+    comparación se hace sobre los textos plegados (ver plegar).
+
+    Las listas de trigramas se arman con los textos plegados: si un
+    término aparece en el texto en minúsculas, también aparece plegado,
+    así que las mismas listas sirven para los dos modos de búsqueda.
+
+    Cada producto tiene un número interno (id): su posición en el orden de
+    inserción. Las listas de trigramas guardan esos números en arreglos
+    array('I').
+
+    Las listas no se limpian al borrar o renombrar un producto (sería
+    recorrerlas enteras): las entradas viejas quedan como "obsoletas" y la
+    búsqueda las descarta al revisar el texto actual. Cuando las obsoletas
+    son más de la mitad, el índice se reconstruye (ver _compactar).
+
+    Atributos:
+    ----------
+    _ids : dict[str, int]
+        Código -> id interno (privado)
+    _codigos : list[str | None]
+        Id -> código (None si el producto se quitó) (privado)
+    _textos : list[tuple[str, str, str, str] | None]
+        Id -> (nombre, codigo, nombre plegado, codigo plegado), ya
+        preparados para buscar (ver textos_de_busqueda) (privado)
+    _listas : dict[str, array]
+        Trigrama -> ids de los productos que lo contienen (privado)
+    _entradas : int
+        Cantidad total de ids guardados en las listas (privado)
+    _obsoletas : int
+        Cuántas de esas entradas ya no corresponden al texto actual (privado)
+    _renombrados : set[int]
+        Ids de productos que cambiaron de nombre desde la última
+        reconstrucción: pueden tener entradas obsoletas o repetidas (privado)
+
+    Ejemplo de uso:
+    ---------------
+    >>> indice = IndiceTexto()
+    >>> indice.agregar("FERT001", "Fertilizante Orgánico")
+    >>> indice.buscar("ferti")
+    ['FERT001']
+    """
+
+    # Largo de los grupos de letras del índice
+    LARGO_TRIGRAMA = 3
+
+    # Entradas obsoletas a partir de las cuales se reconstruye el índice
+    MIN_OBSOLETAS_COMPACTAR = 100000
+
+    def __init__(self):
+        """
+        Constructor de la clase IndiceTexto
+        ===================================
+        Crea un índice vacío.
+        """
+        self._ids: dict[str, int] = {}
+        self._codigos: list[Optional[str]] = []
+        self._textos: list[Optional[tuple[str, str, str, str]]] = []
+        self._listas: dict[str, array] = {}
+        self._entradas = 0
+        self._obsoletas = 0
+        self._renombrados: set[int] = set()
+
+    # ==================== NORMALIZACIÓN ====================
+
+    @staticmethod
+    def normalizar(texto: str) -> str:
+        """
+        Convierte un texto a la forma en que se compara al buscar
+
+        Parámetros:
+        -----------
+        texto : str
+            Texto original (nombre, código o término de búsqueda)
+
+        Retorna:
+        --------
+        str : Texto en minúsculas
+        """
+        return texto.lower()
+
+    @staticmethod
+    def plegar(texto: str) -> str:
+        """
+        Convierte un texto a minúsculas y sin tildes
+        ============================================
+        Usa la descomposición NFKD de Unicode, que separa cada letra de su
+        tilde ("á" -> "a" + tilde), y después descarta las tildes.
+
+        Parámetros:
+        -----------
+        texto : str
+            Texto original
+
+        Retorna:
+        --------
+        str : Texto plegado
+
+        Ejemplo:
+        --------
+        >>> IndiceTexto.plegar("Fertilizante Orgánico")
+        'fertilizante organico'
+        """
+        if texto.isascii():
+            # Sin letras especiales no hay tildes que quitar
+            return texto.lower()
+        descompuesto = unicodedata.normalize('NFKD', texto.casefold())
+        return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+    @classmethod
+    def textos_de_busqueda(cls, codigo: str, nombre: str) -> tuple[str, str, str, str]:
+        """
+        Prepara los textos con los que se compara un producto al buscar
+        ===============================================================
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto
+        nombre : str
+            Nombre del producto
+
+        Retorna:
+        --------
+        tuple : (nombre, codigo, nombre plegado, codigo plegado); los dos
+                primeros en minúsculas
+        """
+        nombre_normal = cls.normalizar(nombre)
+        codigo_normal = cls.normalizar(codigo)
+        nombre_plegado = cls.plegar(nombre)
+        codigo_plegado = cls.plegar(codigo)
+        # Si no cambian al plegar, se guarda el mismo objeto (no ocupa el doble)
+        if nombre_plegado == nombre_normal:
+            nombre_plegado = nombre_normal
+        if codigo_plegado == codigo_normal:
+            codigo_plegado = codigo_normal
+        return nombre_normal, codigo_normal, nombre_plegado, codigo_plegado
+
+    @classmethod
+    def _trigramas(cls, texto: str) -> set[str]:
+        """
+        Retorna los grupos de 3 letras seguidas de un texto (privado)
+        """
+        largo = cls.LARGO_TRIGRAMA
+        return {texto[i:i + largo] for i in range(len(texto) - largo + 1)}
+
+    def _trigramas_de(self, textos: tuple[str, str, str, str]) -> set[str]:
+        """
+        Retorna los trigramas del nombre y del código plegados, juntos (privado)
+        """
+        return self._trigramas(textos[2]) | self._trigramas(textos[3])
+
+    # ==================== MANTENIMIENTO ====================
+
+    def agregar(self, codigo: str, nombre: str) -> None:
+        """
+        Agrega un producto al índice, o actualiza su nombre si ya estaba
+        ================================================================
+        Un producto que ya estaba conserva su lugar en el orden.
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto
+        nombre : str
+            Nombre actual del producto
+        """
+        textos = self.textos_de_busqueda(codigo, nombre)
+        id_producto = self._ids.get(codigo)
+
+        if id_producto is None:
+            # Producto nuevo: va al final del orden
+            id_producto = len(self._codigos)
+            self._ids[codigo] = id_producto
+            self._codigos.append(codigo)
+            self._textos.append(textos)
+            nuevos = self._trigramas_de(textos)
+        else:
+            anteriores = self._textos[id_producto]
+            if anteriores == textos:
+                return
+            self._textos[id_producto] = textos
+            self._renombrados.add(id_producto)
+            trigramas_anteriores = self._trigramas_de(anteriores)
+            trigramas_actuales = self._trigramas_de(textos)
+            # Solo se agregan los trigramas que el texto anterior no tenía;
+            # los que ya no están quedan como entradas obsoletas
+            nuevos = trigramas_actuales - trigramas_anteriores
+            self._obsoletas += len(trigramas_anteriores - trigramas_actuales)
+
+        for trigrama in nuevos:
+            lista = self._listas.get(trigrama)
+            if lista is None:
+                lista = self._listas[trigrama] = array('I')
+            lista.append(id_producto)
+        self._entradas += len(nuevos)
+
+        self._compactar_si_hace_falta()
+
+    def quitar(self, codigo: str) -> None:
+        """
+        Quita un producto del índice (si no estaba, no hace nada)
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto
+        """
+        id_producto = self._ids.pop(codigo, None)
+        if id_producto is None:
+            return
+
+        self._obsoletas += len(self._trigramas_de(self._textos[id_producto]))
+        self._codigos[id_producto] = None
+        self._textos[id_producto] = None
+        self._renombrados.discard(id_producto)
+
+        self._compactar_si_hace_falta()
+
+    # ==================== CONSULTAS ====================
+
+    def buscar(self, termino: str, ignorar_acentos: bool = False) -> list[str]:
+        """
+        Busca productos cuyo nombre o código contenga el término
+        ========================================================
+        Con términos de 3 o más letras se revisan solo los productos de la
+        lista del trigrama menos común del término. Con términos más cortos
+        no hay trigramas: se revisan todos los textos (ya normalizados, así
+        que igual no se convierte nada a minúsculas).
+
+        Parámetros:
+        -----------
+        termino : str
+            Texto a buscar (sin distinguir mayúsculas)
+        ignorar_acentos : bool, opcional
+            Si es True, "organico" también encuentra "Orgánico"
+            (por defecto False)
+
+        Retorna:
+        --------
+        list[str] : Códigos que coinciden, en el orden del índice
+        """
+        plegado = self.plegar(termino)
+        if ignorar_acentos:
+            # Comparar con los textos plegados (posiciones 2 y 3)
+            termino, en_nombre, en_codigo = plegado, 2, 3
+        else:
+            termino, en_nombre, en_codigo = self.normalizar(termino), 0, 1
+
+        if len(plegado) < self.LARGO_TRIGRAMA:
+            return [codigo for codigo, textos in zip(self._codigos, self._textos)
+                    if textos is not None
+                    and (termino in textos[en_nombre] or termino in textos[en_codigo])]
+
+        # Buscar la lista más corta; si falta algún trigrama no hay resultados
+        candidatos = None
+        for trigrama in self._trigramas(plegado):
+            lista = self._listas.get(trigrama)
+            if lista is None:
+                return []
+            if candidatos is None or len(lista) < len(candidatos):
+                candidatos = lista
+
+        # Revisar el texto actual de cada candidato: descarta las entradas
+        # obsoletas y los que tienen los trigramas pero no el término seguido
+        textos = self._textos
+        encontrados = set()
+        for id_producto in candidatos:
+            par = textos[id_producto]
+            if par is not None and (termino in par[en_nombre] or termino in par[en_codigo]):
+                encontrados.add(id_producto)
+
+        # Un producto renombrado puede estar dos veces en una lista y un id
+        # viejo puede estar después de otro nuevo: el conjunto y sorted()
+        # dejan cada producto una vez y en orden
+        codigos = self._codigos
+        return [codigos[id_producto] for id_producto in sorted(encontrados)]
+
+    def buscar_aproximado(self, termino: str, limite: int = 10,
+                          similitud_minima: float = 0.4) -> list[tuple[str, float]]:
+        """
+        Busca los productos más parecidos al término, aunque tenga errores
+        ==================================================================
+        Sirve cuando el término está mal escrito ("fertlizante"): no exige
+        que aparezca tal cual, sino que compara trigramas. La similitud de
+        un producto es la fracción de los trigramas del término que están
+        en su nombre o código (plegados, sin tildes ni mayúsculas).
+
+        ¿Cómo se hace rápido?
+        ---------------------
+        1. Se cuenta, con las listas del índice, cuántos trigramas del
+           término tiene cada producto (Counter cuenta en C).
+        2. Se revisan los productos de mayor a menor conteo y se para
+           cuando el conteo ya no puede superar al peor de los 'limite'
+           mejores. El conteo es exacto salvo para los productos
+           renombrados (pueden tener entradas obsoletas o repetidas): a
+           esos se les recalcula con su texto actual.
+
+        Parámetros:
+        -----------
+        termino : str
+            Texto a buscar (necesita al menos 3 letras)
+        limite : int, opcional
+            Cantidad máxima de resultados (por defecto 10)
+        similitud_minima : float, opcional
+            Similitud mínima entre 0 y 1 para incluir un producto
+            (por defecto 0.4)
+
+        Retorna:
+        --------
+        list[tuple[str, float]] : (código, similitud), del más parecido al
+            menos parecido. A igual similitud va primero el de nombre más
+            corto (más parecido en total) y luego el que está antes en el orden.
+
+        Ejemplo:
+        --------
+        >>> indice.buscar_aproximado("fertlizante")
+        [('FERT001', 0.78)]
+        """
+        trigramas = self._trigramas(self.plegar(termino))
+        if not trigramas or limite <= 0:
+            return []
+        total = len(trigramas)
+        # Trigramas en común necesarios (el pequeño margen evita errores
+        # de redondeo, por ejemplo 0.4 * 10 = 4.000000000000001)
+        minimo = max(1, math.ceil(similitud_minima * total - 1e-9))
+
+        conteo = Counter()
+        for trigrama in trigramas:
+            lista = self._listas.get(trigrama)
+            if lista is not None:
+                conteo.update(lista)
+
+        # Agrupar los candidatos por su conteo (un producto renombrado puede
+        # contar de más: el conteo se limita al total de trigramas y se
+        # recalcula abajo)
+        grupos: list[list[int]] = [[] for _ in range(total + 1)]
+        for id_producto, veces in conteo.items():
+            if veces >= minimo:
+                grupos[min(veces, total)].append(id_producto)
+
+        # Montículo con los mejores 'limite': el peor queda en mejores[0]
+        mejores: list[tuple[int, int, int]] = []
+        for veces in range(total, minimo - 1, -1):
+            if len(mejores) == limite and veces < mejores[0][0]:
+                break  # nadie con este conteo puede entrar
+            for id_producto in grupos[veces]:
+                textos = self._textos[id_producto]
+                if textos is None:
+                    continue  # producto quitado
+                comunes = veces
+                if id_producto in self._renombrados:
+                    comunes = len(trigramas & self._trigramas_de(textos))
+                    if comunes < minimo:
+                        continue
+                # Mayor es mejor: más trigramas en común, luego nombre más
+                # corto, luego el primero en el orden
+                clave = (comunes, -len(textos[2]), -id_producto)
+                if len(mejores) < limite:
+                    heapq.heappush(mejores, clave)
+                elif clave > mejores[0]:
+                    heapq.heapreplace(mejores, clave)
+
+        return [(self._codigos[-menos_id], comunes / total)
+                for comunes, _, menos_id in sorted(mejores, reverse=True)]
+
+    def codigos(self) -> list[str]:
+        """
+        Retorna los códigos indexados, en orden
+
+        Retorna:
+        --------
+        list[str] : Códigos de los productos del índice
+        """
+        return [codigo for codigo in self._codigos if codigo is not None]
+
+    def texto_de(self, codigo: str) -> Optional[tuple[str, str, str, str]]:
+        """
+        Retorna los textos de búsqueda de un producto (ver textos_de_busqueda)
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto
+
+        Retorna:
+        --------
+        tuple | None : Textos de búsqueda, o None si no está
+        """
+        id_producto = self._ids.get(codigo)
+        if id_producto is None:
+            return None
+        return self._textos[id_producto]
+
+    def __len__(self) -> int:
+        """
+        Retorna la cantidad de productos indexados
+        """
+        return len(self._ids)
+
+    # ==================== MÉTODOS INTERNOS ====================
+
+    def _compactar_si_hace_falta(self) -> None:
+        """
+        Reconstruye el índice si más de la mitad de las entradas son obsoletas (privado)
+        """
+        if (self._obsoletas >= self.MIN_OBSOLETAS_COMPACTAR
+                and self._obsoletas * 2 > self._entradas):
+            self._compactar()
+
+    def _compactar(self) -> None:
+        """
+        Reconstruye las listas solo con los productos actuales (privado)
+        ===============================================================
+        Conserva el orden de los productos; solo cambian los ids.
+        """
+        vivos = [(codigo, textos) for codigo, textos in zip(self._codigos, self._textos)
+                 if codigo is not None]
+
+        self._ids = {}
+        self._codigos = []
+        self._textos = []
+        self._listas = {}
+        self._entradas = 0
+        self._obsoletas = 0
+        self._renombrados = set()
+
+        for id_producto, (codigo, textos) in enumerate(vivos):
+            self._ids[codigo] = id_producto
+            self._codigos.append(codigo)
+            self._textos.append(textos)
+            trigramas = self._trigramas_de(textos)
+            for trigrama in trigramas:
+                lista = self._listas.get(trigrama)
+                if lista is None:
+                    lista = self._listas[trigrama] = array('I')
+                lista.append(id_producto)
+            self._entradas += len(trigramas)
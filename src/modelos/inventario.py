@@ -11,9 +11,19 @@ Fecha: 2025
 """
 
 # Importar las clases necesarias desde otros módulos
-from typing import Optional
+import heapq  # Para elegir los primeros resultados de una consulta sin ordenar todo
+import math  # Para comparar los totales con una tolerancia
+from bisect import bisect_left, insort  # Para mantener ordenado el índice de stock bajo
+from typing import Iterator, Optional
 from .producto import Producto
 from .proveedor import Proveedor
+from .resumen_producto import ResumenProducto
+from .almacen_columnar import AlmacenColumnar
+from .analitica import AnaliticaInventario
+from .indice_texto import IndiceTexto
+from .indice_codigos import IndiceCodigos
+from .consulta import Consulta, Filtro
+from .pagina_productos import PaginaProductos
 
 
 class Inventario:
@@ -31,13 +41,68 @@ class Inventario:
 
     Atributos:
     ----------
-    _productos : dict[str, Producto]
-        Diccionario que almacena productos usando el código como clave (privado)
+    _productos : dict[str, Producto | ResumenProducto] | AlmacenColumnar
+        Diccionario que almacena productos usando el código como clave (privado).
+        En la carga perezosa guarda resúmenes livianos, que se convierten en
+        Producto completo la primera vez que se necesitan (ver _materializar).
+        Con almacen='columnar' es un AlmacenColumnar (se usa igual)
+    _almacen : str
+        'diccionario' o 'columnar' (privado)
+    _perezoso : bool
+        True si los productos cargados se guardan como resúmenes (privado)
     _proveedores : dict[str, Proveedor]
         Diccionario que almacena proveedores usando el ID como clave (privado)
+    _cambios_pendientes : list[dict]
+        Registros de los cambios hechos desde el último guardado (privado).
+        La capa de persistencia los usa para escribir solo lo que cambió.
+    _productos_modificados : set[str]
+        Códigos de productos agregados o modificados desde el último guardado (privado)
+    _productos_eliminados : set[str]
+        Códigos de productos eliminados desde el último guardado (privado)
+    _proveedores_modificados : set[str]
+        IDs de proveedores agregados o modificados desde el último guardado (privado)
+    _cambios_sellados : int
+        Cuántos registros del inicio de _cambios_pendientes se están guardando
+        en segundo plano; esos registros ya no se pueden reemplazar (privado)
+    _motor_consultas : objeto | None
+        Motor externo (por ejemplo BackendSQLite) que puede responder algunas
+        consultas con índices en lugar de recorrer los productos (privado)
+    _estadisticas : dict | None
+        Últimas estadísticas calculadas (ver obtener_estadisticas); se
+        descartan con cualquier cambio (privado)
+    _valor_total : float
+        Suma de cantidad × precio_costo de todos los productos, al día
+        después de cada cambio (privado)
+    _claves_bajo_stock : dict[str, tuple[float, str]]
+        Productos con cantidad <= stock mínimo: código -> su clave en
+        _indice_bajo_stock. Al día después de cada cambio (privado)
+    _indice_bajo_stock : list[tuple[float, str]]
+        Los mismos productos como (criticidad, codigo), ordenados del más
+        crítico al menos crítico (ver _criticidad) (privado)
+    _codigos_por_proveedor : dict[str, dict[str, None]]
+        Índice id_proveedor -> códigos de sus productos. Los códigos se
+        guardan como claves de un diccionario (un conjunto que conserva el
+        orden en que se agregaron) (privado)
+    _indice_texto : IndiceTexto | None
+        Índice de trigramas de nombre y código para buscar_productos. Se
+        arma la primera vez que se busca (None hasta entonces) y desde ahí
+        se mantiene al día con cada cambio (privado)
+    _indice_codigos : IndiceCodigos | None
+        Códigos ordenados para consultas por prefijo y por rango. Igual que
+        el índice de texto, se arma en la primera consulta (privado)
     """
 
-    def __init__(self):
+    # Versión del esquema que escribe to_dict():
+    # 1 = cada producto incluye una copia completa de su proveedor
+    # 2 = cada producto solo guarda 'id_proveedor' (esquema normalizado)
+    VERSION_ESQUEMA = 2
+
+    # Formas de guardar los productos en memoria:
+    # - diccionario: {codigo: Producto} (la de siempre)
+    # - columnar   : AlmacenColumnar, datos por columnas en arreglos
+    ALMACENES = ('diccionario', 'columnar')
+
+    def __init__(self, perezoso: bool = False, almacen: str = 'diccionario'):
         """
         Constructor de la clase Inventario
         ==================================
@@ -46,18 +111,80 @@ class Inventario:
         Los diccionarios permiten acceso rápido O(1) a productos y proveedores
         por su código/ID sin necesidad de recorrer toda la lista.
 
+        Parámetros:
+        -----------
+        perezoso : bool, opcional
+            Si es True, los productos que se cargan desde un archivo o desde
+            el diario se guardan como ResumenProducto y el objeto Producto
+            solo se crea cuando alguien lo pide (obtener_producto, búsquedas,
+            movimientos de stock...). Así abrir un catálogo muy grande es casi
+            inmediato. Por defecto False.
+        almacen : str, opcional
+            'diccionario' (por defecto) o 'columnar'. El almacén columnar
+            ocupa mucha menos memoria y sus columnas se usan sin copiar en
+            obtener_estadisticas; los productos cargados se guardan siempre
+            como resúmenes (igual que con perezoso=True).
+
+        Excepciones:
+        ------------
+        ValueError : Si el almacén indicado no existe
+
         Ejemplo de uso:
         ---------------
         >>> inventario = Inventario()
         >>> print(f"Productos: {inventario.obtener_cantidad_total_productos()}")
         Productos: 0
         """
+        if almacen not in self.ALMACENES:
+            raise ValueError(f"Almacén de productos desconocido: {almacen}")
+        self._almacen = almacen
+
         # Diccionario vacío para almacenar productos: {codigo: objeto_producto}
-        self._productos: dict[str, Producto] = {}
+        # (o el almacén columnar, que se usa igual que un diccionario)
+        self._productos: dict[str, Producto | ResumenProducto] = (
+            AlmacenColumnar() if almacen == 'columnar' else {})
+        # En el almacén columnar los datos ya viven en las columnas: crear
+        # cada Producto al cargar solo gastaría memoria
+        self._perezoso = perezoso or almacen == 'columnar'
 
         # Diccionario vacío para almacenar proveedores: {id: objeto_proveedor}
         self._proveedores: dict[str, Proveedor] = {}
 
+        # Lista de cambios pendientes de guardar, en el orden en que ocurrieron
+        # Ejemplo: [{'op': 'stock', 'codigo': 'FERT001', 'delta': -5.0}]
+        self._cambios_pendientes: list[dict] = []
+
+        # Conjunto de cambios (dirty tracking): qué entidades cambiaron desde
+        # el último guardado, sin importar cuántas veces
+        self._productos_modificados: set[str] = set()
+        self._productos_eliminados: set[str] = set()
+        self._proveedores_modificados: set[str] = set()
+
+        # Registros que un guardado en segundo plano ya tomó (ver sellar_cambios)
+        self._cambios_sellados = 0
+
+        # Motor de consultas opcional (None = siempre recorrer en Python)
+        self._motor_consultas = None
+
+        # Estadísticas calculadas (se calculan la primera vez que se piden)
+        self._estadisticas: Optional[dict] = None
+
+        # Totales acumulados: se actualizan con cada cambio en lugar de
+        # recorrer todos los productos cada vez que se consultan
+        self._valor_total = 0.0
+        self._claves_bajo_stock: dict[str, tuple[float, str]] = {}
+        self._indice_bajo_stock: list[tuple[float, str]] = []
+
+        # Índice secundario: productos de cada proveedor
+        self._codigos_por_proveedor: dict[str, dict[str, None]] = {}
+
+        # Índice de texto para las búsquedas por nombre o código (se arma
+        # en la primera búsqueda para no hacer más lenta la carga)
+        self._indice_texto: Optional[IndiceTexto] = None
+
+        # Índice de códigos ordenados (también se arma en la primera consulta)
+        self._indice_codigos: Optional[IndiceCodigos] = None
+
     # ==================== MÉTODOS DE GESTIÓN DE PROVEEDORES ====================
 
     def agregar_proveedor(self, proveedor: Proveedor) -> None:
@@ -84,7 +211,10 @@ class Inventario:
             raise ValueError(f"El proveedor con ID {proveedor.id_proveedor} ya existe")
 
         # Agregar al diccionario usando el ID como clave
-        self._proveedores[proveedor.id_proveedor] = proveedor
+        self._insertar_proveedor(proveedor)
+
+        # Registrar el cambio para la capa de persistencia
+        self._marcar_proveedor_modificado(proveedor)
 
     def obtener_proveedor(self, id_proveedor: str) -> Optional[Proveedor]:
         """
@@ -162,7 +292,10 @@ class Inventario:
             self.agregar_proveedor(producto.proveedor)
 
         # Agregar el producto al diccionario usando el código como clave
-        self._productos[producto.codigo] = producto
+        self._insertar_producto(producto)
+
+        # Registrar el cambio para la capa de persistencia
+        self._marcar_producto_modificado(producto)
 
     def obtener_producto(self, codigo: str) -> Optional[Producto]:
         """
@@ -185,7 +318,7 @@ class Inventario:
         >>> if producto:
         ...     print(f"{producto.nombre}: {producto.cantidad}")
         """
-        return self._productos.get(codigo)
+        return self._materializar(codigo)
 
     def actualizar_producto(self, producto: Producto) -> None:
         """
@@ -212,8 +345,15 @@ class Inventario:
         if producto.codigo not in self._productos:
             raise ValueError(f"El producto con código {producto.codigo} no existe")
 
-        # Actualizar el producto en el diccionario
-        self._productos[producto.codigo] = producto
+        # Actualizar el producto en el diccionario (si es otro objeto con
+        # el mismo código, el anterior deja de ser observado)
+        anterior = self._productos[producto.codigo]
+        if anterior is not producto:
+            self._dejar_de_observar(anterior)
+            self._insertar_producto(producto)
+
+        # Registrar el cambio para la capa de persistencia
+        self._marcar_producto_modificado(producto)
 
     def eliminar_producto(self, codigo: str) -> None:
         """
@@ -237,8 +377,74 @@ class Inventario:
         if codigo not in self._productos:
             raise ValueError(f"El producto con código {codigo} no existe")
 
-        # Eliminar del diccionario usando del
-        del self._productos[codigo]
+        # Eliminar del diccionario
+        self._quitar_producto(codigo)
+
+        # Registrar el cambio para la capa de persistencia
+        self._productos_modificados.discard(codigo)
+        self._productos_eliminados.add(codigo)
+        self._registrar_cambio({'op': 'eliminar_producto', 'codigo': codigo})
+
+    def agregar_stock(self, codigo: str, cantidad: float) -> None:
+        """
+        Incrementa el stock de un producto del inventario
+        =================================================
+        Igual que Producto.agregar_stock(), pero buscando el producto por su
+        código. El movimiento queda registrado como un cambio pequeño (solo
+        el código y la cantidad) para que el guardado no tenga que escribir
+        el producto completo.
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto
+        cantidad : float
+            Cantidad a agregar (debe ser positiva)
+
+        Excepciones:
+        ------------
+        ValueError : Si el producto no existe o la cantidad no es válida
+
+        Ejemplo:
+        --------
+        >>> inventario.agregar_stock("FERT001", 50)
+        """
+        producto = self._materializar(codigo)
+        if producto is None:
+            raise ValueError(f"El producto con código {codigo} no existe")
+
+        # El producto avisa del cambio a su observador (este inventario)
+        producto.agregar_stock(cantidad)
+
+    def retirar_stock(self, codigo: str, cantidad: float) -> None:
+        """
+        Disminuye el stock de un producto del inventario
+        ================================================
+        Igual que Producto.retirar_stock(), pero buscando el producto por su
+        código. El movimiento queda registrado como un cambio pequeño.
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto
+        cantidad : float
+            Cantidad a retirar (debe ser positiva y no mayor al stock)
+
+        Excepciones:
+        ------------
+        ValueError : Si el producto no existe, la cantidad no es válida
+                     o no hay suficiente stock
+
+        Ejemplo:
+        --------
+        >>> inventario.retirar_stock("FERT001", 10)
+        """
+        producto = self._materializar(codigo)
+        if producto is None:
+            raise ValueError(f"El producto con código {codigo} no existe")
+
+        # El producto avisa del cambio a su observador (este inventario)
+        producto.retirar_stock(cantidad)
 
     def listar_productos(self) -> list[Producto]:
         """
@@ -254,20 +460,136 @@ class Inventario:
         >>> productos = inventario.listar_productos()
         >>> print(f"Total productos: {len(productos)}")
         """
+        # En la carga perezosa esto crea TODOS los productos; para solo
+        # mostrarlos es mejor listar_resumenes() o, mejor aún, listar_pagina()
+        self._materializar_todos()
         return list(self._productos.values())
 
+    def listar_resumenes(self) -> list[ResumenProducto]:
+        """
+        Retorna un resumen liviano de cada producto, sin crear objetos Producto
+        ======================================================================
+        Pensado para mostrar el catálogo (por ejemplo, las filas de la tabla
+        de la ventana principal). Los productos que todavía no se crearon
+        no se crean; los que ya existen se resumen con sus datos actuales.
+
+        Retorna:
+        --------
+        list[ResumenProducto] : Resúmenes en el mismo orden que listar_productos()
+
+        Ejemplo:
+        --------
+        >>> for r in inventario.listar_resumenes():
+        ...     print(r.codigo, r.nombre, r.cantidad)
+        """
+        return [self._resumen_de(p) for p in self._productos.values()]
+
+    def listar_pagina(self, tamano: int = 100, cursor: Optional[str] = None,
+                      filtro: Optional[Filtro] = None) -> PaginaProductos:
+        """
+        Retorna una página de productos, ordenados por código
+        =====================================================
+        En lugar de copiar todo el catálogo (listar_productos), entrega solo
+        'tamano' productos y un cursor para pedir los siguientes (ver
+        PaginaProductos). El orden es estable: por código, sin distinguir
+        mayúsculas (el del índice de códigos). Como el cursor recuerda el
+        último código entregado, agregar o quitar productos entre una página
+        y otra no repite ni salta ninguno de los demás.
+
+        Costo:
+        ------
+        - Sin filtro: O(log n + tamano), con el índice de códigos.
+        - Con un filtro que tiene índice (proveedor, stock bajo, texto,
+          prefijo) que deja pocos candidatos: se revisan solo esos.
+        - Con otros filtros (o si el índice deja pasar a casi todos): se
+          recorre el índice de códigos desde el cursor hasta completar la
+          página.
+
+        Parámetros:
+        -----------
+        tamano : int, opcional
+            Cantidad máxima de productos de la página (por defecto 100)
+        cursor : str, opcional
+            Cursor de la página anterior (None = primera página)
+        filtro : Filtro, opcional
+            Solo los productos que lo cumplen (ver Filtro)
+
+        Retorna:
+        --------
+        PaginaProductos : Resúmenes de la página y cursor de la siguiente
+
+        Excepciones:
+        ------------
+        ValueError : Si el tamaño no es positivo o el cursor no es válido
+
+        Ejemplo:
+        --------
+        >>> pagina = inventario.listar_pagina(tamano=50)
+        >>> while pagina.siguiente is not None:
+        ...     pagina = inventario.listar_pagina(tamano=50, cursor=pagina.siguiente)
+        """
+        if tamano <= 0:
+            raise ValueError("El tamaño de página debe ser mayor que cero")
+        ultimo = None if cursor is None else PaginaProductos.leer_cursor(cursor)
+
+        plan = None
+        if filtro is not None:
+            filtro = filtro.preparar(self)
+            plan = filtro.plan(self)
+            # Revisar los m candidatos del índice cuesta ~m; recorrer los
+            # códigos en orden hasta llenar la página cuesta ~tamano·n/m.
+            # Con índices poco selectivos (m grande) conviene lo segundo
+            if plan is not None and plan[0] * plan[0] > (tamano + 1) * len(self._productos):
+                plan = None
+
+        # Se busca UN producto más que el tamaño: si aparece, hay otra página
+        productos = self._productos
+        if plan is None:
+            indice = self._obtener_indice_codigos()
+            codigos: list[str] = []
+            desde = ultimo
+            while len(codigos) <= tamano:
+                bloque = indice.despues_de(desde, tamano + 1)
+                if not bloque:
+                    break
+                codigos.extend(codigo for codigo in bloque
+                               if filtro is None or filtro.cumple(productos[codigo]))
+                desde = bloque[-1]
+        else:
+            # Candidatos del índice: se eligen los primeros después del cursor
+            # con heapq, sin ordenar todos
+            clave_ultimo = None if ultimo is None else IndiceCodigos.clave_de(ultimo)
+            claves = (IndiceCodigos.clave_de(codigo) for codigo in plan[2]()
+                      if codigo in productos and filtro.cumple(productos[codigo]))
+            elegidas = heapq.nsmallest(
+                tamano + 1, (clave for clave in claves
+                             if clave_ultimo is None or clave > clave_ultimo))
+            codigos = [codigo for _, codigo in elegidas]
+
+        hay_mas = len(codigos) > tamano
+        codigos = codigos[:tamano]
+        return PaginaProductos(
+            [self._resumen_de(productos[codigo]) for codigo in codigos],
+            PaginaProductos.crear_cursor(codigos[-1]) if hay_mas else None)
+
     # ==================== MÉTODOS DE BÚSQUEDA Y FILTRADO ====================
 
-    def buscar_productos(self, termino: str) -> list[Producto]:
+    def buscar_productos(self, termino: str, ignorar_acentos: bool = False) -> list[Producto]:
         """
         Busca productos por nombre o código
         ===================================
-        La búsqueda no distingue entre mayúsculas y minúsculas.
+        La búsqueda no distingue entre mayúsculas y minúsculas. Los
+        productos vienen en el mismo orden que listar_productos().
 
         Parámetros:
         -----------
         termino : str
             Término de búsqueda a buscar en nombre o código
+        ignorar_acentos : bool, opcional
+            Si es True tampoco distingue tildes: "organico" encuentra
+            "Fertilizante Orgánico". Cuesta lo mismo que la búsqueda normal,
+            porque el índice guarda los textos sin tildes desde que se
+            agrega el producto o cambia su nombre. Por defecto False.
 
         Retorna:
         --------
@@ -278,28 +600,189 @@ class Inventario:
         >>> productos = inventario.buscar_productos("ferti")
         >>> for p in productos:
         ...     print(p.nombre)  # Mostrará productos con "ferti" en el nombre
+        >>> inventario.buscar_productos("quimicos", ignorar_acentos=True)
+        """
+        # El índice de texto ya tiene el nombre y el código de cada producto
+        # en minúsculas (y sin tildes) y solo revisa los productos que
+        # comparten trigramas con el término (ver IndiceTexto). Solo se crea
+        # el Producto completo de los que coinciden
+        indice = self._obtener_indice_texto()
+        return [self._materializar(codigo)
+                for codigo in indice.buscar(termino, ignorar_acentos)]
+
+    def buscar_productos_pagina(self, termino: str, tamano: int = 100,
+                                cursor: Optional[str] = None,
+                                ignorar_acentos: bool = False) -> PaginaProductos:
         """
-        # Convertir el término a minúsculas para búsqueda no sensible a mayúsculas
-        termino = termino.lower()
+        Igual que buscar_productos(), pero por páginas ordenadas por código
+        ===================================================================
+        Pensado para mostrar resultados de búsquedas amplias (por ejemplo
+        "se") sin crear ni insertar en la tabla miles de productos de una
+        vez. Ver listar_pagina().
 
-        # Lista para almacenar resultados
-        resultados = []
+        Parámetros:
+        -----------
+        termino : str
+            Término a buscar en nombre o código
+        tamano : int, opcional
+            Cantidad máxima de productos de la página (por defecto 100)
+        cursor : str, opcional
+            Cursor de la página anterior (None = primera página)
+        ignorar_acentos : bool, opcional
+            Si es True tampoco distingue tildes (por defecto False)
 
-        # Recorrer todos los productos del diccionario
-        for producto in self._productos.values():
-            # Buscar en nombre y código (convertidos a minúsculas)
-            if (termino in producto.nombre.lower() or
-                termino in producto.codigo.lower()):
-                resultados.append(producto)
+        Retorna:
+        --------
+        PaginaProductos : Resúmenes de la página y cursor de la siguiente
 
-        return resultados
+        Ejemplo:
+        --------
+        >>> pagina = inventario.buscar_productos_pagina("urea", tamano=20)
+        """
+        return self.listar_pagina(tamano, cursor, Filtro.texto(termino, ignorar_acentos))
 
-    def obtener_productos_bajo_stock(self) -> list[Producto]:
+    def buscar_productos_aproximado(self, termino: str, limite: int = 10,
+                                    similitud_minima: float = 0.4) -> list[Producto]:
+        """
+        Busca los productos más parecidos al término, tolerando errores de escritura
+        ============================================================================
+        A diferencia de buscar_productos(), el término no tiene que aparecer
+        tal cual: "fertlizante" o "herbisida" encuentran "Fertilizante" y
+        "Herbicida". Compara trigramas (grupos de 3 letras) sin tildes ni
+        mayúsculas y retorna los mejores primero (ver
+        IndiceTexto.buscar_aproximado).
+
+        Parámetros:
+        -----------
+        termino : str
+            Texto a buscar (necesita al menos 3 letras)
+        limite : int, opcional
+            Cantidad máxima de productos (por defecto 10)
+        similitud_minima : float, opcional
+            Fracción mínima de trigramas del término que debe tener un
+            producto, entre 0 y 1 (por defecto 0.4)
+
+        Retorna:
+        --------
+        list[Producto] : Productos del más parecido al menos parecido
+
+        Ejemplo:
+        --------
+        >>> for p in inventario.buscar_productos_aproximado("semila de maiz"):
+        ...     print(p.nombre)
+        """
+        resultados = self._obtener_indice_texto().buscar_aproximado(
+            termino, limite, similitud_minima)
+        return [self._materializar(codigo) for codigo, _ in resultados]
+
+    def obtener_productos_por_prefijo(self, prefijo: str,
+                                      limite: Optional[int] = None) -> list[Producto]:
+        """
+        Retorna los productos cuyo código empieza con un prefijo
+        ========================================================
+        Los códigos llevan la categoría al inicio, así que sirve para pedir
+        "todos los fertilizantes" con el prefijo "FERT". No distingue
+        mayúsculas. Usa el índice de códigos ordenados: no recorre el
+        inventario.
+
+        Parámetros:
+        -----------
+        prefijo : str
+            Inicio del código
+        limite : int, opcional
+            Cantidad máxima de productos a retornar (None = todos)
+
+        Retorna:
+        --------
+        list[Producto] : Productos ordenados por código
+
+        Ejemplo:
+        --------
+        >>> for p in inventario.obtener_productos_por_prefijo("FERT"):
+        ...     print(p.codigo, p.nombre)
+        """
+        codigos = self._obtener_indice_codigos().prefijo(prefijo, limite)
+        return [self._materializar(codigo) for codigo in codigos]
+
+    def obtener_productos_en_rango(self, desde: Optional[str] = None,
+                                   hasta: Optional[str] = None,
+                                   limite: Optional[int] = None) -> list[Producto]:
+        """
+        Retorna los productos con código entre dos valores, ordenados por código
+        =======================================================================
+        Los dos extremos se incluyen y no se distinguen mayúsculas. Sin
+        extremos retorna todos los productos ordenados por código, sin
+        tener que ordenar el inventario en cada llamada.
+
+        Parámetros:
+        -----------
+        desde : str, opcional
+            Primer código del rango (None = desde el principio)
+        hasta : str, opcional
+            Último código del rango (None = hasta el final)
+        limite : int, opcional
+            Cantidad máxima de productos a retornar (None = todos)
+
+        Retorna:
+        --------
+        list[Producto] : Productos del rango, ordenados por código
+
+        Ejemplo:
+        --------
+        >>> productos = inventario.obtener_productos_en_rango("SEM001", "SEM050")
+        """
+        codigos = self._obtener_indice_codigos().rango(desde, hasta, limite)
+        return [self._materializar(codigo) for codigo in codigos]
+
+    def autocompletar_codigo(self, prefijo: str, limite: int = 10) -> list[str]:
+        """
+        Sugiere códigos que empiezan con lo que se lleva escrito
+        ========================================================
+        Pensado para el campo de búsqueda: retorna solo códigos (no crea
+        productos), ordenados, y como mucho 'limite'.
+
+        Parámetros:
+        -----------
+        prefijo : str
+            Texto escrito hasta el momento
+        limite : int, opcional
+            Cantidad máxima de sugerencias (por defecto 10)
+
+        Retorna:
+        --------
+        list[str] : Códigos sugeridos (vacía si el prefijo está vacío)
+
+        Ejemplo:
+        --------
+        >>> inventario.autocompletar_codigo("fe")
+        ['FERT001', 'FERT002', 'FERT003']
+        """
+        prefijo = prefijo.strip()
+        if not prefijo:
+            return []
+        return self._obtener_indice_codigos().prefijo(prefijo, limite)
+
+    def obtener_productos_bajo_stock(self, inicio: int = 0,
+                                     cantidad: Optional[int] = None) -> list[Producto]:
         """
         Retorna los productos que están por debajo del stock mínimo
         ==========================================================
         Útil para generar alertas de reabastecimiento.
 
+        Los productos vienen ordenados del MÁS crítico al menos crítico
+        (menor cantidad en proporción a su stock mínimo primero). No se
+        recorre el inventario: se leen del índice de stock bajo, que se
+        mantiene al día con cada cambio. Con inicio y cantidad se pide
+        solo una parte (por ejemplo, los 5 más urgentes o una página de
+        un reporte) y solo se crean los Producto de esa parte.
+
+        Parámetros:
+        -----------
+        inicio : int, opcional
+            Posición del primer producto a retornar (0 = el más crítico)
+        cantidad : int, opcional
+            Cantidad máxima de productos a retornar (None = todos)
+
         Retorna:
         --------
         list[Producto] : Lista de productos con stock bajo
@@ -311,14 +794,26 @@ class Inventario:
         ...     print("¡Alerta! Productos que necesitan reabastecimiento:")
         ...     for p in productos_bajo_stock:
         ...         print(f"- {p.nombre}: {p.cantidad} {p.unidad_medida}")
+        >>> mas_urgentes = inventario.obtener_productos_bajo_stock(cantidad=5)
         """
-        # List comprehension: crea lista filtrando productos bajo stock
-        return [p for p in self._productos.values() if p.esta_bajo_stock()]
+        fin = None if cantidad is None else inicio + cantidad
+
+        # Si hay un motor de consultas y no hay cambios sin guardar, la base
+        # de datos está al día y puede responder usando su índice (en el
+        # mismo orden que el índice en memoria)
+        if self._puede_usar_motor():
+            return self._productos_desde_codigos(
+                self._motor_consultas.codigos_bajo_stock()[inicio:fin])
+
+        return [self._materializar(codigo)
+                for _, codigo in self._indice_bajo_stock[inicio:fin]]
 
     def obtener_productos_por_proveedor(self, id_proveedor: str) -> list[Producto]:
         """
         Retorna los productos de un proveedor específico
         ===============================================
+        No recorre el inventario: usa el índice de productos por proveedor,
+        así que el costo depende solo de cuántos productos tiene el proveedor.
 
         Parámetros:
         -----------
@@ -334,9 +829,195 @@ class Inventario:
         >>> productos = inventario.obtener_productos_por_proveedor("PROV001")
         >>> print(f"Productos del proveedor: {len(productos)}")
         """
-        # List comprehension: filtrar productos por ID de proveedor
-        return [p for p in self._productos.values()
-                if p.proveedor.id_proveedor == id_proveedor]
+        # Consultar al motor externo si está disponible y al día
+        if self._puede_usar_motor():
+            return self._productos_desde_codigos(
+                self._motor_consultas.codigos_por_proveedor(id_proveedor))
+
+        return [self._materializar(codigo)
+                for codigo in self._codigos_por_proveedor.get(id_proveedor, ())]
+
+    def obtener_cantidad_productos_por_proveedor(self, id_proveedor: str) -> int:
+        """
+        Retorna cuántos productos tiene un proveedor, en O(1)
+        ====================================================
+        Igual que len(obtener_productos_por_proveedor(id)), pero sin crear
+        ni recorrer los productos.
+
+        Parámetros:
+        -----------
+        id_proveedor : str
+            ID del proveedor
+
+        Retorna:
+        --------
+        int : Cantidad de productos del proveedor (0 si no tiene o no existe)
+
+        Ejemplo:
+        --------
+        >>> total = inventario.obtener_cantidad_productos_por_proveedor("PROV001")
+        >>> print(f"Productos del proveedor: {total}")
+        """
+        return len(self._codigos_por_proveedor.get(id_proveedor, ()))
+
+    def establecer_motor_consultas(self, motor) -> None:
+        """
+        Conecta un motor externo para resolver consultas con índices
+        ============================================================
+        El motor debe tener los métodos codigos_bajo_stock() y
+        codigos_por_proveedor(id_proveedor). Solo se usa mientras no haya
+        cambios pendientes de guardar (si los hay, sus datos estarían
+        desactualizados y se usan los índices en memoria).
+
+        codigos_bajo_stock() debe devolver los códigos en el mismo orden
+        que el índice de stock bajo: del más crítico al menos crítico
+        (cantidad / stock_minimo, o 0 si el mínimo es 0) y, a igual
+        criticidad, por código.
+
+        Parámetros:
+        -----------
+        motor : objeto | None
+            Motor de consultas, o None para desconectarlo
+
+        Ejemplo:
+        --------
+        >>> inventario.establecer_motor_consultas(backend_sqlite)
+        """
+        self._motor_consultas = motor
+
+    def _puede_usar_motor(self) -> bool:
+        """
+        Indica si el motor de consultas está conectado y al día (privado)
+        """
+        return self._motor_consultas is not None and not self._cambios_pendientes
+
+    def _productos_desde_codigos(self, codigos: list[str]) -> list[Producto]:
+        """
+        Convierte una lista de códigos en la lista de productos (privado)
+        """
+        return [self._materializar(c) for c in codigos if c in self._productos]
+
+    # ==================== MÉTODOS DE CONSULTAS COMBINADAS ====================
+
+    def consultar(self) -> Consulta:
+        """
+        Crea una consulta sobre los productos del inventario
+        ====================================================
+        Los filtros se combinan con Y (encadenando métodos) o con Y/O
+        (usando Filtro y los operadores & y |). Se elige solo el índice más
+        selectivo (proveedores, stock bajo, texto o códigos) antes de
+        revisar productos. Ver la clase Consulta.
+
+        Retorna:
+        --------
+        Consulta : Consulta nueva, sin filtros (todos los productos)
+
+        Ejemplo:
+        --------
+        >>> for p in inventario.consultar().proveedor("PROV001").bajo_stock():
+        ...     print(p.nombre, p.cantidad)
+        >>> caros = (inventario.consultar()
+        ...          .donde(Filtro.unidad("kg") | Filtro.unidad("bultos"))
+        ...          .ordenar_por("precio_costo", descendente=True)
+        ...          .limitar(10))
+        """
+        return Consulta(self)
+
+    def ejecutar_consulta(self, filtro: Optional[Filtro] = None, orden: Optional[str] = None,
+                          descendente: bool = False,
+                          limite: Optional[int] = None) -> Iterator[Producto]:
+        """
+        Ejecuta una consulta y entrega los productos de a uno (iterador perezoso)
+        ========================================================================
+        Normalmente se usa a través de consultar(). Pasos:
+        1. Candidatos: los códigos del índice más selectivo del filtro, o
+           todos los códigos si ningún índice sirve.
+        2. Cada candidato se revisa con el filtro completo sobre sus datos
+           guardados, sin crear el Producto.
+        3. Con orden, se ordenan los que pasan (con límite, solo se eligen
+           los primeros con heapq). Sin orden, se entregan a medida que se
+           encuentran y se deja de revisar al llegar al límite.
+        4. El Producto completo se crea recién al entregarlo.
+
+        Si el inventario cambia mientras se recorre, los productos que ya
+        no existen se saltan.
+
+        Parámetros:
+        -----------
+        filtro : Filtro, opcional
+            Condiciones (None = todos los productos)
+        orden : str, opcional
+            Campo de Consulta.CAMPOS_ORDEN (None = orden del índice usado)
+        descendente : bool, opcional
+            True para ordenar de mayor a menor
+        limite : int, opcional
+            Cantidad máxima de productos (None = todos)
+
+        Retorna:
+        --------
+        Iterator[Producto] : Productos que cumplen el filtro
+        """
+        # El filtro preparado es solo de esta ejecución: otra consulta con
+        # el mismo filtro, recorrida al mismo tiempo, prepara el suyo
+        plan = None
+        if filtro is not None:
+            filtro = filtro.preparar(self)
+            plan = filtro.plan(self)
+
+        # Con índice: sus códigos. Sin índice: una copia de los códigos, para
+        # que agregar o quitar productos durante el recorrido no lo rompa
+        codigos = plan[2]() if plan is not None else list(self._productos)
+        productos = self._productos
+
+        def que_cumplen():
+            for codigo in codigos:
+                valor = productos.get(codigo)
+                if valor is not None and (filtro is None or filtro.cumple(valor)):
+                    yield valor
+
+        if orden is not None:
+            clave = Consulta.clave_de_orden(orden)
+            if limite is not None:
+                elegir = heapq.nlargest if descendente else heapq.nsmallest
+                elegidos = elegir(limite, que_cumplen(), key=clave)
+            else:
+                elegidos = sorted(que_cumplen(), key=clave, reverse=descendente)
+            for valor in elegidos:
+                # Puede haberse quitado mientras se entregaban los anteriores
+                if valor.codigo in productos:
+                    yield self._materializar(valor.codigo)
+            return
+
+        entregados = 0
+        for valor in que_cumplen():
+            if limite is not None and entregados >= limite:
+                return
+            yield self._materializar(valor.codigo)
+            entregados += 1
+
+    def codigos_por_proveedor(self, id_proveedor: str) -> list[str]:
+        """
+        Retorna los códigos de los productos de un proveedor (índice de proveedores)
+        """
+        return list(self._codigos_por_proveedor.get(id_proveedor, ()))
+
+    def codigos_bajo_stock(self) -> list[str]:
+        """
+        Retorna los códigos con stock bajo, del más crítico al menos crítico
+        """
+        return [codigo for _, codigo in self._indice_bajo_stock]
+
+    def codigos_por_texto(self, termino: str, ignorar_acentos: bool = False) -> list[str]:
+        """
+        Retorna los códigos que coinciden con buscar_productos(), sin crear productos
+        """
+        return self._obtener_indice_texto().buscar(termino, ignorar_acentos)
+
+    def codigos_por_prefijo(self, prefijo: str) -> list[str]:
+        """
+        Retorna los códigos que empiezan con un prefijo, ordenados (índice de códigos)
+        """
+        return self._obtener_indice_codigos().prefijo(prefijo)
 
     # ==================== MÉTODOS DE ESTADÍSTICAS ====================
 
@@ -360,9 +1041,11 @@ class Inventario:
 
     def obtener_valor_total_inventario(self) -> float:
         """
-        Calcula el valor total de todo el inventario
+        Retorna el valor total de todo el inventario
         ===========================================
-        Suma el valor total de todos los productos (cantidad × precio).
+        Suma del valor total de todos los productos (cantidad × precio).
+        No recorre los productos: el total se mantiene al día con cada
+        cambio (ver verificar_totales).
 
         Retorna:
         --------
@@ -373,8 +1056,837 @@ class Inventario:
         >>> valor_total = inventario.obtener_valor_total_inventario()
         >>> print(f"Valor total del inventario: ${valor_total:,.2f}")
         """
-        # sum() con generador: suma el valor total de cada producto
-        return sum(p.valor_total_inventario() for p in self._productos.values())
+        return self._valor_total
+
+    def obtener_cantidad_bajo_stock(self) -> int:
+        """
+        Retorna cuántos productos están por debajo del stock mínimo
+        ==========================================================
+        Igual que len(obtener_productos_bajo_stock()), pero sin recorrer
+        los productos ni crear objetos: el conjunto de códigos con stock
+        bajo se mantiene al día con cada cambio.
+
+        Retorna:
+        --------
+        int : Cantidad de productos con stock bajo
+
+        Ejemplo:
+        --------
+        >>> print(f"Productos bajo stock: {inventario.obtener_cantidad_bajo_stock()}")
+        """
+        return len(self._claves_bajo_stock)
+
+    def verificar_totales(self, tolerancia: float = 1e-6) -> bool:
+        """
+        Comprueba los totales acumulados recalculándolos desde cero
+        ===========================================================
+        Recorre todos los productos (O(n)) y compara el valor total, el
+        índice de productos con stock bajo, el de productos por proveedor,
+        el de texto y el de códigos con los que se mantienen al día.
+        Pensado para pruebas y diagnósticos, no para el uso normal.
+
+        El valor total se va sumando y restando con cada cambio, así que
+        puede diferir en los últimos decimales de la suma recorriendo los
+        productos; por eso se compara con una tolerancia.
+
+        Parámetros:
+        -----------
+        tolerancia : float, opcional
+            Diferencia máxima aceptada en el valor total (además de una
+            diferencia relativa de 1e-9)
+
+        Retorna:
+        --------
+        bool : True si los totales acumulados coinciden con los recalculados
+
+        Ejemplo:
+        --------
+        >>> assert inventario.verificar_totales()
+        """
+        # (los resúmenes también tienen valor_total_inventario y esta_bajo_stock)
+        valor_total = math.fsum(p.valor_total_inventario() for p in self._productos.values())
+        bajo_stock = {c for c, p in self._productos.items() if p.esta_bajo_stock()}
+
+        # El índice ordenado debe tener exactamente las claves actuales
+        claves = sorted((self._criticidad(self._productos[c]), c) for c in bajo_stock)
+
+        por_proveedor: dict[str, set[str]] = {}
+        for codigo, producto in self._productos.items():
+            por_proveedor.setdefault(self._id_proveedor_de(producto), set()).add(codigo)
+
+        indice = self._indice_texto
+        textos_ok = indice is None or (
+            indice.codigos() == list(self._productos)
+            and all(indice.texto_de(c) == IndiceTexto.textos_de_busqueda(c, p.nombre)
+                    for c, p in self._productos.items()))
+
+        codigos_ok = (self._indice_codigos is None
+                      or self._indice_codigos.rango() == IndiceCodigos(self._productos).rango())
+
+        return (textos_ok and codigos_ok
+                and math.isclose(self._valor_total, valor_total,
+                             rel_tol=1e-9, abs_tol=tolerancia)
+                and set(self._claves_bajo_stock) == bajo_stock
+                and self._indice_bajo_stock == claves
+                and {i: set(c) for i, c in self._codigos_por_proveedor.items()} == por_proveedor)
+
+    def obtener_estadisticas(self) -> dict:
+        """
+        Calcula todas las estadísticas del inventario de una vez
+        ========================================================
+        Usa AnaliticaInventario, que calcula sobre columnas de números: si
+        NumPy está instalado los cálculos son vectorizados; si no, se hacen
+        en Python. Con almacen='columnar' se usan las columnas del almacén
+        sin copiarlas; si no, se arman en una sola pasada por los productos
+        (sin crear resúmenes). El resultado se guarda y se reutiliza hasta
+        el próximo cambio del inventario.
+
+        Retorna:
+        --------
+        dict : Diccionario con la estructura:
+            {
+                'total_productos': int,
+                'valor_total': float,
+                'productos_bajo_stock': int,
+                'valor_por_proveedor': {id_proveedor: valor},
+                'cantidad_por_unidad': {unidad_medida: cantidad},
+                'percentiles_valor': {percentil: valor de un producto}
+            }
+
+        Ejemplo:
+        --------
+        >>> estadisticas = inventario.obtener_estadisticas()
+        >>> print(f"Valor total: ${estadisticas['valor_total']:,.2f}")
+        """
+        if self._estadisticas is None:
+            if self._almacen == 'columnar':
+                analitica = AnaliticaInventario.desde_almacen(self._productos)
+            else:
+                analitica = AnaliticaInventario.desde_productos(self._productos.values())
+            self._estadisticas = {
+                'total_productos': analitica.cantidad_productos(),
+                'valor_total': analitica.valor_total(),
+                'productos_bajo_stock': analitica.cantidad_bajo_stock(),
+                'valor_por_proveedor': analitica.totales_por_proveedor(),
+                'cantidad_por_unidad': analitica.totales_por_unidad(),
+                'percentiles_valor': analitica.percentiles_valor()
+            }
+            # Soltar las columnas ya: con NumPy tienen prestada la memoria
+            # del almacén columnar, que mientras tanto no podría crecer
+            del analitica
+
+        # Copia: quien la reciba puede modificarla sin afectar al inventario
+        return {clave: dict(valor) if isinstance(valor, dict) else valor
+                for clave, valor in self._estadisticas.items()}
+
+    # ==================== MÉTODOS INTERNOS DE ALMACENAMIENTO ====================
+
+    def _insertar_producto(self, producto: Producto) -> None:
+        """
+        Guarda un producto en el diccionario y empieza a observarlo (privado)
+        ====================================================================
+        Todas las formas de agregar productos (agregar, actualizar, cargar
+        desde JSON, aplicar el diario) pasan por aquí. Si el código ya
+        existía, el producto queda en la misma posición del diccionario.
+
+        Parámetros:
+        -----------
+        producto : Producto
+            Producto a guardar
+        """
+        anterior = self._productos.get(producto.codigo)
+        self._productos[producto.codigo] = producto
+        self._actualizar_indices(producto.codigo, anterior, producto)
+        producto.establecer_observador(self._al_modificar_producto)
+
+    def _quitar_producto(self, codigo: str) -> Optional[Producto]:
+        """
+        Quita un producto del diccionario y deja de observarlo (privado)
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto a quitar
+
+        Retorna:
+        --------
+        Producto | None : El producto quitado, o None si no existía
+        """
+        producto = self._productos.pop(codigo, None)
+        if producto is not None:
+            self._actualizar_indices(codigo, producto, None)
+        if isinstance(producto, ResumenProducto):
+            # Un resumen no tiene observador; se entrega el producto completo
+            return self._crear_desde_resumen(producto)
+        if producto is not None:
+            producto.establecer_observador(None)
+        return producto
+
+    def _insertar_proveedor(self, proveedor: Proveedor) -> None:
+        """
+        Guarda un proveedor en el diccionario y empieza a observarlo (privado)
+
+        Parámetros:
+        -----------
+        proveedor : Proveedor
+            Proveedor a guardar
+        """
+        self._proveedores[proveedor.id_proveedor] = proveedor
+        proveedor.establecer_observador(self._al_modificar_proveedor)
+
+    # ==================== MÉTODOS INTERNOS DE CARGA PEREZOSA ====================
+
+    def _materializar(self, codigo: str) -> Optional[Producto]:
+        """
+        Retorna el Producto completo de un código, creándolo si hace falta (privado)
+        ===========================================================================
+        Si en el diccionario hay un ResumenProducto, se crea el Producto
+        (con el Proveedor compartido), se guarda en la MISMA posición y se
+        empieza a observar. Las siguientes veces ya se retorna ese objeto.
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto
+
+        Retorna:
+        --------
+        Producto | None : El producto, o None si el código no existe
+        """
+        valor = self._productos.get(codigo)
+        if isinstance(valor, ResumenProducto):
+            # Mismos datos que el resumen: los totales no cambian
+            valor = self._crear_desde_resumen(valor)
+            self._productos[codigo] = valor
+            valor.establecer_observador(self._al_modificar_producto)
+        return valor
+
+    @staticmethod
+    def _resumen_de(valor) -> ResumenProducto:
+        """
+        Retorna el resumen de un valor del diccionario (Producto o resumen) (privado)
+        """
+        if isinstance(valor, ResumenProducto):
+            return valor
+        return ResumenProducto.desde_producto(valor)
+
+    def _como_producto(self, valor) -> Producto:
+        """
+        Igual que _materializar, pero recibiendo el valor del diccionario (privado)
+        """
+        if isinstance(valor, ResumenProducto):
+            return self._materializar(valor.codigo)
+        return valor
+
+    def _materializar_todos(self) -> None:
+        """
+        Convierte en Producto todos los resúmenes que queden (privado)
+        """
+        for codigo, valor in self._productos.items():
+            if isinstance(valor, ResumenProducto):
+                # Reemplazar el valor de una clave existente no cambia el
+                # tamaño del diccionario, así que se puede hacer mientras se recorre
+                producto = self._crear_desde_resumen(valor)
+                self._productos[codigo] = producto
+                producto.establecer_observador(self._al_modificar_producto)
+
+    def _crear_desde_resumen(self, resumen: ResumenProducto) -> Producto:
+        """
+        Crea el Producto de un resumen con su Proveedor compartido (privado)
+
+        Parámetros:
+        -----------
+        resumen : ResumenProducto
+            Resumen del producto (su proveedor ya está registrado)
+
+        Retorna:
+        --------
+        Producto : Producto nuevo, todavía sin observador
+        """
+        return Producto(resumen.codigo, resumen.nombre, resumen.unidad_medida,
+                        resumen.fecha_ingreso, self._proveedores[resumen.id_proveedor],
+                        resumen.precio_costo, resumen.cantidad, resumen.stock_minimo)
+
+    @staticmethod
+    def _id_proveedor_de(valor) -> str:
+        """
+        Retorna el ID del proveedor de un Producto o de un resumen (privado)
+        """
+        if isinstance(valor, ResumenProducto):
+            return valor.id_proveedor
+        return valor.proveedor.id_proveedor
+
+    @staticmethod
+    def _dejar_de_observar(valor) -> None:
+        """
+        Desconecta el observador de un Producto (los resúmenes no tienen) (privado)
+        """
+        if isinstance(valor, Producto):
+            valor.establecer_observador(None)
+
+    # ==================== MÉTODOS INTERNOS DE TOTALES E ÍNDICES ====================
+
+    def _actualizar_indices(self, codigo: str, anterior, nuevo) -> None:
+        """
+        Pasa los totales y los índices de la versión anterior de un producto a la nueva (privado)
+        ========================================================================================
+        Se llama cada vez que se guarda, reemplaza o quita un producto del
+        diccionario (después de modificar el diccionario).
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto
+        anterior : Producto | ResumenProducto | None
+            Lo que había guardado (None si el producto es nuevo)
+        nuevo : Producto | ResumenProducto | None
+            Lo que queda guardado (None si el producto se quitó)
+        """
+        if anterior is not None:
+            self._restar_de_totales(anterior)
+        if nuevo is not None:
+            self._sumar_a_totales(nuevo)
+
+        self._mover_en_indice_proveedores(
+            codigo,
+            None if anterior is None else self._id_proveedor_de(anterior),
+            None if nuevo is None else self._id_proveedor_de(nuevo))
+
+        if self._indice_codigos is not None:
+            # Reemplazar un producto no cambia su código
+            if anterior is None:
+                self._indice_codigos.agregar(codigo)
+            elif nuevo is None:
+                self._indice_codigos.quitar(codigo)
+
+        if self._indice_texto is not None:
+            if nuevo is None:
+                self._indice_texto.quitar(codigo)
+            else:
+                self._indice_texto.agregar(codigo, nuevo.nombre)
+
+    def _sumar_a_totales(self, valor) -> None:
+        """
+        Suma un Producto o resumen a los totales acumulados (privado)
+        """
+        self._valor_total += valor.valor_total_inventario()
+        self._indexar_bajo_stock(valor)
+
+    def _restar_de_totales(self, valor) -> None:
+        """
+        Resta un Producto o resumen de los totales acumulados (privado)
+        ===============================================================
+        Debe llamarse con los datos que tenía cuando se sumó.
+        """
+        self._valor_total -= valor.valor_total_inventario()
+        self._desindexar_bajo_stock(valor.codigo)
+        if not self._productos:
+            # Sin productos el total es exactamente 0 (sin restos de redondeo)
+            self._valor_total = 0.0
+
+    def _ajustar_totales(self, producto: Producto, campo: str, dato) -> None:
+        """
+        Actualiza los totales después de un cambio de un producto guardado (privado)
+        ============================================================================
+        El producto ya tiene el dato nuevo; con el aviso del observador se
+        sabe el anterior, así que el ajuste es O(1) sin recorrer nada.
+
+        Parámetros:
+        -----------
+        producto : Producto
+            Producto que cambió
+        campo : str
+            Atributo que cambió, o 'stock' para un movimiento de stock
+        dato :
+            Para 'stock', la cantidad sumada; si no, el valor anterior
+        """
+        cantidad_anterior = producto.cantidad
+        precio_anterior = producto.precio_costo
+        if campo == 'stock':
+            cantidad_anterior = producto.cantidad - dato
+        elif campo == 'cantidad':
+            cantidad_anterior = dato
+        elif campo == 'precio_costo':
+            precio_anterior = dato
+        elif campo != 'stock_minimo':
+            # Nombre, unidad, proveedor...: no afectan los totales
+            return
+
+        self._valor_total += (producto.valor_total_inventario()
+                              - cantidad_anterior * precio_anterior)
+        self._desindexar_bajo_stock(producto.codigo)
+        self._indexar_bajo_stock(producto)
+
+    @staticmethod
+    def _criticidad(valor) -> float:
+        """
+        Qué tan urgente es reabastecer un producto con stock bajo (privado)
+        ===================================================================
+        Es la proporción cantidad / stock mínimo: 0 = sin existencias,
+        1 = justo en el mínimo. Menor es más crítico.
+
+        Parámetros:
+        -----------
+        valor : Producto | ResumenProducto
+            Producto con stock bajo
+        """
+        if valor.stock_minimo <= 0:
+            # Con mínimo 0 solo está "bajo stock" si no queda nada
+            return 0.0
+        return valor.cantidad / valor.stock_minimo
+
+    def _indexar_bajo_stock(self, valor) -> None:
+        """
+        Agrega un producto al índice de stock bajo si le corresponde (privado)
+
+        El índice es una lista ordenada: insort busca la posición con
+        búsqueda binaria (O(log n)) y luego inserta.
+        """
+        if valor.esta_bajo_stock():
+            clave = (self._criticidad(valor), valor.codigo)
+            self._claves_bajo_stock[valor.codigo] = clave
+            insort(self._indice_bajo_stock, clave)
+
+    def _desindexar_bajo_stock(self, codigo: str) -> None:
+        """
+        Quita un producto del índice de stock bajo si estaba (privado)
+        """
+        clave = self._claves_bajo_stock.pop(codigo, None)
+        if clave is not None:
+            del self._indice_bajo_stock[bisect_left(self._indice_bajo_stock, clave)]
+
+    def _obtener_indice_texto(self) -> IndiceTexto:
+        """
+        Retorna el índice de texto, armándolo la primera vez (privado)
+        ==============================================================
+        Armarlo cuesta un recorrido de todos los productos; por eso no se
+        hace al cargar sino en la primera búsqueda. Después se mantiene al
+        día en _actualizar_indices y en el observador de productos.
+        """
+        if self._indice_texto is None:
+            indice = IndiceTexto()
+            # (los resúmenes también tienen nombre)
+            for codigo, valor in self._productos.items():
+                indice.agregar(codigo, valor.nombre)
+            self._indice_texto = indice
+        return self._indice_texto
+
+    def _obtener_indice_codigos(self) -> IndiceCodigos:
+        """
+        Retorna el índice de códigos ordenados, armándolo la primera vez (privado)
+
+        Armarlo ordena todos los códigos una vez (O(n log n)); después se
+        mantiene al día en _actualizar_indices.
+        """
+        if self._indice_codigos is None:
+            self._indice_codigos = IndiceCodigos(self._productos)
+        return self._indice_codigos
+
+    def _mover_en_indice_proveedores(self, codigo: str, id_anterior: Optional[str],
+                                     id_nuevo: Optional[str]) -> None:
+        """
+        Pasa un código de un proveedor a otro en el índice de proveedores (privado)
+        ==========================================================================
+        Si los dos proveedores son el mismo no se hace nada, así el código
+        conserva su lugar entre los productos del proveedor.
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto
+        id_anterior : str | None
+            Proveedor que tenía (None si el producto es nuevo)
+        id_nuevo : str | None
+            Proveedor que tiene ahora (None si el producto se quitó)
+        """
+        if id_anterior == id_nuevo:
+            return
+        if id_anterior is not None:
+            codigos = self._codigos_por_proveedor.get(id_anterior)
+            if codigos is not None:
+                codigos.pop(codigo, None)
+                if not codigos:
+                    # No dejar entradas vacías de proveedores sin productos
+                    del self._codigos_por_proveedor[id_anterior]
+        if id_nuevo is not None:
+            self._codigos_por_proveedor.setdefault(id_nuevo, {})[codigo] = None
+
+    # ==================== MÉTODOS DE REGISTRO DE CAMBIOS ====================
+
+    def _al_modificar_producto(self, producto: Producto, campo: str, dato) -> None:
+        """
+        Observador que recibe los cambios de los productos (privado)
+        ===========================================================
+        Producto lo llama desde sus setters y desde agregar_stock/retirar_stock.
+
+        Parámetros:
+        -----------
+        producto : Producto
+            Producto que cambió
+        campo : str
+            Atributo que cambió, o 'stock' para un movimiento de stock
+        dato :
+            Para 'stock', la cantidad sumada; si no, el valor anterior
+        """
+        self._actualizar_almacen(producto)
+        self._ajustar_totales(producto, campo, dato)
+
+        if campo == 'stock':
+            # Un movimiento de stock se guarda como un registro pequeño
+            self._productos_modificados.add(producto.codigo)
+            self._registrar_cambio({'op': 'stock', 'codigo': producto.codigo, 'delta': dato})
+        else:
+            if campo == 'nombre' and self._indice_texto is not None:
+                # El índice de texto guarda el nombre para las búsquedas
+                self._indice_texto.agregar(producto.codigo, producto.nombre)
+            elif campo == 'proveedor':
+                # Un proveedor nuevo asignado al producto queda registrado
+                # (igual que en agregar_producto)
+                if producto.proveedor.id_proveedor not in self._proveedores:
+                    self.agregar_proveedor(producto.proveedor)
+                self._mover_en_indice_proveedores(
+                    producto.codigo, dato.id_proveedor, producto.proveedor.id_proveedor)
+            self._marcar_producto_modificado(producto)
+
+    def _al_modificar_proveedor(self, proveedor: Proveedor, campo: str, anterior) -> None:
+        """
+        Observador que recibe los cambios de los proveedores (privado)
+
+        Parámetros:
+        -----------
+        proveedor : Proveedor
+            Proveedor que cambió
+        campo : str
+            Atributo que cambió
+        anterior :
+            Valor anterior del atributo
+        """
+        self._marcar_proveedor_modificado(proveedor)
+
+    def _actualizar_almacen(self, producto: Producto) -> None:
+        """
+        En el almacén columnar, copia los datos del producto a sus columnas (privado)
+        ============================================================================
+        Con el diccionario no hace falta: el diccionario guarda el objeto.
+
+        Parámetros:
+        -----------
+        producto : Producto
+            Producto que cambió
+        """
+        if self._almacen == 'columnar':
+            self._productos.escribir_fila(producto)
+
+    def _marcar_producto_modificado(self, producto: Producto) -> None:
+        """
+        Agrega el producto al conjunto de cambios y registra su estado (privado)
+        =======================================================================
+        Si el último registro pendiente ya es el mismo producto completo, se
+        reemplaza en lugar de agregar otro (por ejemplo, al editar varios
+        campos seguidos desde el formulario).
+
+        Parámetros:
+        -----------
+        producto : Producto
+            Producto agregado o modificado
+        """
+        self._productos_modificados.add(producto.codigo)
+        self._productos_eliminados.discard(producto.codigo)
+        self._estadisticas = None
+
+        registro = {'op': 'producto', 'datos': producto.to_dict(incluir_proveedor=False)}
+        ultimo = self._ultimo_cambio_reemplazable()
+        if (ultimo is not None and ultimo['op'] == 'producto'
+                and ultimo['datos']['codigo'] == producto.codigo):
+            self._cambios_pendientes[-1] = registro
+        else:
+            self._registrar_cambio(registro)
+
+    def _marcar_proveedor_modificado(self, proveedor: Proveedor) -> None:
+        """
+        Agrega el proveedor al conjunto de cambios y registra su estado (privado)
+
+        Parámetros:
+        -----------
+        proveedor : Proveedor
+            Proveedor agregado o modificado
+        """
+        self._proveedores_modificados.add(proveedor.id_proveedor)
+
+        registro = {'op': 'proveedor', 'datos': proveedor.to_dict()}
+        ultimo = self._ultimo_cambio_reemplazable()
+        if (ultimo is not None and ultimo['op'] == 'proveedor'
+                and ultimo['datos']['id_proveedor'] == proveedor.id_proveedor):
+            self._cambios_pendientes[-1] = registro
+        else:
+            self._registrar_cambio(registro)
+
+    def _ultimo_cambio_reemplazable(self) -> Optional[dict]:
+        """
+        Retorna el último registro pendiente si todavía se puede reemplazar (privado)
+
+        Un registro sellado ya está en camino al disco: reemplazarlo haría
+        que el cambio nuevo se descartara junto con él al confirmar.
+
+        Retorna:
+        --------
+        dict | None : Último registro, o None si no hay o está sellado
+        """
+        if len(self._cambios_pendientes) > self._cambios_sellados:
+            return self._cambios_pendientes[-1]
+        return None
+
+    def _registrar_cambio(self, registro: dict) -> None:
+        """
+        Agrega un registro a la lista de cambios pendientes (método privado)
+
+        Parámetros:
+        -----------
+        registro : dict
+            Registro con la clave 'op' y los datos de la operación
+        """
+        self._cambios_pendientes.append(registro)
+        # Cualquier cambio deja desactualizadas las columnas de estadísticas
+        self._estadisticas = None
+
+    def hay_cambios_pendientes(self) -> bool:
+        """
+        Indica si hay cambios que todavía no se han guardado
+
+        Retorna:
+        --------
+        bool : True si hay al menos un cambio pendiente
+        """
+        return bool(self._cambios_pendientes)
+
+    def obtener_cambios_pendientes(self) -> list[dict]:
+        """
+        Retorna los cambios hechos desde el último guardado
+        ===================================================
+        La lista es una copia: modificarla no afecta al inventario.
+
+        Retorna:
+        --------
+        list[dict] : Registros en el orden en que ocurrieron
+
+        Ejemplo:
+        --------
+        >>> inventario.agregar_stock("FERT001", 5)
+        >>> inventario.obtener_cambios_pendientes()
+        [{'op': 'stock', 'codigo': 'FERT001', 'delta': 5}]
+        """
+        return list(self._cambios_pendientes)
+
+    def obtener_cambios(self) -> dict:
+        """
+        Retorna QUÉ entidades cambiaron desde el último guardado
+        ========================================================
+        A diferencia de obtener_cambios_pendientes() (que lista cada
+        operación), aquí cada producto o proveedor aparece una sola vez,
+        sin importar cuántas veces cambió. El costo depende de la cantidad
+        de cambios, no del tamaño del catálogo.
+
+        Retorna:
+        --------
+        dict : Diccionario con la estructura:
+            {
+                'productos': [productos agregados o modificados],
+                'productos_eliminados': [códigos eliminados],
+                'proveedores': [proveedores agregados o modificados]
+            }
+
+        Ejemplo:
+        --------
+        >>> cambios = inventario.obtener_cambios()
+        >>> print(f"Productos por guardar: {len(cambios['productos'])}")
+        """
+        return {
+            'productos': [self._materializar(c) for c in self._productos_modificados
+                          if c in self._productos],
+            'productos_eliminados': list(self._productos_eliminados),
+            'proveedores': [self._proveedores[i] for i in self._proveedores_modificados
+                            if i in self._proveedores]
+        }
+
+    def confirmar_cambios_guardados(self, cantidad: Optional[int] = None) -> None:
+        """
+        Descarta los cambios que ya fueron escritos en disco
+        ====================================================
+        El conjunto de entidades modificadas solo se vacía cuando no queda
+        ningún registro pendiente; si llegaron cambios nuevos mientras se
+        guardaba, se conservan para el próximo guardado.
+
+        Parámetros:
+        -----------
+        cantidad : int, opcional
+            Cuántos cambios (desde el inicio de la lista) se guardaron.
+            Si es None, se descartan todos.
+        """
+        if cantidad is None:
+            self._cambios_pendientes.clear()
+        else:
+            del self._cambios_pendientes[:cantidad]
+        self._cambios_sellados = 0
+
+        if self._cambios_pendientes:
+            return
+
+        # Limpiar los indicadores de cada entidad guardada
+        for codigo in self._productos_modificados:
+            producto = self._productos.get(codigo)
+            if isinstance(producto, Producto):
+                producto.limpiar_modificado()
+        for id_proveedor in self._proveedores_modificados:
+            proveedor = self._proveedores.get(id_proveedor)
+            if proveedor is not None:
+                proveedor.limpiar_modificado()
+
+        self._productos_modificados.clear()
+        self._productos_eliminados.clear()
+        self._proveedores_modificados.clear()
+
+    def sellar_cambios(self) -> int:
+        """
+        Marca los cambios pendientes actuales como "en proceso de guardado"
+        ===================================================================
+        Se usa cuando el guardado ocurre en otro hilo: los registros sellados
+        ya no se reemplazan, y los cambios que lleguen mientras tanto se
+        agregan después de ellos. Al terminar se llama a
+        confirmar_cambios_guardados(cantidad) con el valor retornado, o a
+        liberar_cambios_sellados() si el guardado falló.
+
+        Retorna:
+        --------
+        int : Cantidad de registros sellados
+
+        Ejemplo:
+        --------
+        >>> cantidad = inventario.sellar_cambios()
+        >>> # ... escribir los registros en otro hilo ...
+        >>> inventario.confirmar_cambios_guardados(cantidad)
+        """
+        self._cambios_sellados = len(self._cambios_pendientes)
+        return self._cambios_sellados
+
+    def liberar_cambios_sellados(self) -> None:
+        """
+        Quita el sello sin descartar nada (el guardado no se completó)
+
+        Los registros siguen pendientes y se vuelven a intentar en el
+        próximo guardado.
+        """
+        self._cambios_sellados = 0
+
+    def aplicar_cambio(self, registro: dict) -> None:
+        """
+        Aplica un registro del diario sobre el inventario
+        =================================================
+        Se usa al cargar, para volver a ejecutar (replay) los cambios
+        guardados en el diario. No genera nuevos cambios pendientes.
+
+        Parámetros:
+        -----------
+        registro : dict
+            Registro con la clave 'op' y los datos de la operación
+
+        Excepciones:
+        ------------
+        ValueError : Si la operación es desconocida o el producto no existe
+        """
+        operacion = registro.get('op')
+        self._estadisticas = None
+
+        if operacion == 'proveedor':
+            self.incorporar_proveedor_dict(registro['datos'])
+
+        elif operacion == 'producto':
+            self.incorporar_producto_dict(registro['datos'])
+
+        elif operacion == 'eliminar_producto':
+            self._quitar_producto(registro['codigo'])
+
+        elif operacion == 'stock':
+            producto = self._productos.get(registro['codigo'])
+            if producto is None:
+                raise ValueError(f"El producto con código {registro['codigo']} no existe")
+            if isinstance(producto, ResumenProducto):
+                # Carga perezosa: se actualiza el resumen sin crear el Producto
+                self._restar_de_totales(producto)
+                producto = producto._replace(cantidad=producto.cantidad + registro['delta'])
+                self._productos[producto.codigo] = producto
+                self._sumar_a_totales(producto)
+                return
+            # Se desconecta el observador para no generar un cambio nuevo,
+            # y se asigna directamente para aceptar deltas positivos y negativos
+            producto.establecer_observador(None)
+            producto.cantidad = producto.cantidad + registro['delta']
+            producto.limpiar_modificado()
+            producto.establecer_observador(self._al_modificar_producto)
+            self._actualizar_almacen(producto)
+            self._ajustar_totales(producto, 'stock', registro['delta'])
+
+        else:
+            raise ValueError(f"Operación desconocida en el diario: {operacion}")
+
+    # ==================== MÉTODOS DE CARGA REGISTRO POR REGISTRO ====================
+
+    def incorporar_proveedor_dict(self, datos: dict) -> None:
+        """
+        Agrega o actualiza un proveedor a partir de su diccionario
+        ==========================================================
+        Se usa al cargar desde un archivo (de una vez o registro por
+        registro) y al reproducir el diario. No genera cambios pendientes.
+
+        Si el proveedor ya existe se actualiza el MISMO objeto, porque lo
+        comparten todos sus productos.
+
+        Parámetros:
+        -----------
+        datos : dict
+            Diccionario con los datos del proveedor
+        """
+        existente = self._proveedores.get(datos['id_proveedor'])
+        if existente is None:
+            self._insertar_proveedor(Proveedor.from_dict(datos))
+            return
+
+        # Sin observador, para no generar un cambio nuevo
+        existente.establecer_observador(None)
+        existente.nombre = datos['nombre']
+        existente.telefono = datos.get('telefono', '')
+        existente.email = datos.get('email', '')
+        existente.limpiar_modificado()
+        existente.establecer_observador(self._al_modificar_proveedor)
+
+    def incorporar_producto_dict(self, datos: dict) -> None:
+        """
+        Agrega o reemplaza un producto a partir de su diccionario
+        =========================================================
+        Se usa al cargar desde un archivo (de una vez o registro por
+        registro) y al reproducir el diario. No genera cambios pendientes.
+        Acepta los dos esquemas (proveedor completo o 'id_proveedor').
+
+        En un inventario perezoso se guarda un ResumenProducto en lugar del
+        Producto completo (ver _materializar).
+
+        Parámetros:
+        -----------
+        datos : dict
+            Diccionario con los datos del producto
+        """
+        anterior = self._productos.get(datos['codigo'])
+        if anterior is not None:
+            self._dejar_de_observar(anterior)
+        self._estadisticas = None
+
+        # Si el código ya existe se reemplaza en su misma posición
+        if self._perezoso:
+            id_proveedor = self._registrar_proveedor_de_dict(datos)
+            resumen = ResumenProducto.desde_dict(datos, id_proveedor)
+            self._productos[resumen.codigo] = resumen
+            self._actualizar_indices(resumen.codigo, anterior, resumen)
+        else:
+            self._insertar_producto(self._producto_desde_dict(datos))
 
     # ==================== MÉTODOS DE CONVERSIÓN (SERIALIZACIÓN) ====================
 
@@ -384,6 +1896,10 @@ class Inventario:
         ================================================
         Útil para guardar todo el inventario en formato JSON.
 
+        Usa el esquema normalizado (versión 2): los proveedores se guardan una
+        sola vez y cada producto solo guarda el ID de su proveedor, en lugar
+        de repetir nombre, teléfono y email en cada producto.
+
         Retorna:
         --------
         dict : Diccionario con productos y proveedores convertidos
@@ -391,15 +1907,32 @@ class Inventario:
         Estructura del retorno:
         -----------------------
         {
-            'productos': [lista de diccionarios de productos],
-            'proveedores': [lista de diccionarios de proveedores]
+            'version': 2,
+            'proveedores': [lista de diccionarios de proveedores],
+            'productos': [lista de diccionarios de productos con 'id_proveedor']
         }
         """
+        # Proveedores de productos que no están registrados (no debería pasar,
+        # pero sin ellos el archivo tendría referencias rotas)
+        # (los resúmenes siempre apuntan a un proveedor registrado)
+        faltantes = {}
+        for producto in self._productos.values():
+            if isinstance(producto, ResumenProducto):
+                continue
+            proveedor = producto.proveedor
+            if proveedor.id_proveedor not in self._proveedores:
+                faltantes[proveedor.id_proveedor] = proveedor
+
         return {
-            # List comprehension: convertir cada producto a diccionario
-            'productos': [p.to_dict() for p in self._productos.values()],
+            'version': self.VERSION_ESQUEMA,
             # List comprehension: convertir cada proveedor a diccionario
-            'proveedores': [p.to_dict() for p in self._proveedores.values()]
+            # (primero los proveedores, porque los productos los referencian)
+            'proveedores': ([p.to_dict() for p in self._proveedores.values()] +
+                            [p.to_dict() for p in faltantes.values()]),
+            # List comprehension: convertir cada producto a diccionario
+            'productos': [p.to_dict() if isinstance(p, ResumenProducto)
+                          else p.to_dict(incluir_proveedor=False)
+                          for p in self._productos.values()]
         }
 
     @classmethod
@@ -414,9 +1947,12 @@ class Inventario:
         data : dict
             Diccionario con la estructura:
             {
-                'productos': [...],
-                'proveedores': [...]
+                'version': 2,           # opcional, si falta es versión 1
+                'proveedores': [...],
+                'productos': [...]
             }
+            Se aceptan los dos esquemas: productos con el proveedor completo
+            (versión 1) o solo con 'id_proveedor' (versión 2).
 
         Retorna:
         --------
@@ -438,13 +1974,59 @@ class Inventario:
             # Reconstruir cada proveedor desde su diccionario
             proveedor = Proveedor.from_dict(proveedor_data)
             # Agregar al diccionario interno usando el ID como clave
-            inventario._proveedores[proveedor.id_proveedor] = proveedor
+            inventario._insertar_proveedor(proveedor)
 
         # PASO 2: Cargar productos (que referencian a los proveedores ya cargados)
         for producto_data in data.get('productos', []):
-            # Reconstruir cada producto desde su diccionario
-            producto = Producto.from_dict(producto_data)
+            # Reconstruir cada producto reutilizando su proveedor ya cargado
+            producto = inventario._producto_desde_dict(producto_data)
             # Agregar al diccionario interno usando el código como clave
-            inventario._productos[producto.codigo] = producto
+            inventario._insertar_producto(producto)
 
         return inventario
+
+    def _producto_desde_dict(self, datos: dict) -> Producto:
+        """
+        Reconstruye un producto compartiendo el Proveedor del inventario (privado)
+        =========================================================================
+        En lugar de crear un Proveedor nuevo por cada producto, se usa el
+        objeto que ya está en _proveedores. Si el proveedor del producto no
+        estaba registrado, se registra (igual que en agregar_producto).
+
+        Con el esquema normalizado (versión 2) el producto solo trae
+        'id_proveedor'; si ese proveedor no aparece en el archivo, se crea
+        uno provisional con el ID como nombre para no perder el producto.
+
+        Parámetros:
+        -----------
+        datos : dict
+            Diccionario con los datos del producto
+
+        Retorna:
+        --------
+        Producto : Producto que apunta al proveedor compartido
+        """
+        self._registrar_proveedor_de_dict(datos)
+        return Producto.from_dict(datos, self._proveedores)
+
+    def _registrar_proveedor_de_dict(self, datos: dict) -> str:
+        """
+        Registra el proveedor de un producto en diccionario si falta (privado)
+
+        Parámetros:
+        -----------
+        datos : dict
+            Diccionario con los datos del producto (versión 1 o 2)
+
+        Retorna:
+        --------
+        str : ID del proveedor del producto
+        """
+        datos_proveedor = datos.get('proveedor')
+        if datos_proveedor is None:
+            # Versión 2: solo la referencia
+            datos_proveedor = {'id_proveedor': datos['id_proveedor'],
+                               'nombre': datos['id_proveedor']}
+        if datos_proveedor['id_proveedor'] not in self._proveedores:
+            self._insertar_proveedor(Proveedor.from_dict(datos_proveedor))
+        return datos_proveedor['id_proveedor']
@@ -0,0 +1,115 @@
+"""
+Módulo pagina_productos.py
+==========================
+Archivo que contiene la clase PaginaProductos para el sistema de gestión de
+inventario AgroCol SAS.
+
+listar_productos() copia TODOS los productos en una lista nueva en cada
+llamada, y la tabla de la ventana los inserta todos aunque solo se vean unas
+decenas de filas. Con páginas se pide solo la parte que se necesita:
+
+    pagina = inventario.listar_pagina(tamano=200)
+    while True:
+        mostrar(pagina.productos)
+        if pagina.siguiente is None:
+            break
+        pagina = inventario.listar_pagina(tamano=200, cursor=pagina.siguiente)
+
+¿Por qué un cursor y no un número de página?
+--------------------------------------------
+Con "página 3 = productos 400 a 599", si alguien agrega un producto que
+queda antes en el orden, todo se corre un lugar: un producto se repite y
+otro nunca se muestra. El cursor guarda el ÚLTIMO código entregado y la
+página siguiente empieza justo después de ese código en el orden, así que
+agregar o quitar productos no repite ni salta ninguno de los que ya
+existían.
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import base64    # Para que el cursor sea un texto opaco y seguro en una URL
+import binascii  # Error de base64 al leer un cursor mal formado
+from typing import NamedTuple, Optional
+
+# Importar las clases del dominio
+from .resumen_producto import ResumenProducto
+
+
+class PaginaProductos(NamedTuple):
+    """
+    Clase PaginaProductos
+    =====================
+    Una página de productos y el cursor para pedir la siguiente.
+
+    Los productos vienen ordenados por código (sin distinguir mayúsculas),
+    como resúmenes livianos: pedir una página no crea objetos Producto.
+
+    El cursor es un texto "opaco": no hay que armarlo ni interpretarlo,
+    solo pasarlo tal cual al pedir la página siguiente.
+
+    Atributos:
+    ----------
+    productos : list[ResumenProducto]
+        Productos de la página (como mucho el tamaño pedido)
+    siguiente : str | None
+        Cursor de la página siguiente, o None si esta es la última
+
+    Ejemplo de uso:
+    ---------------
+    >>> pagina = inventario.listar_pagina(tamano=2)
+    >>> [r.codigo for r in pagina.productos]
+    ['FERT001', 'FERT002']
+    >>> pagina = inventario.listar_pagina(tamano=2, cursor=pagina.siguiente)
+    """
+
+    productos: list[ResumenProducto]
+    siguiente: Optional[str]
+
+    # Prefijo con la versión del formato del cursor (por si cambia)
+    VERSION_CURSOR = "1:"
+
+    @classmethod
+    def crear_cursor(cls, ultimo_codigo: str) -> str:
+        """
+        Crea el cursor que apunta después de un código
+
+        Parámetros:
+        -----------
+        ultimo_codigo : str
+            Último código entregado
+
+        Retorna:
+        --------
+        str : Cursor opaco
+        """
+        texto = cls.VERSION_CURSOR + ultimo_codigo
+        return base64.urlsafe_b64encode(texto.encode('utf-8')).decode('ascii')
+
+    @classmethod
+    def leer_cursor(cls, cursor: str) -> str:
+        """
+        Retorna el código guardado en un cursor
+
+        Parámetros:
+        -----------
+        cursor : str
+            Cursor creado por crear_cursor()
+
+        Retorna:
+        --------
+        str : Último código entregado
+
+        Excepciones:
+        ------------
+        ValueError : Si el cursor no es válido
+        """
+        try:
+            texto = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        except (binascii.Error, UnicodeError) as e:
+            raise ValueError("Cursor de página inválido") from e
+
+        if not texto.startswith(cls.VERSION_CURSOR):
+            raise ValueError("Cursor de página inválido")
+        return texto[len(cls.VERSION_CURSOR):]
@@ -10,6 +10,9 @@ Autor: Estudiante de Ingeniería en Desarrollo de Software
 Fecha: 2025
 """
 
+# Importar typing para indicar valores opcionales
+from typing import Optional
+
 # Importar la clase Proveedor desde el módulo proveedor
 from .proveedor import Proveedor
 
@@ -42,8 +45,20 @@ class Producto:
         Cantidad disponible en stock (privado)
     _stock_minimo : float
         Cantidad mínima que debe haber en stock (alerta) (privado)
+    _modificado : bool
+        True si el producto cambió desde el último guardado (privado)
+    _observador : callable | None
+        Función que se llama cada vez que el producto cambia (privado).
+        El Inventario la usa para llevar su conjunto de cambios.
     """
 
+    # __slots__: los atributos se guardan en posiciones fijas del objeto, sin
+    # un diccionario __dict__ por instancia. Con cientos de miles de productos
+    # esto ahorra mucha memoria (ver scripts/benchmark_memoria.py).
+    # Consecuencia: no se pueden agregar atributos nuevos a un producto.
+    __slots__ = ('_codigo', '_nombre', '_unidad_medida', '_fecha_ingreso', '_proveedor',
+                 '_precio_costo', '_cantidad', '_stock_minimo', '_modificado', '_observador')
+
     def __init__(self, codigo: str, nombre: str, unidad_medida: str,
                  fecha_ingreso: str, proveedor: Proveedor, precio_costo: float,
                  cantidad: float = 0, stock_minimo: float = 10):
@@ -87,6 +102,10 @@ class Producto:
         self._cantidad = cantidad
         self._stock_minimo = stock_minimo
 
+        # Seguimiento de cambios (dirty tracking)
+        self._modificado = False
+        self._observador = None
+
     # ==================== PROPIEDADES GETTER ====================
     # Permiten acceder a los atributos privados de forma controlada
 
@@ -179,6 +198,17 @@ class Producto:
         """
         return self._stock_minimo
 
+    @property
+    def modificado(self) -> bool:
+        """
+        Getter del indicador de cambios
+
+        Retorna:
+        --------
+        bool : True si el producto cambió desde el último guardado
+        """
+        return self._modificado
+
     # ==================== PROPIEDADES SETTER ====================
     # Permiten modificar los atributos privados con validaciones
 
@@ -198,7 +228,9 @@ class Producto:
         """
         if not valor or valor.strip() == "":
             raise ValueError("El nombre del producto no puede estar vacío")
+        anterior = self._nombre
         self._nombre = valor
+        self._notificar_cambio('nombre', anterior)
 
     @unidad_medida.setter
     def unidad_medida(self, valor: str):
@@ -210,7 +242,9 @@ class Producto:
         valor : str
             Nueva unidad de medida
         """
+        anterior = self._unidad_medida
         self._unidad_medida = valor
+        self._notificar_cambio('unidad_medida', anterior)
 
     @precio_costo.setter
     def precio_costo(self, valor: float):
@@ -228,7 +262,9 @@ class Producto:
         """
         if valor < 0:
             raise ValueError("El precio de costo no puede ser negativo")
+        anterior = self._precio_costo
         self._precio_costo = valor
+        self._notificar_cambio('precio_costo', anterior)
 
     @cantidad.setter
     def cantidad(self, valor: float):
@@ -246,7 +282,9 @@ class Producto:
         """
         if valor < 0:
             raise ValueError("La cantidad no puede ser negativa")
+        anterior = self._cantidad
         self._cantidad = valor
+        self._notificar_cambio('cantidad', anterior)
 
     @stock_minimo.setter
     def stock_minimo(self, valor: float):
@@ -264,7 +302,9 @@ class Producto:
         """
         if valor < 0:
             raise ValueError("El stock mínimo no puede ser negativo")
+        anterior = self._stock_minimo
         self._stock_minimo = valor
+        self._notificar_cambio('stock_minimo', anterior)
 
     @proveedor.setter
     def proveedor(self, valor: Proveedor):
@@ -282,7 +322,9 @@ class Producto:
         """
         if not isinstance(valor, Proveedor):
             raise ValueError("El proveedor debe ser una instancia de la clase Proveedor")
+        anterior = self._proveedor
         self._proveedor = valor
+        self._notificar_cambio('proveedor', anterior)
 
     # ==================== MÉTODOS DE OPERACIÓN ====================
 
@@ -311,6 +353,7 @@ class Producto:
             raise ValueError("La cantidad a agregar debe ser mayor a cero")
         # Incrementar el stock
         self._cantidad += cantidad
+        self._notificar_cambio('stock', cantidad)
 
     def retirar_stock(self, cantidad: float) -> None:
         """
@@ -342,6 +385,7 @@ class Producto:
             raise ValueError(f"No hay suficiente stock. Disponible: {self._cantidad}")
         # Disminuir el stock
         self._cantidad -= cantidad
+        self._notificar_cambio('stock', -cantidad)
 
     def esta_bajo_stock(self) -> bool:
         """
@@ -387,14 +431,59 @@ class Producto:
         """
         return self._cantidad * self._precio_costo
 
+    # ==================== SEGUIMIENTO DE CAMBIOS ====================
+
+    def _notificar_cambio(self, campo: str, dato) -> None:
+        """
+        Marca el producto como modificado y avisa al observador (privado)
+        ================================================================
+
+        Parámetros:
+        -----------
+        campo : str
+            Nombre del atributo que cambió, o 'stock' para agregar/retirar stock
+        dato :
+            Valor anterior del atributo; para 'stock' es la cantidad sumada
+            (positiva al agregar, negativa al retirar)
+        """
+        self._modificado = True
+        if self._observador is not None:
+            self._observador(self, campo, dato)
+
+    def establecer_observador(self, observador) -> None:
+        """
+        Registra la función que se llamará cuando el producto cambie
+        ============================================================
+        El observador recibe (producto, campo, dato). Solo hay uno a la vez;
+        con None se desconecta.
+
+        Parámetros:
+        -----------
+        observador : callable | None
+            Función observadora
+        """
+        self._observador = observador
+
+    def limpiar_modificado(self) -> None:
+        """
+        Marca el producto como guardado (sin cambios pendientes)
+        """
+        self._modificado = False
+
     # ==================== MÉTODOS DE CONVERSIÓN ====================
 
-    def to_dict(self) -> dict:
+    def to_dict(self, incluir_proveedor: bool = True) -> dict:
         """
         Convierte el producto a un diccionario
         =====================================
         Útil para guardar los datos en formato JSON.
-        Incluye el proveedor convertido también a diccionario.
+
+        Parámetros:
+        -----------
+        incluir_proveedor : bool, opcional
+            Si es True (por defecto) incluye el proveedor completo convertido
+            a diccionario. Si es False solo incluye su ID ('id_proveedor'),
+            que es lo que usa el esquema normalizado (versión 2) del archivo.
 
         Retorna:
         --------
@@ -407,41 +496,64 @@ class Producto:
             'nombre': 'Fertilizante Urea',
             'unidad_medida': 'kg',
             'fecha_ingreso': '15/01/2025',
-            'proveedor': {'id_proveedor': 'PROV001', ...},
+            'proveedor': {'id_proveedor': 'PROV001', ...},   # o 'id_proveedor': 'PROV001'
             'precio_costo': 2500.0,
             'cantidad': 100.0,
             'stock_minimo': 20.0
         }
         """
-        return {
+        datos = {
             'codigo': self._codigo,
             'nombre': self._nombre,
             'unidad_medida': self._unidad_medida,
             'fecha_ingreso': self._fecha_ingreso,
-            # Convertir el proveedor a diccionario también (composición)
-            'proveedor': self._proveedor.to_dict(),
-            'precio_costo': self._precio_costo,
-            'cantidad': self._cantidad,
-            'stock_minimo': self._stock_minimo
         }
+        if incluir_proveedor:
+            # Convertir el proveedor a diccionario también (composición)
+            datos['proveedor'] = self._proveedor.to_dict()
+        else:
+            # Esquema normalizado: solo la referencia al proveedor
+            datos['id_proveedor'] = self._proveedor.id_proveedor
+        datos['precio_costo'] = self._precio_costo
+        datos['cantidad'] = self._cantidad
+        datos['stock_minimo'] = self._stock_minimo
+        return datos
 
     @classmethod
-    def from_dict(cls, data: dict) -> 'Producto':
+    def from_dict(cls, data: dict,
+                  proveedores: Optional[dict[str, Proveedor]] = None) -> 'Producto':
         """
         Crea un objeto Producto desde un diccionario
         ===========================================
         Método de clase que permite reconstruir un producto desde datos JSON.
-        Reconstruye también el objeto Proveedor asociado.
+
+        Si se pasa el diccionario de proveedores ya cargados, el producto usa
+        ese MISMO objeto Proveedor en lugar de crear una copia (patrón
+        flyweight). Así 100.000 productos de 20 proveedores comparten 20
+        objetos Proveedor, y editar un proveedor se refleja en todos sus
+        productos. Si el proveedor no está en el diccionario, se crea uno
+        nuevo a partir de los datos del producto y se agrega al diccionario.
+
+        Acepta los dos esquemas del archivo: el proveedor completo en la
+        clave 'proveedor' (versión 1) o solo su ID en 'id_proveedor'
+        (versión 2, que requiere el diccionario de proveedores).
 
         Parámetros:
         -----------
         data : dict
             Diccionario con los datos del producto
+        proveedores : dict[str, Proveedor], opcional
+            Proveedores ya cargados, usando el ID como clave
 
         Retorna:
         --------
         Producto : Nueva instancia de Producto con los datos del diccionario
 
+        Excepciones:
+        ------------
+        ValueError : Si el producto solo trae 'id_proveedor' y ese proveedor
+                     no está en el diccionario de proveedores
+
         Ejemplo de uso:
         ---------------
         >>> datos = {
@@ -451,9 +563,24 @@ class Producto:
         ...     # ... más campos
         ... }
         >>> producto = Producto.from_dict(datos)
-        """
-        # Reconstruir el objeto Proveedor primero
-        proveedor = Proveedor.from_dict(data['proveedor'])
+        >>> producto2 = Producto.from_dict(datos, {'PROV001': proveedor_existente})
+        """
+        datos_proveedor = data.get('proveedor')
+        if datos_proveedor is not None:
+            id_proveedor = datos_proveedor['id_proveedor']
+        else:
+            id_proveedor = data['id_proveedor']
+
+        # Reutilizar el proveedor ya cargado, o reconstruirlo si no existe
+        proveedor = None
+        if proveedores is not None:
+            proveedor = proveedores.get(id_proveedor)
+        if proveedor is None:
+            if datos_proveedor is None:
+                raise ValueError(f"El proveedor con ID {id_proveedor} no existe")
+            proveedor = Proveedor.from_dict(datos_proveedor)
+            if proveedores is not None:
+                proveedores[proveedor.id_proveedor] = proveedor
 
         # Crear y retornar el objeto Producto
         return cls(
@@ -31,8 +31,16 @@ class Proveedor:
         Número de teléfono de contacto (privado, opcional)
     _email : str
         Correo electrónico de contacto (privado, opcional)
+    _modificado : bool
+        True si el proveedor cambió desde el último guardado (privado)
+    _observador : callable | None
+        Función que se llama cada vez que el proveedor cambia (privado)
     """
 
+    # __slots__: atributos en posiciones fijas, sin __dict__ por instancia
+    # (igual que en Producto, para ahorrar memoria)
+    __slots__ = ('_id_proveedor', '_nombre', '_telefono', '_email', '_modificado', '_observador')
+
     def __init__(self, id_proveedor: str, nombre: str, telefono: str = "", email: str = ""):
         """
         Constructor de la clase Proveedor
@@ -60,6 +68,10 @@ class Proveedor:
         self._telefono = telefono
         self._email = email
 
+        # Seguimiento de cambios (dirty tracking)
+        self._modificado = False
+        self._observador = None
+
     # ==================== PROPIEDADES GETTER ====================
     # Los getters permiten leer los atributos privados desde fuera de la clase
 
@@ -107,6 +119,17 @@ class Proveedor:
         """
         return self._email
 
+    @property
+    def modificado(self) -> bool:
+        """
+        Getter del indicador de cambios
+
+        Retorna:
+        --------
+        bool : True si el proveedor cambió desde el último guardado
+        """
+        return self._modificado
+
     # ==================== PROPIEDADES SETTER ====================
     # Los setters permiten modificar los atributos privados con validaciones
 
@@ -128,7 +151,9 @@ class Proveedor:
         # Validación: el nombre no puede estar vacío
         if not valor or valor.strip() == "":
             raise ValueError("El nombre del proveedor no puede estar vacío")
+        anterior = self._nombre
         self._nombre = valor
+        self._notificar_cambio('nombre', anterior)
 
     @telefono.setter
     def telefono(self, valor: str):
@@ -140,7 +165,9 @@ class Proveedor:
         valor : str
             Nuevo número de teléfono
         """
+        anterior = self._telefono
         self._telefono = valor
+        self._notificar_cambio('telefono', anterior)
 
     @email.setter
     def email(self, valor: str):
@@ -152,7 +179,45 @@ class Proveedor:
         valor : str
             Nuevo correo electrónico
         """
+        anterior = self._email
         self._email = valor
+        self._notificar_cambio('email', anterior)
+
+    # ==================== SEGUIMIENTO DE CAMBIOS ====================
+
+    def _notificar_cambio(self, campo: str, anterior) -> None:
+        """
+        Marca el proveedor como modificado y avisa al observador (privado)
+
+        Parámetros:
+        -----------
+        campo : str
+            Nombre del atributo que cambió
+        anterior :
+            Valor que tenía el atributo antes del cambio
+        """
+        self._modificado = True
+        if self._observador is not None:
+            self._observador(self, campo, anterior)
+
+    def establecer_observador(self, observador) -> None:
+        """
+        Registra la función que se llamará cuando el proveedor cambie
+        =============================================================
+        El observador recibe (proveedor, campo, valor_anterior).
+
+        Parámetros:
+        -----------
+        observador : callable | None
+            Función observadora (None para desconectarla)
+        """
+        self._observador = observador
+
+    def limpiar_modificado(self) -> None:
+        """
+        Marca el proveedor como guardado (sin cambios pendientes)
+        """
+        self._modificado = False
 
     # ==================== MÉTODOS DE CONVERSIÓN ====================
 
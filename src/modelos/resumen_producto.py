@@ -0,0 +1,149 @@
+"""
+Módulo resumen_producto.py
+==========================
+Archivo que contiene la clase ResumenProducto para el sistema de gestión de
+inventario AgroCol SAS.
+
+Un ResumenProducto es una versión liviana y de solo lectura de un Producto:
+una tupla con sus datos, sin observadores ni objeto Proveedor (solo su ID).
+
+Se usa para dos cosas:
+- Carga perezosa: el inventario guarda resúmenes al cargar un archivo grande
+  y solo crea el Producto completo cuando alguien lo necesita.
+- Filas de la tabla: la ventana principal muestra resúmenes, así abrir un
+  catálogo grande no obliga a crear todos los objetos Producto.
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar NamedTuple: una tupla con nombres para cada posición
+from typing import NamedTuple
+
+
+class ResumenProducto(NamedTuple):
+    """
+    Clase ResumenProducto
+    =====================
+    Datos de un producto en una tupla inmutable (NamedTuple).
+
+    Tiene los mismos nombres de atributos que Producto para los datos simples
+    (codigo, nombre, cantidad, etc.) y los mismos métodos de consulta
+    (esta_bajo_stock, valor_total_inventario), así que el código que solo
+    lee esos datos funciona igual con un Producto o con un ResumenProducto.
+
+    La diferencia: en lugar del objeto Proveedor guarda su 'id_proveedor'.
+
+    Atributos:
+    ----------
+    codigo : str
+        Código único del producto
+    nombre : str
+        Nombre del producto
+    unidad_medida : str
+        Unidad de medida (kg, litros, etc.)
+    fecha_ingreso : str
+        Fecha de ingreso al inventario
+    id_proveedor : str
+        ID del proveedor del producto
+    precio_costo : float
+        Precio de costo unitario
+    cantidad : float
+        Cantidad en stock
+    stock_minimo : float
+        Cantidad mínima antes de alertar
+    """
+
+    codigo: str
+    nombre: str
+    unidad_medida: str
+    fecha_ingreso: str
+    id_proveedor: str
+    precio_costo: float
+    cantidad: float
+    stock_minimo: float
+
+    # ==================== MÉTODOS DE CONSULTA ====================
+
+    def esta_bajo_stock(self) -> bool:
+        """
+        Verifica si el producto está por debajo del stock mínimo
+        (igual que Producto.esta_bajo_stock)
+
+        Retorna:
+        --------
+        bool : True si la cantidad es menor o igual al stock mínimo
+        """
+        return self.cantidad <= self.stock_minimo
+
+    def valor_total_inventario(self) -> float:
+        """
+        Calcula el valor total en stock (igual que Producto.valor_total_inventario)
+
+        Retorna:
+        --------
+        float : Valor total (cantidad × precio_costo)
+        """
+        return self.cantidad * self.precio_costo
+
+    # ==================== MÉTODOS DE CONVERSIÓN ====================
+
+    @classmethod
+    def desde_producto(cls, producto) -> 'ResumenProducto':
+        """
+        Crea el resumen de un Producto completo
+
+        Parámetros:
+        -----------
+        producto : Producto
+            Producto a resumir
+
+        Retorna:
+        --------
+        ResumenProducto : Resumen con los datos actuales del producto
+        """
+        return cls(producto.codigo, producto.nombre, producto.unidad_medida,
+                   producto.fecha_ingreso, producto.proveedor.id_proveedor,
+                   producto.precio_costo, producto.cantidad, producto.stock_minimo)
+
+    @classmethod
+    def desde_dict(cls, datos: dict, id_proveedor: str) -> 'ResumenProducto':
+        """
+        Crea un resumen desde el diccionario de un producto (como en el JSON)
+
+        Usa los mismos valores por defecto que Producto.from_dict.
+
+        Parámetros:
+        -----------
+        datos : dict
+            Diccionario con los datos del producto
+        id_proveedor : str
+            ID del proveedor (el diccionario puede traer el proveedor
+            completo o solo su ID, según la versión del archivo)
+
+        Retorna:
+        --------
+        ResumenProducto : Resumen con los datos del diccionario
+        """
+        return cls(datos['codigo'], datos['nombre'], datos['unidad_medida'],
+                   datos['fecha_ingreso'], id_proveedor, datos['precio_costo'],
+                   datos.get('cantidad', 0), datos.get('stock_minimo', 10))
+
+    def to_dict(self) -> dict:
+        """
+        Convierte el resumen al diccionario del esquema normalizado (versión 2)
+
+        Retorna:
+        --------
+        dict : Las mismas claves que Producto.to_dict(incluir_proveedor=False)
+        """
+        return {
+            'codigo': self.codigo,
+            'nombre': self.nombre,
+            'unidad_medida': self.unidad_medida,
+            'fecha_ingreso': self.fecha_ingreso,
+            'id_proveedor': self.id_proveedor,
+            'precio_costo': self.precio_costo,
+            'cantidad': self.cantidad,
+            'stock_minimo': self.stock_minimo
+        }
@@ -9,6 +9,12 @@ La persistencia es el proceso de almacenar datos en un medio permanente
 Clases:
 -------
 - GestorPersistencia: Maneja guardado/carga de inventario en JSON
+- DiarioCambios: Diario de cambios para guardados incrementales
+- BackendSQLite: Almacenamiento del inventario en una base de datos SQLite
+- TrabajadorGuardado: Escribe los guardados en un hilo en segundo plano
+- PlanificadorGuardado: Decide cuándo guardar (inmediato, debounce o lotes)
+- LectorFlujoJSON: Lee el archivo de inventario registro por registro
+- FotoBinaria: Foto por columnas para consultas con mmap (solo lectura)
 
 ¿Por qué separar la persistencia?
 ---------------------------------
@@ -29,6 +35,13 @@ Autor: Estudiante de Ingeniería en Desarrollo de Software
 
 # Importar la clase de persistencia
 from .persistencia import GestorPersistencia
+from .diario import DiarioCambios
+from .backend_sqlite import BackendSQLite
+from .trabajador import TrabajadorGuardado
+from .planificador import PlanificadorGuardado
+from .lector_flujo import LectorFlujoJSON
+from .foto_binaria import FotoBinaria
 
 # Definir qué se exporta
-__all__ = ['GestorPersistencia']
+__all__ = ['GestorPersistencia', 'DiarioCambios', 'BackendSQLite', 'TrabajadorGuardado',
+           'PlanificadorGuardado', 'LectorFlujoJSON', 'FotoBinaria']
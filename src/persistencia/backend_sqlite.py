@@ -0,0 +1,382 @@
+"""
+Módulo backend_sqlite.py
+========================
+Archivo que contiene la clase BackendSQLite para el sistema AgroCol SAS.
+
+Este módulo permite guardar el inventario en una base de datos SQLite en lugar
+de un archivo JSON. SQLite viene incluido con Python (módulo sqlite3), así que
+el proyecto sigue sin necesitar instalaciones adicionales.
+
+¿Qué ventajas tiene SQLite frente a JSON?
+-----------------------------------------
+- Solo se escriben las filas que cambiaron (UPDATE/INSERT), no todo el archivo
+- Las consultas pueden usar índices (buscar por proveedor, stock bajo, etc.)
+- Cada guardado es una transacción: o se guarda todo o no se guarda nada
+
+Tablas:
+-------
+- proveedores(id_proveedor, nombre, telefono, email)
+- productos(codigo, nombre, unidad_medida, fecha_ingreso, id_proveedor,
+            precio_costo, cantidad, stock_minimo)
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import sqlite3    # Base de datos SQLite (incluida en Python)
+import threading  # Para proteger la conexión si se usa desde varios hilos
+
+# Importar las clases del dominio
+from ..modelos import Inventario
+
+
+# Sentencias para crear las tablas e índices (si no existen)
+ESQUEMA_SQL = """
+CREATE TABLE IF NOT EXISTS proveedores (
+    id_proveedor TEXT PRIMARY KEY,
+    nombre       TEXT NOT NULL,
+    telefono     TEXT NOT NULL DEFAULT '',
+    email        TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS productos (
+    codigo        TEXT PRIMARY KEY,
+    nombre        TEXT NOT NULL,
+    unidad_medida TEXT NOT NULL,
+    fecha_ingreso TEXT NOT NULL,
+    id_proveedor  TEXT NOT NULL REFERENCES proveedores(id_proveedor),
+    precio_costo  REAL NOT NULL,
+    cantidad      REAL NOT NULL,
+    stock_minimo  REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_productos_proveedor
+    ON productos(id_proveedor);
+
+CREATE INDEX IF NOT EXISTS idx_productos_margen_stock
+    ON productos(cantidad - stock_minimo);
+"""
+
+# UPSERT: inserta la fila o, si el código ya existe, la actualiza
+SQL_UPSERT_PRODUCTO = """
+INSERT INTO productos (codigo, nombre, unidad_medida, fecha_ingreso, id_proveedor,
+                       precio_costo, cantidad, stock_minimo)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(codigo) DO UPDATE SET
+    nombre = excluded.nombre,
+    unidad_medida = excluded.unidad_medida,
+    fecha_ingreso = excluded.fecha_ingreso,
+    id_proveedor = excluded.id_proveedor,
+    precio_costo = excluded.precio_costo,
+    cantidad = excluded.cantidad,
+    stock_minimo = excluded.stock_minimo
+"""
+
+SQL_UPSERT_PROVEEDOR = """
+INSERT INTO proveedores (id_proveedor, nombre, telefono, email)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(id_proveedor) DO UPDATE SET
+    nombre = excluded.nombre,
+    telefono = excluded.telefono,
+    email = excluded.email
+"""
+
+
+class BackendSQLite:
+    """
+    Clase BackendSQLite
+    ===================
+    Guarda y carga el inventario usando tablas normalizadas de SQLite.
+
+    Los productos guardan solo el ID de su proveedor (no una copia completa),
+    y hay índices por proveedor y por "margen de stock" (cantidad - stock_minimo)
+    para que las consultas más comunes no tengan que recorrer toda la tabla.
+
+    Además de guardar y cargar, esta clase puede responder consultas del
+    Inventario directamente con SQL (ver codigos_bajo_stock y
+    codigos_por_proveedor).
+
+    Atributos:
+    ----------
+    _ruta : str
+        Ruta del archivo de base de datos (privado)
+    _conexion : sqlite3.Connection | None
+        Conexión abierta a la base de datos (privado, se abre al primer uso)
+    _candado : threading.Lock
+        Evita que dos hilos usen la conexión al mismo tiempo (privado)
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Constructor de la clase BackendSQLite
+        =====================================
+
+        Parámetros:
+        -----------
+        ruta : str
+            Ruta completa del archivo .db / .sqlite
+
+        Ejemplo de uso:
+        ---------------
+        >>> backend = BackendSQLite("inventario_agrocol.db")
+        """
+        self._ruta = ruta
+        self._conexion = None
+        self._candado = threading.Lock()
+
+    # ==================== CONEXIÓN ====================
+
+    def _obtener_conexion(self) -> sqlite3.Connection:
+        """
+        Abre la conexión (una sola vez) y crea las tablas si no existen (privado)
+
+        Retorna:
+        --------
+        sqlite3.Connection : Conexión lista para usar
+        """
+        if self._conexion is None:
+            # check_same_thread=False permite usarla desde otro hilo;
+            # el candado garantiza que nunca se use desde dos a la vez
+            self._conexion = sqlite3.connect(self._ruta, check_same_thread=False)
+            self._conexion.executescript(ESQUEMA_SQL)
+        return self._conexion
+
+    def cerrar(self) -> None:
+        """
+        Cierra la conexión con la base de datos
+        """
+        with self._candado:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
+
+    # ==================== GUARDAR ====================
+
+    def guardar(self, inventario: Inventario, incremental: bool = False) -> None:
+        """
+        Guarda el inventario en la base de datos
+        ========================================
+        Todo ocurre dentro de UNA transacción: si algo falla, la base de datos
+        queda exactamente como estaba antes.
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario a guardar
+        incremental : bool, opcional
+            Si es True, solo se escriben las filas afectadas por los cambios
+            pendientes del inventario (UPSERT / DELETE). Si es False, se
+            reemplaza el contenido completo de las tablas.
+        """
+        self.escribir_filas(self.preparar_filas(inventario, incremental))
+
+    def preparar_filas(self, inventario: Inventario, incremental: bool = False) -> dict:
+        """
+        Convierte lo que hay que guardar en filas (tuplas) de las tablas
+        ================================================================
+        Las filas son una copia: se pueden escribir desde otro hilo aunque
+        el inventario siga cambiando.
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario a guardar
+        incremental : bool, opcional
+            Si es True, solo las filas afectadas por los cambios pendientes
+            (usa el conjunto de cambios, sin recorrer el catálogo completo)
+
+        Retorna:
+        --------
+        dict : {'completo': bool, 'proveedores': [...], 'productos': [...],
+                'eliminados': [...]}
+        """
+        if incremental:
+            cambios = inventario.obtener_cambios()
+            return {
+                'completo': False,
+                'proveedores': [self._fila_proveedor(p) for p in cambios['proveedores']],
+                'productos': [self._fila_producto(p) for p in cambios['productos']],
+                'eliminados': [(codigo,) for codigo in cambios['productos_eliminados']]
+            }
+
+        # Los resúmenes no crean objetos Producto (en un inventario perezoso
+        # listar_productos() los crearía todos) y ya tienen las columnas de
+        # la tabla productos en el mismo orden, así que sirven como filas
+        resumenes = inventario.listar_resumenes()
+        proveedores = [self._fila_proveedor(p) for p in inventario.listar_proveedores()]
+        # Proveedores que solo aparecen dentro de un producto: solo para
+        # esos productos se necesita el objeto Producto
+        proveedores.extend(
+            self._fila_proveedor(inventario.obtener_producto(r.codigo).proveedor)
+            for r in resumenes if inventario.obtener_proveedor(r.id_proveedor) is None)
+        return {
+            'completo': True,
+            'proveedores': proveedores,
+            'productos': [tuple(r) for r in resumenes],
+            'eliminados': []
+        }
+
+    def escribir_filas(self, filas: dict) -> None:
+        """
+        Escribe en una sola transacción las filas de preparar_filas()
+        =============================================================
+        Si filas['completo'] es True, primero se vacían las tablas.
+
+        Parámetros:
+        -----------
+        filas : dict
+            Filas retornadas por preparar_filas()
+        """
+        with self._candado:
+            conexion = self._obtener_conexion()
+
+            # "with conexion" abre una transacción y hace COMMIT al final
+            # (o ROLLBACK si ocurre una excepción)
+            with conexion:
+                if filas['completo']:
+                    conexion.execute("DELETE FROM productos")
+                    conexion.execute("DELETE FROM proveedores")
+
+                conexion.executemany(SQL_UPSERT_PROVEEDOR, filas['proveedores'])
+                conexion.executemany(SQL_UPSERT_PRODUCTO, filas['productos'])
+                conexion.executemany("DELETE FROM productos WHERE codigo = ?",
+                                     filas['eliminados'])
+
+    # ==================== CARGAR ====================
+
+    def cargar(self, perezoso: bool = False, almacen: str = 'diccionario') -> Inventario:
+        """
+        Carga el inventario completo desde la base de datos
+        ===================================================
+        Las filas se incorporan una por una al inventario (igual que la
+        lectura registro por registro del JSON), sin armar antes una lista
+        con todos los productos.
+
+        Parámetros:
+        -----------
+        perezoso : bool, opcional
+            Si es True, el inventario guarda resúmenes livianos y crea cada
+            Producto solo cuando se usa (ver Inventario(perezoso=True))
+        almacen : str, opcional
+            'diccionario' (por defecto) o 'columnar' (ver Inventario)
+
+        Retorna:
+        --------
+        Inventario : Inventario con todos los productos y proveedores
+        """
+        inventario = Inventario(perezoso=perezoso, almacen=almacen)
+
+        with self._candado:
+            conexion = self._obtener_conexion()
+
+            # Proveedores primero (los productos los necesitan)
+            for fila in conexion.execute(
+                    "SELECT id_proveedor, nombre, telefono, email FROM proveedores"):
+                inventario.incorporar_proveedor_dict({
+                    'id_proveedor': fila[0],
+                    'nombre': fila[1],
+                    'telefono': fila[2],
+                    'email': fila[3]
+                })
+
+            # ORDER BY rowid conserva el orden en que se agregaron los productos
+            for fila in conexion.execute(
+                    "SELECT codigo, nombre, unidad_medida, fecha_ingreso, id_proveedor, "
+                    "precio_costo, cantidad, stock_minimo FROM productos ORDER BY rowid"):
+                inventario.incorporar_producto_dict({
+                    'codigo': fila[0],
+                    'nombre': fila[1],
+                    'unidad_medida': fila[2],
+                    'fecha_ingreso': fila[3],
+                    'id_proveedor': fila[4],
+                    'precio_costo': fila[5],
+                    'cantidad': fila[6],
+                    'stock_minimo': fila[7]
+                })
+
+        return inventario
+
+    # ==================== CONSULTAS CON ÍNDICES ====================
+
+    def codigos_bajo_stock(self) -> list[str]:
+        """
+        Retorna los códigos de productos con cantidad <= stock mínimo
+        =============================================================
+        Usa el índice sobre (cantidad - stock_minimo), así que solo lee las
+        filas bajo stock. Vienen en el mismo orden que el índice de stock
+        bajo del Inventario: del más crítico al menos crítico (cantidad /
+        stock_minimo, o 0 si el mínimo es 0) y, a igual criticidad, por
+        código.
+
+        Retorna:
+        --------
+        list[str] : Códigos de los productos bajo stock
+        """
+        with self._candado:
+            # CAST para que la división no sea entera si la columna guardó
+            # números enteros
+            cursor = self._obtener_conexion().execute(
+                "SELECT codigo FROM productos WHERE cantidad - stock_minimo <= 0 "
+                "ORDER BY CASE WHEN stock_minimo <= 0 THEN 0.0 "
+                "ELSE CAST(cantidad AS REAL) / stock_minimo END, codigo")
+            return [fila[0] for fila in cursor]
+
+    def codigos_por_proveedor(self, id_proveedor: str) -> list[str]:
+        """
+        Retorna los códigos de productos de un proveedor
+        ================================================
+        Usa el índice sobre id_proveedor.
+
+        Parámetros:
+        -----------
+        id_proveedor : str
+            ID del proveedor
+
+        Retorna:
+        --------
+        list[str] : Códigos de los productos del proveedor
+        """
+        with self._candado:
+            cursor = self._obtener_conexion().execute(
+                "SELECT codigo FROM productos WHERE id_proveedor = ? ORDER BY rowid",
+                (id_proveedor,))
+            return [fila[0] for fila in cursor]
+
+    # ==================== MÉTODOS AUXILIARES ====================
+
+    @staticmethod
+    def _fila_producto(producto) -> tuple:
+        """
+        Convierte un Producto en una tupla para la tabla productos (privado)
+        """
+        return (producto.codigo, producto.nombre, producto.unidad_medida,
+                producto.fecha_ingreso, producto.proveedor.id_proveedor,
+                producto.precio_costo, producto.cantidad, producto.stock_minimo)
+
+    @staticmethod
+    def _fila_proveedor(proveedor) -> tuple:
+        """
+        Convierte un Proveedor en una tupla para la tabla proveedores (privado)
+        """
+        return (proveedor.id_proveedor, proveedor.nombre,
+                proveedor.telefono, proveedor.email)
+
+    def respaldar(self, ruta_destino: str) -> None:
+        """
+        Copia la base de datos completa a otro archivo
+        ==============================================
+        Usa la API de respaldo de SQLite, que produce una copia consistente
+        aunque la base de datos esté abierta.
+
+        Parámetros:
+        -----------
+        ruta_destino : str
+            Ruta del archivo de respaldo
+        """
+        with self._candado:
+            destino = sqlite3.connect(ruta_destino)
+            try:
+                self._obtener_conexion().backup(destino)
+            finally:
+                destino.close()
@@ -0,0 +1,327 @@
+"""
+Módulo diario.py
+================
+Archivo que contiene la clase DiarioCambios para el sistema AgroCol SAS.
+
+El diario (en inglés "write-ahead log" o "journal") es un archivo donde se
+AGREGAN al final, uno por línea, los cambios que sufre el inventario
+(producto agregado, stock modificado, proveedor nuevo, etc.).
+
+¿Por qué un diario?
+-------------------
+Guardar el inventario completo en cada clic obliga a reescribir TODO el
+archivo JSON aunque solo haya cambiado un producto. Con el diario, cada
+guardado solo escribe los cambios nuevos, así que el costo depende del
+tamaño del cambio y no del tamaño del catálogo.
+
+Al cargar, se lee la última "foto" completa (snapshot) y luego se vuelven
+a aplicar (replay) los cambios del diario en el mismo orden.
+
+Compactación:
+-------------
+Para que el diario no crezca para siempre, cada cierto tiempo se "rota":
+el archivo actual se renombra a <diario>.1 y los cambios nuevos siguen
+llegando a un diario vacío. Mientras tanto, un hilo en segundo plano junta
+la foto con <diario>.1 en una foto nueva y luego borra <diario>.1.
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import json  # Para convertir cada registro a una línea JSON
+import os    # Para operaciones del sistema de archivos (fsync, tamaño)
+from typing import Iterator  # Para anotar generadores
+
+
+class DiarioCambios:
+    """
+    Clase DiarioCambios
+    ===================
+    Maneja un archivo de texto donde cada línea es un registro JSON compacto
+    con un cambio del inventario.
+
+    Formato de cada línea:
+    ----------------------
+    {"s":15,"op":"stock","codigo":"FERT001","delta":-5.0}
+
+    - "s"  : número de secuencia (crece con cada cambio)
+    - "op" : tipo de operación (producto, eliminar_producto, stock, proveedor)
+    - resto: datos propios de la operación
+
+    Sincronización en grupo (group commit):
+    ---------------------------------------
+    os.fsync() obliga al sistema operativo a escribir físicamente en disco,
+    pero es una operación lenta. Por eso se hace una sola vez por grupo de
+    registros en lugar de una vez por registro.
+
+    Atributos:
+    ----------
+    _ruta : str
+        Ruta completa del archivo del diario (privado)
+    _registros_por_fsync : int
+        Cantidad mínima de registros escritos antes de llamar a fsync (privado)
+    _registros_sin_sincronizar : int
+        Registros escritos que todavía no se han sincronizado al disco (privado)
+    _ruta_rotado : str
+        Ruta del segmento rotado que espera ser compactado (privado)
+    _cantidad_registros : int
+        Registros en el segmento actual del diario (privado)
+    """
+
+    def __init__(self, ruta: str, registros_por_fsync: int = 1):
+        """
+        Constructor de la clase DiarioCambios
+        =====================================
+
+        Parámetros:
+        -----------
+        ruta : str
+            Ruta completa del archivo del diario
+        registros_por_fsync : int, opcional
+            Cada cuántos registros se fuerza la escritura física en disco.
+            Con 1 (por defecto) cada grupo de cambios guardado se sincroniza.
+
+        Ejemplo de uso:
+        ---------------
+        >>> diario = DiarioCambios("inventario_agrocol.json.log")
+        """
+        self._ruta = ruta
+        self._registros_por_fsync = max(1, registros_por_fsync)
+        self._registros_sin_sincronizar = 0
+        self._ruta_rotado = ruta + ".1"
+        self._cantidad_registros = 0
+
+    # ==================== PROPIEDADES ====================
+
+    @property
+    def ruta(self) -> str:
+        """
+        Getter de la ruta del diario
+
+        Retorna:
+        --------
+        str : Ruta completa del archivo del diario
+        """
+        return self._ruta
+
+    @property
+    def cantidad_registros(self) -> int:
+        """
+        Getter de la cantidad de registros del segmento actual
+        (se actualiza al leer el diario y con cada grupo agregado)
+
+        Retorna:
+        --------
+        int : Registros escritos desde la última rotación
+        """
+        return self._cantidad_registros
+
+    # ==================== ESCRITURA ====================
+
+    def agregar(self, registros: list[dict]) -> None:
+        """
+        Agrega un grupo de registros al final del diario
+        ================================================
+        Todos los registros se escriben con una sola llamada al sistema y,
+        si corresponde, se sincronizan al disco con un único fsync.
+
+        La escritura es "todo o nada":
+        - Si un cierre inesperado dejó la última línea cortada, el grupo
+          empieza en una línea nueva (si no, el primer registro quedaría
+          pegado al pedazo y al cargar se descartaría junto con él).
+        - Si la escritura o el fsync fallan (por ejemplo, disco lleno), el
+          archivo se recorta al tamaño que tenía antes. Así, al reintentar
+          el guardado, los mismos cambios no quedan escritos dos veces.
+
+        Parámetros:
+        -----------
+        registros : list[dict]
+            Registros a escribir (cada uno debe tener la clave "s")
+
+        Excepciones:
+        ------------
+        OSError : Si no se pudo escribir (el diario queda como estaba)
+        """
+        if not registros:
+            return
+
+        # separators sin espacios = JSON compacto (menos bytes por registro)
+        lineas = [json.dumps(r, ensure_ascii=False, separators=(',', ':'))
+                  for r in registros]
+        datos = ('\n'.join(lineas) + '\n').encode('utf-8')
+
+        # 'a+b' = agregar al final, pudiendo leer el último byte.
+        # buffering=0: cada write va directo al sistema (si falla, no queda
+        # nada en un búfer que se escriba después del recorte)
+        with open(self._ruta, 'a+b', buffering=0) as archivo:
+            tamano_inicial = archivo.seek(0, os.SEEK_END)
+            if tamano_inicial > 0:
+                archivo.seek(tamano_inicial - 1)
+                if archivo.read(1) != b'\n':
+                    datos = b'\n' + datos
+
+            try:
+                escritos = 0
+                while escritos < len(datos):
+                    escritos += archivo.write(datos[escritos:])
+
+                if self._registros_sin_sincronizar + len(registros) >= self._registros_por_fsync:
+                    os.fsync(archivo.fileno())
+                    self._registros_sin_sincronizar = 0
+                else:
+                    self._registros_sin_sincronizar += len(registros)
+            except BaseException:
+                # Deshacer lo escrito a medias y volver a lanzar el error
+                os.ftruncate(archivo.fileno(), tamano_inicial)
+                raise
+
+        self._cantidad_registros += len(registros)
+
+    def sincronizar(self) -> None:
+        """
+        Fuerza la escritura física de los registros pendientes de fsync
+        ===============================================================
+        Se usa al cerrar la aplicación para no perder el último grupo.
+        """
+        if self._registros_sin_sincronizar == 0 or not self.existe():
+            return
+        with open(self._ruta, 'a', encoding='utf-8') as archivo:
+            os.fsync(archivo.fileno())
+        self._registros_sin_sincronizar = 0
+
+    def truncar(self) -> None:
+        """
+        Elimina el diario
+        =================
+        Se llama cuando se escribió un snapshot completo que ya incluye
+        todos los cambios del diario (incluido el segmento rotado).
+        """
+        if self.existe():
+            os.remove(self._ruta)
+        self.eliminar_rotado()
+        self._registros_sin_sincronizar = 0
+        self._cantidad_registros = 0
+
+    # ==================== ROTACIÓN ====================
+
+    def rotar(self) -> bool:
+        """
+        Renombra el diario actual como segmento rotado
+        ==============================================
+        Es una operación muy rápida (solo cambia el nombre del archivo), así
+        que puede hacerse desde el hilo de la interfaz. Los registros nuevos
+        se escribirán en un diario vacío.
+
+        Retorna:
+        --------
+        bool : True si se rotó, False si no había diario o ya existía
+               un segmento rotado sin compactar
+        """
+        if not self.existe() or self.hay_segmento_rotado():
+            return False
+
+        # Sincronizar antes de rotar para no dejar registros solo en caché
+        self.sincronizar()
+        os.replace(self._ruta, self._ruta_rotado)
+        self._cantidad_registros = 0
+        return True
+
+    def hay_segmento_rotado(self) -> bool:
+        """
+        Indica si existe un segmento rotado pendiente de compactar
+
+        Retorna:
+        --------
+        bool : True si el archivo <diario>.1 existe
+        """
+        return os.path.exists(self._ruta_rotado)
+
+    def eliminar_rotado(self) -> None:
+        """
+        Elimina el segmento rotado (ya incluido en una foto nueva)
+        """
+        if self.hay_segmento_rotado():
+            os.remove(self._ruta_rotado)
+
+    # ==================== LECTURA ====================
+
+    def leer(self) -> Iterator[dict]:
+        """
+        Recorre todos los registros del diario en orden
+        ===============================================
+        Primero el segmento rotado (si existe) y luego el diario actual.
+
+        Retorna:
+        --------
+        Iterator[dict] : Generador con cada registro del diario
+        """
+        yield from self.leer_rotado()
+
+        cantidad = 0
+        for registro in self._leer_archivo(self._ruta):
+            cantidad += 1
+            yield registro
+        self._cantidad_registros = cantidad
+
+    def leer_rotado(self) -> Iterator[dict]:
+        """
+        Recorre solo los registros del segmento rotado
+
+        Retorna:
+        --------
+        Iterator[dict] : Generador con cada registro del segmento rotado
+        """
+        yield from self._leer_archivo(self._ruta_rotado)
+
+    def _leer_archivo(self, ruta: str) -> Iterator[dict]:
+        """
+        Lee un archivo de diario línea por línea (método privado)
+        =========================================================
+        Si la aplicación se cerró de golpe mientras escribía, la última línea
+        puede quedar incompleta; esa línea se ignora en lugar de fallar.
+
+        Parámetros:
+        -----------
+        ruta : str
+            Ruta del archivo a leer
+
+        Retorna:
+        --------
+        Iterator[dict] : Generador con cada registro del archivo
+        """
+        if not os.path.exists(ruta):
+            return
+
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            for numero, linea in enumerate(archivo, start=1):
+                linea = linea.strip()
+                if not linea:
+                    continue
+                try:
+                    yield json.loads(linea)
+                except json.JSONDecodeError:
+                    # Línea cortada por un cierre inesperado: se descarta
+                    print(f"Diario: registro incompleto en la línea {numero}, se ignora")
+
+    # ==================== MÉTODOS AUXILIARES ====================
+
+    def existe(self) -> bool:
+        """
+        Verifica si el archivo del diario existe
+
+        Retorna:
+        --------
+        bool : True si el diario existe en disco
+        """
+        return os.path.exists(self._ruta)
+
+    def tamano_bytes(self) -> int:
+        """
+        Retorna el tamaño actual del diario en bytes
+
+        Retorna:
+        --------
+        int : Tamaño en bytes (0 si no existe)
+        """
+        return os.path.getsize(self._ruta) if self.existe() else 0
@@ -0,0 +1,517 @@
+"""
+Módulo foto_binaria.py
+======================
+Archivo que contiene la clase FotoBinaria para el sistema AgroCol SAS.
+
+La foto binaria es una copia del inventario en un formato de columnas de
+ancho fijo, pensada para las terminales que solo CONSULTAN el inventario
+(por ejemplo, la caja o una pantalla de bodega). En lugar de leer el JSON
+y crear un objeto Producto por cada producto, la terminal abre el archivo
+con mmap (el sistema operativo lo carga por páginas cuando se usan) y las
+consultas recorren directamente los números guardados en el archivo.
+
+Estructura del archivo (todos los números en little-endian):
+------------------------------------------------------------
+1. Cabecera: "AGRB", versión, cantidad de productos y de proveedores,
+   secuencia del diario incluida y tamaño total del archivo
+2. Tabla de secciones: (posición, tamaño) de cada sección
+3. Secciones, cada una alineada a 8 bytes:
+   - Columnas numéricas: cantidad, precio_costo, stock_minimo
+     (un double de 8 bytes por producto, como array('d'))
+   - Columnas de texto: codigo, nombre, unidad_medida, fecha_ingreso,
+     id_proveedor. Cada una son dos secciones: las posiciones de inicio
+     (un entero de 4 bytes por producto, más uno final) y los textos en
+     UTF-8 pegados uno detrás de otro. El texto de la fila i va desde
+     posiciones[i] hasta posiciones[i + 1].
+   - Proveedores: lista en JSON (son pocos, no hace falta otro formato)
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import json      # Para la sección de proveedores
+import mmap      # Para abrir el archivo sin leerlo completo
+import operator  # Para multiplicar y comparar columnas sin escribir bucles
+import os        # Para escribir el archivo de forma atómica
+import struct    # Para escribir y leer la cabecera
+import sys       # Para conocer el orden de bytes del computador
+from array import array  # Arreglos compactos de números
+from itertools import compress  # Para filtrar filas con una columna de True/False
+from typing import Optional
+
+# Importar las clases del dominio
+from ..modelos import Proveedor, ResumenProducto
+
+
+class FotoBinaria:
+    """
+    Clase FotoBinaria
+    =================
+    Foto del inventario en columnas, abierta con mmap y de solo lectura.
+
+    Las consultas de esta clase no crean objetos Producto: trabajan sobre
+    las columnas del archivo y solo decodifican los textos que necesitan.
+    Tiene los métodos codigos_bajo_stock() y codigos_por_proveedor(), así
+    que también sirve como motor de consultas de un Inventario (ver
+    Inventario.establecer_motor_consultas).
+
+    Atributos:
+    ----------
+    _ruta : str
+        Ruta del archivo binario (privado)
+    _archivo : BinaryIO
+        Archivo abierto en modo binario (privado)
+    _mapa : mmap.mmap
+        Archivo proyectado en memoria (privado)
+    _secuencia : int
+        Secuencia del diario incluida en la foto (privado)
+    _cantidad_productos : int
+        Cantidad de filas de cada columna (privado)
+    _numeros : dict[str, memoryview | array]
+        Columnas numéricas, por nombre (privado)
+    _textos : dict[str, tuple]
+        Columnas de texto: (posiciones, bytes) por nombre (privado)
+    _proveedores : list[dict]
+        Proveedores de la foto (privado)
+    _filas_por_codigo : dict[str, int] | None
+        Índice codigo -> fila, se arma la primera vez que se usa (privado)
+
+    Ejemplo de uso:
+    ---------------
+    >>> with FotoBinaria("inventario_agrocol.json.bin") as foto:
+    ...     print(foto.obtener_valor_total_inventario())
+    ...     print(foto.codigos_bajo_stock())
+    """
+
+    # Identificación del formato
+    MAGICO = b'AGRB'
+    VERSION = 1
+
+    # Cabecera: mágico, versión, reservado, productos, proveedores,
+    # secuencia del diario y tamaño total del archivo
+    CABECERA = struct.Struct('<4sHHIIQQ')
+
+    # Columnas, en el orden en que se escriben
+    COLUMNAS_NUMERICAS = ('cantidad', 'precio_costo', 'stock_minimo')
+    COLUMNAS_TEXTO = ('codigo', 'nombre', 'unidad_medida', 'fecha_ingreso', 'id_proveedor')
+
+    # Cantidad de secciones: una por columna numérica, dos por columna de
+    # texto (posiciones y bytes) y una de proveedores
+    CANTIDAD_SECCIONES = len(COLUMNAS_NUMERICAS) + 2 * len(COLUMNAS_TEXTO) + 1
+
+    # Cada entrada de la tabla de secciones: (posición, tamaño)
+    SECCION = struct.Struct('<QQ')
+
+    def __init__(self, ruta: str):
+        """
+        Constructor de la clase FotoBinaria
+        ===================================
+        Abre el archivo y lo proyecta en memoria. Solo se leen la cabecera
+        y la tabla de secciones; los datos se leen cuando se consultan.
+
+        Parámetros:
+        -----------
+        ruta : str
+            Ruta del archivo binario
+
+        Excepciones:
+        ------------
+        ValueError : Si el archivo no es una foto binaria válida o está incompleto
+        OSError : Si el archivo no se puede abrir
+        """
+        self._ruta = ruta
+        self._archivo = open(ruta, 'rb')
+        try:
+            self._abrir()
+        except Exception:
+            self._archivo.close()
+            raise
+
+    def _abrir(self) -> None:
+        """
+        Proyecta el archivo y prepara las vistas de cada columna (privado)
+        """
+        tamano = os.fstat(self._archivo.fileno()).st_size
+        if tamano < self.CABECERA.size:
+            raise ValueError("El archivo es demasiado pequeño para ser una foto binaria")
+
+        # ACCESS_READ: proyección de solo lectura (varios procesos la comparten)
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        vista = memoryview(self._mapa)
+
+        (magico, version, _, productos, proveedores,
+         secuencia, tamano_total) = self.CABECERA.unpack_from(vista, 0)
+        if magico != self.MAGICO or version != self.VERSION:
+            raise ValueError("El archivo no es una foto binaria de AgroCol (o es de otra versión)")
+        if tamano_total != tamano:
+            raise ValueError("La foto binaria está incompleta")
+
+        self._secuencia = secuencia
+        self._cantidad_productos = productos
+
+        # Leer la tabla de secciones
+        secciones = []
+        posicion = self.CABECERA.size
+        for _ in range(self.CANTIDAD_SECCIONES):
+            inicio, largo = self.SECCION.unpack_from(vista, posicion)
+            if inicio + largo > tamano:
+                raise ValueError("La foto binaria tiene una sección fuera del archivo")
+            secciones.append(vista[inicio:inicio + largo])
+            posicion += self.SECCION.size
+        secciones.reverse()  # Para sacarlas en orden con pop()
+
+        self._numeros = {}
+        for nombre in self.COLUMNAS_NUMERICAS:
+            self._numeros[nombre] = self._vista_numerica(secciones.pop(), 'd')
+
+        self._textos = {}
+        for nombre in self.COLUMNAS_TEXTO:
+            posiciones = self._vista_numerica(secciones.pop(), 'I')
+            self._textos[nombre] = (posiciones, secciones.pop())
+
+        self._proveedores = json.loads(bytes(secciones.pop()).decode('utf-8'))
+        if len(self._proveedores) != proveedores:
+            raise ValueError("La foto binaria tiene una lista de proveedores incompleta")
+
+        self._filas_por_codigo: Optional[dict[str, int]] = None
+
+    @staticmethod
+    def _vista_numerica(seccion: memoryview, tipo: str):
+        """
+        Interpreta una sección como arreglo de números (privado)
+        =======================================================
+        En un computador little-endian (casi todos) se usa la sección tal
+        cual, sin copiarla. En uno big-endian se copia y se invierten los
+        bytes de cada número.
+
+        Parámetros:
+        -----------
+        seccion : memoryview
+            Bytes de la sección
+        tipo : str
+            'd' (double de 8 bytes) o 'I' (entero sin signo de 4 bytes)
+
+        Retorna:
+        --------
+        memoryview | array : Secuencia de números indexable
+        """
+        if sys.byteorder == 'little':
+            return seccion.cast(tipo)
+        numeros = array(tipo)
+        numeros.frombytes(seccion)
+        numeros.byteswap()
+        return numeros
+
+    # ==================== ESCRITURA ====================
+
+    @classmethod
+    def serializar(cls, datos: dict) -> bytes:
+        """
+        Convierte el diccionario del inventario en una foto binaria
+        ===========================================================
+
+        Parámetros:
+        -----------
+        datos : dict
+            Diccionario de Inventario.to_dict() (esquema versión 2, con
+            'secuencia' opcional)
+
+        Retorna:
+        --------
+        bytes : Contenido completo del archivo
+        """
+        productos = datos.get('productos', [])
+        proveedores = datos.get('proveedores', [])
+
+        secciones = []
+        for nombre in cls.COLUMNAS_NUMERICAS:
+            secciones.append(cls._bytes_numericos('d', (float(p[nombre]) for p in productos)))
+
+        for nombre in cls.COLUMNAS_TEXTO:
+            posiciones = array('I', [0])
+            textos = bytearray()
+            for producto in productos:
+                textos += str(producto[nombre]).encode('utf-8')
+                posiciones.append(len(textos))
+            secciones.append(cls._bytes_numericos('I', posiciones))
+            secciones.append(bytes(textos))
+
+        secciones.append(json.dumps(proveedores, ensure_ascii=False,
+                                    separators=(',', ':')).encode('utf-8'))
+
+        # Ubicar cada sección alineada a 8 bytes, después de la tabla
+        posicion = cls._alinear(cls.CABECERA.size + cls.SECCION.size * len(secciones))
+        tabla = bytearray()
+        ubicaciones = []
+        for seccion in secciones:
+            tabla += cls.SECCION.pack(posicion, len(seccion))
+            ubicaciones.append(posicion)
+            posicion = cls._alinear(posicion + len(seccion))
+
+        contenido = bytearray(posicion)
+        contenido[0:cls.CABECERA.size] = cls.CABECERA.pack(
+            cls.MAGICO, cls.VERSION, 0, len(productos), len(proveedores),
+            datos.get('secuencia', 0), posicion)
+        contenido[cls.CABECERA.size:cls.CABECERA.size + len(tabla)] = tabla
+        for inicio, seccion in zip(ubicaciones, secciones):
+            contenido[inicio:inicio + len(seccion)] = seccion
+        return bytes(contenido)
+
+    @staticmethod
+    def _bytes_numericos(tipo: str, valores) -> bytes:
+        """
+        Convierte números a bytes en little-endian (privado)
+        """
+        numeros = array(tipo, valores)
+        if sys.byteorder != 'little':
+            numeros.byteswap()
+        return numeros.tobytes()
+
+    @staticmethod
+    def _alinear(posicion: int) -> int:
+        """
+        Redondea una posición hacia arriba al siguiente múltiplo de 8 (privado)
+        """
+        return (posicion + 7) // 8 * 8
+
+    # ==================== PROPIEDADES ====================
+
+    @property
+    def ruta(self) -> str:
+        """
+        Getter de la ruta del archivo
+
+        Retorna:
+        --------
+        str : Ruta del archivo binario
+        """
+        return self._ruta
+
+    @property
+    def secuencia(self) -> int:
+        """
+        Getter de la secuencia del diario incluida en la foto
+
+        Retorna:
+        --------
+        int : Último cambio del diario incluido (0 sin modo diario)
+        """
+        return self._secuencia
+
+    # ==================== CONSULTAS ====================
+
+    def obtener_cantidad_total_productos(self) -> int:
+        """
+        Retorna la cantidad de productos de la foto
+
+        Retorna:
+        --------
+        int : Número de productos (filas)
+        """
+        return self._cantidad_productos
+
+    def obtener_valor_total_inventario(self) -> float:
+        """
+        Calcula el valor total (cantidad × precio_costo) sobre las columnas
+        ==================================================================
+
+        Retorna:
+        --------
+        float : Valor total del inventario
+        """
+        # map(operator.mul, ...) multiplica fila por fila sin crear objetos
+        return sum(map(operator.mul, self._numeros['cantidad'], self._numeros['precio_costo']))
+
+    def filas_bajo_stock(self) -> list[int]:
+        """
+        Retorna las filas cuya cantidad es menor o igual al stock mínimo
+
+        Retorna:
+        --------
+        list[int] : Números de fila, en el orden del archivo
+        """
+        bajo = map(operator.le, self._numeros['cantidad'], self._numeros['stock_minimo'])
+        return list(compress(range(self._cantidad_productos), bajo))
+
+    def codigos_bajo_stock(self) -> list[str]:
+        """
+        Retorna los códigos de los productos con stock bajo
+
+        Vienen en el mismo orden que el índice de stock bajo del
+        Inventario: del más crítico al menos crítico (cantidad /
+        stock_minimo, o 0 si el mínimo es 0) y, a igual criticidad, por
+        código.
+
+        Retorna:
+        --------
+        list[str] : Códigos, del más crítico al menos crítico
+        """
+        cantidades = self._numeros['cantidad']
+        minimos = self._numeros['stock_minimo']
+        claves = []
+        for fila in self.filas_bajo_stock():
+            minimo = minimos[fila]
+            criticidad = 0.0 if minimo <= 0 else cantidades[fila] / minimo
+            claves.append((criticidad, self.texto('codigo', fila)))
+        claves.sort()
+        return [codigo for _, codigo in claves]
+
+    def codigos_por_proveedor(self, id_proveedor: str) -> list[str]:
+        """
+        Retorna los códigos de los productos de un proveedor
+
+        Los ID se comparan como bytes, sin decodificar cada fila.
+
+        Parámetros:
+        -----------
+        id_proveedor : str
+            ID del proveedor
+
+        Retorna:
+        --------
+        list[str] : Códigos, en el orden del archivo
+        """
+        buscado = id_proveedor.encode('utf-8')
+        posiciones, textos = self._textos['id_proveedor']
+        return [self.texto('codigo', fila) for fila in range(self._cantidad_productos)
+                if textos[posiciones[fila]:posiciones[fila + 1]] == buscado]
+
+    def obtener_productos_bajo_stock(self) -> list[ResumenProducto]:
+        """
+        Retorna los productos con stock bajo (como resúmenes livianos)
+
+        Retorna:
+        --------
+        list[ResumenProducto] : Productos con cantidad <= stock mínimo
+        """
+        return [self.resumen(fila) for fila in self.filas_bajo_stock()]
+
+    def obtener_resumen(self, codigo: str) -> Optional[ResumenProducto]:
+        """
+        Busca un producto por su código
+        ===============================
+        La primera búsqueda arma un índice codigo -> fila.
+
+        Parámetros:
+        -----------
+        codigo : str
+            Código del producto
+
+        Retorna:
+        --------
+        ResumenProducto | None : Resumen del producto, o None si no existe
+        """
+        if self._filas_por_codigo is None:
+            self._filas_por_codigo = {self.texto('codigo', fila): fila
+                                      for fila in range(self._cantidad_productos)}
+        fila = self._filas_por_codigo.get(codigo)
+        return None if fila is None else self.resumen(fila)
+
+    def listar_resumenes(self) -> list[ResumenProducto]:
+        """
+        Retorna el resumen de todos los productos, en el orden del archivo
+
+        Retorna:
+        --------
+        list[ResumenProducto] : Un resumen por producto
+        """
+        return [self.resumen(fila) for fila in range(self._cantidad_productos)]
+
+    def listar_proveedores(self) -> list[Proveedor]:
+        """
+        Retorna los proveedores de la foto
+
+        Retorna:
+        --------
+        list[Proveedor] : Proveedores reconstruidos desde la foto
+        """
+        return [Proveedor.from_dict(datos) for datos in self._proveedores]
+
+    # ==================== ACCESO A FILAS ====================
+
+    def texto(self, columna: str, fila: int) -> str:
+        """
+        Lee un texto de una columna de texto
+
+        Parámetros:
+        -----------
+        columna : str
+            Nombre de la columna (ver COLUMNAS_TEXTO)
+        fila : int
+            Número de fila
+
+        Retorna:
+        --------
+        str : Texto decodificado
+        """
+        posiciones, textos = self._textos[columna]
+        return str(textos[posiciones[fila]:posiciones[fila + 1]], 'utf-8')
+
+    def numero(self, columna: str, fila: int) -> float:
+        """
+        Lee un número de una columna numérica
+
+        Parámetros:
+        -----------
+        columna : str
+            Nombre de la columna (ver COLUMNAS_NUMERICAS)
+        fila : int
+            Número de fila
+
+        Retorna:
+        --------
+        float : Valor de la columna en esa fila
+        """
+        return self._numeros[columna][fila]
+
+    def resumen(self, fila: int) -> ResumenProducto:
+        """
+        Arma el resumen de una fila
+
+        Parámetros:
+        -----------
+        fila : int
+            Número de fila
+
+        Retorna:
+        --------
+        ResumenProducto : Datos de la fila
+        """
+        return ResumenProducto(
+            self.texto('codigo', fila), self.texto('nombre', fila),
+            self.texto('unidad_medida', fila), self.texto('fecha_ingreso', fila),
+            self.texto('id_proveedor', fila), self.numero('precio_costo', fila),
+            self.numero('cantidad', fila), self.numero('stock_minimo', fila))
+
+    # ==================== CIERRE ====================
+
+    def cerrar(self) -> None:
+        """
+        Libera la proyección en memoria y cierra el archivo
+        ===================================================
+        Después de cerrar, la foto ya no se puede consultar.
+        """
+        # Las vistas deben soltarse antes de cerrar el mmap
+        self._numeros = {}
+        self._textos = {}
+        self._filas_por_codigo = None
+        try:
+            self._mapa.close()
+        except BufferError:
+            # Alguien conserva una vista de una columna: el mmap se cerrará
+            # cuando esa vista deje de usarse
+            pass
+        self._archivo.close()
+
+    def __enter__(self) -> 'FotoBinaria':
+        """
+        Permite usar la foto con 'with' (se cierra sola al terminar)
+        """
+        return self
+
+    def __exit__(self, tipo, valor, traza) -> None:
+        """
+        Cierra la foto al salir del bloque 'with'
+        """
+        self.cerrar()
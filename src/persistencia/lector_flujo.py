@@ -0,0 +1,343 @@
+"""
+Módulo lector_flujo.py
+======================
+Archivo que contiene la clase LectorFlujoJSON para el sistema AgroCol SAS.
+
+json.load() lee el archivo COMPLETO y arma en memoria todos los diccionarios
+del inventario; luego Inventario.from_dict() arma TODOS los objetos. Durante
+un momento existen las dos copias, así que la memoria usada es más o menos
+el doble del catálogo.
+
+Este lector recorre el archivo por bloques y entrega los productos y
+proveedores UNO POR UNO. Cada diccionario se convierte en objeto y se
+descarta enseguida, así que la memoria queda cerca del tamaño final del
+inventario más un bloque de lectura.
+
+¿Cómo funciona?
+---------------
+El archivo es un objeto JSON con pocas claves; dos de ellas ('proveedores'
+y 'productos') son listas largas. El lector avanza carácter por carácter
+solo en la "estructura" (llaves, corchetes, comas y dos puntos) y usa
+json.JSONDecoder.raw_decode() para leer cada elemento completo. Si un
+elemento quedó cortado al final del bloque, se lee el siguiente bloque y
+se vuelve a intentar.
+
+El módulo incluye también ArchivoVerificado, que calcula el CRC32 del
+archivo en la misma pasada, para comprobarlo contra el archivo .chk sin
+leerlo dos veces.
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import io    # Clases base para archivos (ArchivoVerificado)
+import json  # Para decodificar cada valor con raw_decode
+import zlib  # Para calcular el CRC32 mientras se lee
+from typing import BinaryIO, Iterator, TextIO  # Para anotar generadores y archivos
+
+
+class LectorFlujoJSON:
+    """
+    Clase LectorFlujoJSON
+    =====================
+    Lector incremental de archivos de inventario en formato JSON.
+
+    Eventos que produce (ver eventos()):
+    ------------------------------------
+    - ('proveedor', dict): cada elemento de la lista 'proveedores'
+    - ('producto', dict) : cada elemento de la lista 'productos'
+    - (clave, valor)     : cualquier otra clave del objeto principal
+                           (por ejemplo ('version', 2) o ('secuencia', 15))
+
+    Los eventos salen en el mismo orden en que aparecen en el archivo.
+
+    Atributos:
+    ----------
+    _archivo : TextIO
+        Archivo de texto abierto para lectura (privado)
+    _tamano_bloque : int
+        Cantidad de caracteres que se leen de una vez (privado)
+    _buffer : str
+        Texto leído que todavía no se terminó de procesar (privado)
+    _posicion : int
+        Posición actual dentro de _buffer (privado)
+    _fin_archivo : bool
+        True cuando ya no quedan bloques por leer (privado)
+    _decodificador : json.JSONDecoder
+        Decodificador que lee un valor JSON completo (privado)
+    """
+
+    # Listas del objeto principal que se recorren elemento por elemento,
+    # con el nombre del evento que produce cada elemento
+    LISTAS = {'proveedores': 'proveedor', 'productos': 'producto'}
+
+    def __init__(self, archivo: TextIO, tamano_bloque: int = 64 * 1024):
+        """
+        Constructor de la clase LectorFlujoJSON
+        =======================================
+
+        Parámetros:
+        -----------
+        archivo : TextIO
+            Archivo de texto (o cualquier objeto con read(n)) ya abierto
+        tamano_bloque : int, opcional
+            Caracteres que se leen por bloque (por defecto 64 KB)
+
+        Ejemplo de uso:
+        ---------------
+        >>> with open("inventario_agrocol.json", encoding="utf-8") as archivo:
+        ...     for evento, valor in LectorFlujoJSON(archivo).eventos():
+        ...         print(evento)
+        """
+        self._archivo = archivo
+        self._tamano_bloque = tamano_bloque
+        self._buffer = ""
+        self._posicion = 0
+        self._fin_archivo = False
+        self._decodificador = json.JSONDecoder()
+
+    # ==================== MÉTODO PRINCIPAL ====================
+
+    def eventos(self) -> Iterator[tuple[str, object]]:
+        """
+        Recorre el archivo y entrega cada registro apenas se termina de leer
+        ====================================================================
+
+        Retorna:
+        --------
+        Iterator[tuple[str, object]] : Generador de (evento, valor)
+
+        Excepciones:
+        ------------
+        ValueError : Si el archivo no es un objeto JSON válido
+        """
+        self._esperar('{')
+        if self._siguiente_caracter() == '}':
+            self._posicion += 1
+            return
+
+        while True:
+            # Clave del objeto principal y sus dos puntos
+            clave = self._leer_valor()
+            if not isinstance(clave, str):
+                raise ValueError("Se esperaba una clave de texto en el objeto principal")
+            self._esperar(':')
+
+            if clave in self.LISTAS and self._siguiente_caracter() == '[':
+                # Lista larga: entregar los elementos uno por uno
+                evento = self.LISTAS[clave]
+                for elemento in self._recorrer_lista():
+                    yield evento, elemento
+            else:
+                yield clave, self._leer_valor()
+
+            # Después de cada valor viene una coma o el cierre del objeto
+            if self._siguiente_caracter() == ',':
+                self._posicion += 1
+                continue
+            self._esperar('}')
+            return
+
+    def _recorrer_lista(self) -> Iterator[object]:
+        """
+        Entrega uno por uno los elementos de una lista JSON (privado)
+
+        Retorna:
+        --------
+        Iterator[object] : Generador con cada elemento de la lista
+        """
+        self._esperar('[')
+        if self._siguiente_caracter() == ']':
+            self._posicion += 1
+            return
+
+        while True:
+            yield self._leer_valor()
+            if self._siguiente_caracter() == ',':
+                self._posicion += 1
+                continue
+            self._esperar(']')
+            return
+
+    # ==================== LECTURA DEL BUFFER ====================
+
+    def _rellenar(self) -> bool:
+        """
+        Lee el siguiente bloque del archivo (método privado)
+        ===================================================
+        Antes de agregar el bloque nuevo se descarta el texto ya procesado,
+        para que el buffer no crezca con el tamaño del archivo.
+
+        Retorna:
+        --------
+        bool : False si ya no quedaban bloques por leer
+        """
+        if self._fin_archivo:
+            return False
+
+        bloque = self._archivo.read(self._tamano_bloque)
+        if not bloque:
+            self._fin_archivo = True
+            return False
+
+        self._buffer = self._buffer[self._posicion:] + bloque
+        self._posicion = 0
+        return True
+
+    def _siguiente_caracter(self) -> str:
+        """
+        Salta espacios y retorna el siguiente carácter sin consumirlo (privado)
+
+        Retorna:
+        --------
+        str : Siguiente carácter significativo ('' al final del archivo)
+        """
+        while True:
+            while self._posicion < len(self._buffer) and self._buffer[self._posicion] in ' \t\r\n':
+                self._posicion += 1
+            if self._posicion < len(self._buffer):
+                return self._buffer[self._posicion]
+            if not self._rellenar():
+                return ''
+
+    def _esperar(self, caracter: str) -> None:
+        """
+        Consume el carácter esperado o lanza un error (método privado)
+
+        Parámetros:
+        -----------
+        caracter : str
+            Carácter de estructura esperado ('{', ':', ',', etc.)
+
+        Excepciones:
+        ------------
+        ValueError : Si aparece otro carácter
+        """
+        encontrado = self._siguiente_caracter()
+        if encontrado != caracter:
+            raise ValueError(f"Se esperaba {caracter!r} y se encontró "
+                             f"{encontrado or 'el fin del archivo'!r}")
+        self._posicion += 1
+
+    def _leer_valor(self) -> object:
+        """
+        Lee un valor JSON completo desde la posición actual (privado)
+        ============================================================
+        Si el valor quedó cortado al final del bloque (o termina justo en
+        el borde, como un número que podría seguir), se lee otro bloque y
+        se vuelve a intentar.
+
+        Retorna:
+        --------
+        object : Valor decodificado (dict, list, str, int, float, bool o None)
+
+        Excepciones:
+        ------------
+        ValueError : Si el valor no es JSON válido
+        """
+        self._siguiente_caracter()
+        while True:
+            try:
+                valor, fin = self._decodificador.raw_decode(self._buffer, self._posicion)
+            except json.JSONDecodeError:
+                # Valor incompleto: leer más texto; si no queda, el error es real
+                if self._rellenar():
+                    continue
+                raise
+
+            if fin == len(self._buffer) and self._rellenar():
+                # Terminó justo en el borde del bloque: volver a leerlo completo
+                continue
+
+            self._posicion = fin
+            return valor
+
+
+class ArchivoVerificado(io.RawIOBase):
+    """
+    Clase ArchivoVerificado
+    =======================
+    Envoltorio de un archivo binario que calcula el CRC32 y cuenta los bytes
+    a medida que se leen. Así la suma de verificación se obtiene en la misma
+    pasada que la lectura por bloques, sin tener todo el archivo en memoria.
+
+    Atributos:
+    ----------
+    _archivo : BinaryIO
+        Archivo binario original (privado)
+    _crc32 : int
+        CRC32 acumulado de los bytes leídos (privado)
+    _bytes_leidos : int
+        Cantidad de bytes leídos hasta ahora (privado)
+    """
+
+    def __init__(self, archivo: BinaryIO):
+        """
+        Constructor de la clase ArchivoVerificado
+        =========================================
+
+        Parámetros:
+        -----------
+        archivo : BinaryIO
+            Archivo abierto en modo binario ('rb')
+        """
+        super().__init__()
+        self._archivo = archivo
+        self._crc32 = 0
+        self._bytes_leidos = 0
+
+    @property
+    def crc32(self) -> int:
+        """
+        Getter del CRC32 de los bytes leídos
+
+        Retorna:
+        --------
+        int : CRC32 acumulado
+        """
+        return self._crc32
+
+    @property
+    def bytes_leidos(self) -> int:
+        """
+        Getter de la cantidad de bytes leídos
+
+        Retorna:
+        --------
+        int : Bytes leídos hasta ahora
+        """
+        return self._bytes_leidos
+
+    def readable(self) -> bool:
+        """
+        Indica que el archivo se puede leer (lo exige io.RawIOBase)
+        """
+        return True
+
+    def readinto(self, destino) -> int:
+        """
+        Lee bytes en el buffer destino y actualiza el CRC32 (lo usa io)
+
+        Parámetros:
+        -----------
+        destino : bytearray | memoryview
+            Buffer donde se copian los bytes leídos
+
+        Retorna:
+        --------
+        int : Cantidad de bytes leídos (0 al final del archivo)
+        """
+        cantidad = self._archivo.readinto(destino)
+        if cantidad:
+            self._crc32 = zlib.crc32(memoryview(destino)[:cantidad], self._crc32)
+            self._bytes_leidos += cantidad
+        return cantidad
+
+    def leer_resto(self) -> None:
+        """
+        Lee (y descarta) lo que falte del archivo para completar el CRC32
+        """
+        bloque = bytearray(64 * 1024)
+        while self.readinto(bloque):
+            pass
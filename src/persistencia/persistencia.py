@@ -11,14 +11,24 @@ Fecha: 2025
 """
 
 # Importar módulos necesarios de Python
+import gzip  # Para comprimir el archivo (perfil 'gzip')
+import io    # Para encadenar la lectura por bloques (CRC32, gzip, texto)
 import json  # Para trabajar con archivos JSON
 import os    # Para operaciones del sistema de archivos
+import threading  # Para compactar el diario en segundo plano
+import zlib  # Para calcular la suma de verificación (CRC32) del archivo
 from typing import Optional  # Para indicar valores opcionales
 from datetime import datetime  # Para manejar fechas y horas
 
 # Importar la clase Inventario
 from ..modelos import Inventario
 
+# Importar el diario de cambios (modo diario)
+from .diario import DiarioCambios
+from .backend_sqlite import BackendSQLite
+from .lector_flujo import LectorFlujoJSON, ArchivoVerificado
+from .foto_binaria import FotoBinaria
+
 
 class GestorPersistencia:
     """
@@ -43,9 +53,105 @@ class GestorPersistencia:
         Nombre del archivo donde se guarda el inventario (privado)
     _ruta_completa : str
         Ruta completa al archivo en el sistema (privado)
+    _diario : DiarioCambios | None
+        Diario de cambios si está activo el modo diario, None si no (privado)
+    _secuencia : int
+        Número del último cambio escrito en disco (privado)
+    _inventario_sincronizado : Inventario | None
+        Inventario cuyo estado coincide con lo que hay en disco (privado).
+        Solo ese inventario puede guardarse de forma incremental.
+    _secuencia_foto : int
+        Secuencia incluida en la última foto escrita en disco (privado)
+    _max_bytes_diario : int
+        Tamaño del diario a partir del cual se compacta (privado)
+    _max_registros_diario : int
+        Cantidad de registros a partir de la cual se compacta (privado)
+    _hilo_compactacion : threading.Thread | None
+        Hilo que está compactando en segundo plano, si lo hay (privado)
+    _candado_foto : threading.Lock
+        Evita que dos hilos reemplacen la foto al mismo tiempo (privado)
+    _sqlite : BackendSQLite | None
+        Backend SQLite si el almacenamiento es una base de datos (privado)
+    _consultas_sql : bool
+        Si las consultas del inventario se resuelven con SQL (privado)
+    _formato : str
+        Perfil de salida del archivo JSON: 'legible', 'compacto' o 'gzip' (privado)
+    _ruta_anterior : str
+        Ruta de la copia buena anterior de la foto (privado)
+    _foto_verificada : bool
+        Si la foto actual en disco ya se comprobó que está sana (privado)
+    _carga_perezosa : bool
+        Si cargar_inventario retorna un inventario perezoso (privado)
+    _almacen : str
+        Almacén de productos de los inventarios que se cargan (privado)
+    _foto_binaria : bool
+        Si junto a cada foto JSON se escribe también la foto binaria (privado)
+    _ruta_binaria : str
+        Ruta de la foto binaria (<archivo>.bin) (privado)
+
+    Modo diario:
+    ------------
+    Con modo_diario=True el archivo JSON funciona como una "foto" (snapshot)
+    y cada guardado solo AGREGA los cambios nuevos a un archivo de diario
+    (inventario_agrocol.json.log). Al cargar se lee la foto y se vuelven a
+    aplicar los cambios del diario.
+
+    Cuando el diario supera max_bytes_diario o max_registros_diario, se
+    compacta en un hilo aparte: la foto y el diario se juntan en una foto
+    nueva, así el tiempo de carga queda acotado a "leer la foto + aplicar
+    un diario corto" y la interfaz no se congela mientras tanto.
+
+    Backend SQLite:
+    ---------------
+    Si el archivo termina en .db, .sqlite o .sqlite3 (o se pasa
+    backend='sqlite'), el inventario se guarda en tablas de SQLite y cada
+    guardado solo escribe las filas que cambiaron. En ese caso el modo
+    diario no se usa, porque SQLite ya escribe de forma incremental.
+
+    Guardado seguro:
+    ----------------
+    La foto nunca se escribe encima del archivo bueno. Se escribe en un
+    archivo temporal, se sincroniza con fsync y recién entonces se renombra
+    con os.replace() (operación atómica). La foto que había antes se
+    conserva como <archivo>.anterior.
+
+    Junto a cada foto se guarda un archivo de verificación <archivo>.chk con
+    su tamaño en bytes y su CRC32. Al cargar, si el tamaño o el CRC no
+    coinciden (archivo cortado o dañado) se usa la copia anterior.
+
+    Foto binaria:
+    -------------
+    Con foto_binaria=True, cada vez que se escribe la foto JSON se escribe
+    también <archivo>.bin (ver FotoBinaria), que las terminales de solo
+    consulta abren con abrir_foto_binaria(). Igual que la foto JSON, en modo
+    diario no incluye los cambios que todavía están solo en el diario (su
+    propiedad 'secuencia' indica hasta qué cambio llega).
     """
 
-    def __init__(self, archivo: str = "inventario_agrocol.json"):
+    # Extensiones de archivo que seleccionan el backend SQLite
+    EXTENSIONES_SQLITE = ('.db', '.sqlite', '.sqlite3')
+
+    # Perfiles de salida del archivo JSON:
+    # - legible : con sangría (indent=4), fácil de leer para una persona
+    # - compacto: sin espacios ni saltos de línea (menos bytes)
+    # - gzip    : compacto y además comprimido con gzip (.json.gz)
+    FORMATOS = ('legible', 'compacto', 'gzip')
+
+    # Los archivos gzip siempre empiezan con estos dos bytes ("número mágico")
+    CABECERA_GZIP = b'\x1f\x8b'
+
+    # Extensiones de los archivos auxiliares de la foto
+    EXTENSION_ANTERIOR = ".anterior"      # Copia buena anterior
+    EXTENSION_VERIFICACION = ".chk"       # Tamaño y CRC32 de la foto
+    EXTENSION_BINARIA = ".bin"            # Foto binaria por columnas
+
+    def __init__(self, archivo: str = "inventario_agrocol.json",
+                 modo_diario: bool = False, registros_por_fsync: int = 1,
+                 max_bytes_diario: int = 4 * 1024 * 1024,
+                 max_registros_diario: int = 20000,
+                 backend: Optional[str] = None, consultas_sql: bool = False,
+                 formato: Optional[str] = None, carga_perezosa: bool = False,
+                 foto_binaria: bool = False, almacen: str = 'diccionario'):
         """
         Constructor de la clase GestorPersistencia
         =========================================
@@ -55,11 +161,48 @@ class GestorPersistencia:
         archivo : str, opcional
             Nombre del archivo JSON donde se guardará el inventario.
             Por defecto: "inventario_agrocol.json"
+        modo_diario : bool, opcional
+            Si es True, los guardados agregan solo los cambios a un diario
+            en lugar de reescribir el archivo completo. Por defecto False
+        registros_por_fsync : int, opcional
+            En modo diario, cada cuántos registros se sincroniza el disco.
+            Por defecto 1 (cada guardado se sincroniza como un grupo)
+        max_bytes_diario : int, opcional
+            Tamaño en bytes del diario que dispara la compactación. Por defecto 4 MB
+        max_registros_diario : int, opcional
+            Cantidad de registros que dispara la compactación. Por defecto 20000
+        backend : str, opcional
+            'json' o 'sqlite'. Si es None (por defecto) se elige según la
+            extensión del archivo
+        consultas_sql : bool, opcional
+            Con el backend SQLite, si es True las consultas de stock bajo y
+            por proveedor del inventario cargado se resuelven con SQL
+        formato : str, opcional
+            Perfil de escritura del JSON: 'legible', 'compacto' o 'gzip'.
+            Si es None se usa 'gzip' para archivos .gz y 'legible' para el
+            resto. Al cargar, el formato se detecta solo.
+        carga_perezosa : bool, opcional
+            Si es True, el inventario cargado (desde JSON o SQLite) guarda
+            resúmenes livianos y crea cada Producto solo cuando se usa (ver
+            Inventario(perezoso=True)). Por defecto False
+        foto_binaria : bool, opcional
+            Si es True, cada foto JSON se acompaña de una foto binaria
+            (<archivo>.bin) para terminales de solo consulta. Por defecto False
+        almacen : str, opcional
+            Almacén de productos del inventario cargado (desde JSON o
+            SQLite): 'diccionario' (por defecto) o 'columnar' (ver Inventario)
+
+        Excepciones:
+        ------------
+        ValueError : Si el backend, el formato o el almacén indicado no existe
 
         Ejemplo de uso:
         ---------------
         >>> gestor = GestorPersistencia()  # Usa el archivo por defecto
         >>> gestor2 = GestorPersistencia("mi_inventario.json")  # Usa archivo personalizado
+        >>> gestor3 = GestorPersistencia(modo_diario=True)  # Guardados incrementales
+        >>> gestor4 = GestorPersistencia("inventario_agrocol.db")  # Base de datos SQLite
+        >>> gestor5 = GestorPersistencia("inventario_agrocol.json.gz")  # JSON comprimido
         """
         # Guardar el nombre del archivo
         self._archivo = archivo
@@ -69,6 +212,51 @@ class GestorPersistencia:
         # os.path.join() une rutas de forma segura según el sistema operativo
         self._ruta_completa = os.path.join(os.getcwd(), archivo)
 
+        # Elegir el backend según el parámetro o la extensión del archivo
+        if backend is None:
+            extension = os.path.splitext(archivo)[1].lower()
+            backend = 'sqlite' if extension in self.EXTENSIONES_SQLITE else 'json'
+        if backend not in ('json', 'sqlite'):
+            raise ValueError(f"Backend de persistencia desconocido: {backend}")
+
+        self._sqlite: Optional[BackendSQLite] = None
+        if backend == 'sqlite':
+            self._sqlite = BackendSQLite(self._ruta_completa)
+        self._consultas_sql = consultas_sql
+
+        # Elegir el perfil de salida del JSON
+        if formato is None:
+            formato = 'gzip' if archivo.lower().endswith('.gz') else 'legible'
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato de archivo desconocido: {formato}")
+        self._formato = formato
+        self._carga_perezosa = carga_perezosa
+        if almacen not in Inventario.ALMACENES:
+            raise ValueError(f"Almacén de productos desconocido: {almacen}")
+        self._almacen = almacen
+        self._foto_binaria = foto_binaria
+        self._ruta_binaria = self._ruta_completa + self.EXTENSION_BINARIA
+
+        # Diario de cambios: solo existe en modo diario (y con backend JSON)
+        self._diario: Optional[DiarioCambios] = None
+        if modo_diario and self._sqlite is None:
+            self._diario = DiarioCambios(self._ruta_completa + ".log", registros_por_fsync)
+
+        # Control del estado sincronizado con el disco
+        self._secuencia = 0
+        self._secuencia_foto = 0
+        self._inventario_sincronizado: Optional[Inventario] = None
+
+        # Configuración y estado de la compactación del diario
+        self._max_bytes_diario = max_bytes_diario
+        self._max_registros_diario = max_registros_diario
+        self._hilo_compactacion: Optional[threading.Thread] = None
+        self._candado_foto = threading.Lock()
+
+        # Guardado seguro: copia anterior y estado de la foto en disco
+        self._ruta_anterior = self._ruta_completa + self.EXTENSION_ANTERIOR
+        self._foto_verificada = False
+
     # ==================== PROPIEDADES ====================
 
     @property
@@ -93,6 +281,342 @@ class GestorPersistencia:
         """
         return self._ruta_completa
 
+    @property
+    def modo_diario(self) -> bool:
+        """
+        Indica si el gestor trabaja en modo diario
+
+        Retorna:
+        --------
+        bool : True si los guardados son incrementales
+        """
+        return self._diario is not None
+
+    @property
+    def formato(self) -> str:
+        """
+        Getter del perfil de salida del archivo JSON
+
+        Retorna:
+        --------
+        str : 'legible', 'compacto' o 'gzip'
+        """
+        return self._formato
+
+    # ==================== CONVERSIÓN A BYTES Y DESDE BYTES ====================
+
+    def _serializar(self, datos: dict) -> bytes:
+        """
+        Convierte el diccionario en los bytes del archivo según el perfil (privado)
+        ==========================================================================
+
+        Parámetros:
+        -----------
+        datos : dict
+            Diccionario a guardar
+
+        Retorna:
+        --------
+        bytes : Contenido del archivo
+        """
+        if self._formato == 'legible':
+            # indent=4 formatea el JSON con sangría para que sea legible
+            texto = json.dumps(datos, ensure_ascii=False, indent=4)
+            return texto.encode('utf-8')
+
+        # separators=(',', ':') quita los espacios después de comas y dos puntos
+        texto = json.dumps(datos, ensure_ascii=False, separators=(',', ':'))
+        contenido = texto.encode('utf-8')
+        if self._formato == 'gzip':
+            # mtime=0 hace que el mismo contenido produzca los mismos bytes
+            contenido = gzip.compress(contenido, compresslevel=6, mtime=0)
+        return contenido
+
+    def _leer_inventario(self, ruta: str,
+                         perezoso: Optional[bool] = None) -> tuple[Inventario, int]:
+        """
+        Lee un archivo de inventario registro por registro (privado)
+        ===========================================================
+        No depende de la extensión ni del perfil configurado: si el archivo
+        empieza con la cabecera de gzip se descomprime mientras se lee, si no
+        se lee tal cual. Así se puede cambiar de perfil sin convertir los
+        archivos existentes.
+
+        El archivo se recorre por bloques con LectorFlujoJSON: cada producto y
+        proveedor pasa directo al inventario, sin armar antes el diccionario
+        completo del archivo (ver lector_flujo.py).
+
+        El tamaño se compara con el archivo de verificación (.chk) antes de
+        empezar, y el CRC32 se calcula en la misma pasada de lectura.
+
+        Parámetros:
+        -----------
+        ruta : str
+            Ruta del archivo a leer
+        perezoso : bool, opcional
+            Si el inventario leído es perezoso. None usa la configuración
+            del gestor (carga_perezosa)
+
+        Retorna:
+        --------
+        tuple[Inventario, int] : Inventario leído y secuencia del diario
+                                 incluida en la foto (0 si no tiene)
+
+        Excepciones:
+        ------------
+        ValueError : Si el archivo no coincide con su verificación o no es
+                     un JSON válido
+        """
+        verificacion = self._leer_verificacion(ruta)
+
+        # Comprobación rápida: el tamaño se conoce sin leer el archivo
+        if verificacion is not None and os.path.getsize(ruta) != verificacion['bytes']:
+            raise ValueError(f"el tamaño de {os.path.basename(ruta)} no coincide "
+                             f"con su verificación (archivo incompleto)")
+
+        if perezoso is None:
+            perezoso = self._carga_perezosa
+        inventario = Inventario(perezoso=perezoso, almacen=self._almacen)
+        secuencia = 0
+
+        # 'rb' = leer en binario (bytes), necesario para detectar gzip
+        with open(ruta, 'rb') as crudo:
+            comprimido = crudo.read(2) == self.CABECERA_GZIP
+            crudo.seek(0)
+
+            # Cadena de lectura: archivo -> CRC32 -> (gzip) -> texto UTF-8
+            verificado = ArchivoVerificado(crudo)
+            binario = io.BufferedReader(verificado)
+            if comprimido:
+                binario = gzip.GzipFile(fileobj=binario, mode='rb')
+            texto = io.TextIOWrapper(binario, encoding='utf-8')
+
+            for evento, valor in LectorFlujoJSON(texto).eventos():
+                if evento == 'proveedor':
+                    inventario.incorporar_proveedor_dict(valor)
+                elif evento == 'producto':
+                    inventario.incorporar_producto_dict(valor)
+                elif evento == 'secuencia':
+                    secuencia = valor
+
+            # Terminar de leer lo que quede para completar el CRC32
+            verificado.leer_resto()
+
+        if verificacion is not None and verificado.crc32 != verificacion['crc32']:
+            raise ValueError(f"el CRC32 de {os.path.basename(ruta)} no coincide "
+                             f"con su verificación (archivo dañado)")
+
+        return inventario, secuencia
+
+    # ==================== ESCRITURA SEGURA DE LA FOTO ====================
+
+    def _escribir_temporal(self, contenido: bytes, ruta_temporal: str) -> None:
+        """
+        Escribe el contenido en un archivo temporal y lo sincroniza (privado)
+        ====================================================================
+
+        Parámetros:
+        -----------
+        contenido : bytes
+            Contenido completo de la foto
+        ruta_temporal : str
+            Ruta del archivo temporal (en la misma carpeta que la foto)
+        """
+        with open(ruta_temporal, 'wb') as archivo:
+            archivo.write(contenido)
+            archivo.flush()
+            # fsync: asegura que los bytes están en el disco antes de renombrar
+            os.fsync(archivo.fileno())
+
+    def _reemplazar_foto(self, ruta_temporal: str, contenido: bytes) -> None:
+        """
+        Instala el archivo temporal como foto nueva (privado)
+        ====================================================
+        Debe llamarse con _candado_foto tomado.
+
+        Orden de los pasos:
+        1. La foto actual (si está sana) pasa a ser <archivo>.anterior
+        2. El temporal se renombra como foto (os.replace es atómico)
+        3. Se escribe la verificación (.chk) de la foto nueva
+
+        Si la aplicación se cierra entre dos pasos, al cargar siempre queda
+        una foto sana: la nueva o la anterior.
+
+        Parámetros:
+        -----------
+        ruta_temporal : str
+            Archivo temporal ya escrito y sincronizado
+        contenido : bytes
+            Contenido del temporal (para calcular su verificación)
+        """
+        # PASO 1: Conservar la foto actual como copia anterior, pero solo si
+        # está sana (nunca se pisa una copia buena con un archivo dañado)
+        if os.path.exists(self._ruta_completa) and self._foto_actual_sana():
+            os.replace(self._ruta_completa, self._ruta_anterior)
+            ruta_chk = self._ruta_completa + self.EXTENSION_VERIFICACION
+            if os.path.exists(ruta_chk):
+                os.replace(ruta_chk, self._ruta_anterior + self.EXTENSION_VERIFICACION)
+
+        # PASO 2: Renombrar el temporal como foto
+        os.replace(ruta_temporal, self._ruta_completa)
+
+        # PASO 3: Guardar tamaño y CRC32 de la foto nueva
+        self._escribir_verificacion(self._ruta_completa, contenido)
+        self._sincronizar_carpeta()
+        self._foto_verificada = True
+
+    def _escribir_binaria_temporal(self, datos: dict, sufijo: str) -> Optional[str]:
+        """
+        Escribe la foto binaria en un archivo temporal, si está activada (privado)
+
+        Parámetros:
+        -----------
+        datos : dict
+            Diccionario de la foto (el mismo que se escribe en JSON)
+        sufijo : str
+            Sufijo del archivo temporal (".tmp" o ".compactando")
+
+        Retorna:
+        --------
+        str | None : Ruta del temporal, o None si no hay foto binaria
+        """
+        if not self._foto_binaria:
+            return None
+        ruta_temporal = self._ruta_binaria + sufijo
+        self._escribir_temporal(FotoBinaria.serializar(datos), ruta_temporal)
+        return ruta_temporal
+
+    def _reemplazar_binaria(self, ruta_temporal: Optional[str]) -> None:
+        """
+        Instala la foto binaria temporal (privado)
+        =========================================
+        Debe llamarse con _candado_foto tomado, justo después de
+        _reemplazar_foto. Las terminales que ya tenían abierta la foto
+        anterior la siguen viendo completa hasta que la vuelvan a abrir.
+
+        Parámetros:
+        -----------
+        ruta_temporal : str | None
+            Temporal ya escrito, o None si no hay foto binaria
+        """
+        if ruta_temporal is not None:
+            os.replace(ruta_temporal, self._ruta_binaria)
+
+    def _foto_actual_sana(self) -> bool:
+        """
+        Indica si la foto que hay en disco está completa y sin daños (privado)
+
+        Si ya se cargó o se escribió en esta sesión no se vuelve a leer.
+
+        Retorna:
+        --------
+        bool : True si la foto coincide con su verificación
+        """
+        if self._foto_verificada:
+            return True
+        try:
+            # Perezoso: solo interesa que se pueda leer, no los productos
+            self._leer_inventario(self._ruta_completa, perezoso=True)
+            return True
+        except (ValueError, OSError):
+            return False
+
+    def _leer_verificacion(self, ruta: str) -> Optional[dict]:
+        """
+        Lee el archivo de verificación (.chk) de una foto (privado)
+
+        Parámetros:
+        -----------
+        ruta : str
+            Ruta de la foto
+
+        Retorna:
+        --------
+        dict | None : {'bytes': ..., 'crc32': ...} o None si no hay
+                      verificación (archivos guardados por versiones anteriores)
+        """
+        ruta_chk = ruta + self.EXTENSION_VERIFICACION
+        if not os.path.exists(ruta_chk):
+            return None
+        try:
+            with open(ruta_chk, 'r', encoding='utf-8') as archivo:
+                verificacion = json.load(archivo)
+            return {'bytes': int(verificacion['bytes']), 'crc32': int(verificacion['crc32'])}
+        except (ValueError, KeyError, TypeError):
+            # Una verificación ilegible no sirve para comprobar nada
+            return None
+
+    def _escribir_verificacion(self, ruta: str, contenido: bytes) -> None:
+        """
+        Escribe el archivo de verificación (.chk) de una foto (privado)
+
+        También se escribe en un temporal y se renombra, para que nunca
+        quede a medio escribir.
+
+        Parámetros:
+        -----------
+        ruta : str
+            Ruta de la foto
+        contenido : bytes
+            Contenido de la foto
+        """
+        ruta_chk = ruta + self.EXTENSION_VERIFICACION
+        verificacion = {'bytes': len(contenido), 'crc32': zlib.crc32(contenido)}
+        texto = json.dumps(verificacion, separators=(',', ':'))
+        self._escribir_temporal(texto.encode('utf-8'), ruta_chk + ".tmp")
+        os.replace(ruta_chk + ".tmp", ruta_chk)
+
+    def _sincronizar_carpeta(self) -> None:
+        """
+        Sincroniza la carpeta de la foto para que los renombres sean
+        permanentes (privado). En Windows no se puede abrir una carpeta,
+        así que allí simplemente no se hace nada.
+        """
+        try:
+            descriptor = os.open(os.path.dirname(self._ruta_completa), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(descriptor)
+
+    def _leer_foto(self) -> tuple[Inventario, int]:
+        """
+        Lee la foto y, si está dañada, la copia anterior (privado)
+        =========================================================
+
+        Retorna:
+        --------
+        tuple[Inventario, int] : Inventario de la foto sana más reciente y
+                                 la secuencia del diario que incluye
+
+        Excepciones:
+        ------------
+        ValueError : Si ni la foto ni la copia anterior se pueden leer
+        """
+        error = None
+        for ruta in (self._ruta_completa, self._ruta_anterior):
+            if not os.path.exists(ruta):
+                continue
+            try:
+                resultado = self._leer_inventario(ruta)
+            except (ValueError, KeyError, TypeError, OSError) as e:
+                # ValueError incluye JSON mal formado; OSError, gzip dañado;
+                # KeyError/TypeError, registros sin los campos esperados
+                print(f"No se pudo leer {os.path.basename(ruta)}: {str(e)}")
+                error = e
+                continue
+
+            self._foto_verificada = ruta == self._ruta_completa
+            if not self._foto_verificada:
+                print(f"Se cargó la copia anterior: {os.path.basename(ruta)}")
+            return resultado
+
+        raise ValueError(f"No hay ninguna foto sana del inventario ({error})")
+
     # ==================== MÉTODO PRINCIPAL: GUARDAR ====================
 
     def guardar_inventario(self, inventario: Inventario) -> bool:
@@ -103,6 +627,10 @@ class GestorPersistencia:
         Este método convierte el objeto Inventario a un diccionario y luego
         lo guarda en formato JSON en el archivo especificado.
 
+        Internamente usa las tres fases del guardado (preparar, ejecutar y
+        confirmar) una detrás de otra, en el mismo hilo. Para guardar sin
+        bloquear la interfaz ver TrabajadorGuardado.
+
         Parámetros:
         -----------
         inventario : Inventario
@@ -117,9 +645,10 @@ class GestorPersistencia:
         Proceso:
         --------
         1. Convertir el inventario a diccionario usando to_dict()
-        2. Abrir el archivo en modo escritura ('w')
-        3. Usar json.dump() para escribir el diccionario como JSON
-        4. Retornar True si todo salió bien
+        2. Convertirlo a bytes según el perfil (legible, compacto o gzip)
+        3. Escribirlos en un archivo temporal y sincronizarlo (fsync)
+        4. Reemplazar la foto con el temporal (os.replace, atómico)
+        5. Retornar True si todo salió bien
 
         Ejemplo:
         --------
@@ -129,19 +658,22 @@ class GestorPersistencia:
         ...     print("Inventario guardado exitosamente")
         """
         try:
-            # PASO 1: Convertir el inventario a un diccionario
-            datos = inventario.to_dict()
-
-            # PASO 2: Abrir el archivo en modo escritura
-            # 'w' = write (escritura, crea o sobrescribe el archivo)
-            # encoding='utf-8' = permite caracteres especiales (tildes, ñ, etc.)
-            with open(self._ruta_completa, 'w', encoding='utf-8') as archivo:
-                # PASO 3: Guardar el diccionario como JSON
-                # ensure_ascii=False permite caracteres no ASCII (español)
-                # indent=4 formatea el JSON con sangría para que sea legible
-                json.dump(datos, archivo, ensure_ascii=False, indent=4)
-
-            # PASO 4: Si llegamos aquí, todo salió bien
+            # FASE 1: Tomar una copia de lo que hay que guardar
+            tarea = self.preparar_guardado(inventario)
+            if tarea is None:
+                # No hay nada nuevo que escribir
+                return True
+
+            # FASE 2: Escribir en disco
+            try:
+                self.ejecutar_guardado(tarea)
+            except Exception:
+                # Los cambios siguen pendientes para el próximo intento
+                self.cancelar_guardado(tarea)
+                raise
+
+            # FASE 3: Dar por guardados los cambios incluidos
+            self.confirmar_guardado(tarea)
             return True
 
         except Exception as e:
@@ -149,6 +681,158 @@ class GestorPersistencia:
             print(f"Error al guardar el inventario: {str(e)}")
             return False
 
+    # ==================== GUARDADO EN TRES FASES ====================
+
+    def preparar_guardado(self, inventario: Inventario) -> Optional[dict]:
+        """
+        FASE 1: Toma una copia de todo lo que hay que escribir
+        ======================================================
+        Debe llamarse desde el hilo que modifica el inventario (la interfaz).
+        La "tarea" retornada solo contiene datos simples (diccionarios,
+        listas, tuplas) que ya no dependen del inventario, así que puede
+        escribirse desde otro hilo mientras el usuario sigue trabajando.
+
+        Los cambios pendientes incluidos quedan sellados (ver
+        Inventario.sellar_cambios) hasta confirmar o cancelar la tarea.
+
+        Tipos de tarea:
+        ---------------
+        - 'sqlite': filas para UPSERT/DELETE en la base de datos
+        - 'diario': registros numerados para agregar al diario
+        - 'foto'  : diccionario completo para escribir una foto nueva
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario que se desea guardar
+
+        Retorna:
+        --------
+        dict | None : Tarea de guardado, o None si no hay nada que escribir
+        """
+        incremental = inventario is self._inventario_sincronizado
+
+        # Con backend SQLite solo se escriben las filas afectadas
+        if self._sqlite is not None:
+            if incremental and not inventario.hay_cambios_pendientes():
+                return None
+            filas = self._sqlite.preparar_filas(inventario, incremental=incremental)
+            return {'tipo': 'sqlite', 'inventario': inventario,
+                    'cantidad': inventario.sellar_cambios(), 'filas': filas}
+
+        # En modo diario, si el inventario es el mismo que está en disco,
+        # basta con agregar los cambios nuevos al diario
+        if self._diario is not None and incremental and self.existe_archivo():
+            cambios = inventario.obtener_cambios_pendientes()
+            if not cambios:
+                return None
+
+            # Numerar los registros a partir de la última secuencia usada.
+            # Cada cambio recibe un número de secuencia: así, si la aplicación
+            # se cierra a mitad de una operación, al cargar se sabe qué cambios
+            # ya están incluidos en la foto y cuáles hay que volver a aplicar.
+            registros = []
+            for numero, cambio in enumerate(cambios, start=self._secuencia + 1):
+                registro = {'s': numero}
+                registro.update(cambio)
+                registros.append(registro)
+            self._secuencia += len(registros)
+
+            return {'tipo': 'diario', 'inventario': inventario,
+                    'cantidad': inventario.sellar_cambios(), 'registros': registros}
+
+        # Foto completa: convertir el inventario a un diccionario
+        datos = inventario.to_dict()
+        if self._diario is not None:
+            # Guardar también hasta qué cambio del diario incluye esta foto
+            datos['secuencia'] = self._secuencia
+
+        return {'tipo': 'foto', 'inventario': inventario,
+                'cantidad': inventario.sellar_cambios(), 'datos': datos,
+                'secuencia': self._secuencia}
+
+    def ejecutar_guardado(self, tarea: dict) -> None:
+        """
+        FASE 2: Escribe la tarea en disco
+        =================================
+        Puede llamarse desde cualquier hilo: no toca el inventario.
+
+        Parámetros:
+        -----------
+        tarea : dict
+            Tarea retornada por preparar_guardado()
+
+        Excepciones:
+        ------------
+        Exception : Cualquier error de escritura se propaga a quien llama
+        """
+        if tarea['tipo'] == 'sqlite':
+            self._sqlite.escribir_filas(tarea['filas'])
+            return
+
+        if tarea['tipo'] == 'diario':
+            self._diario.agregar(tarea['registros'])
+            return
+
+        # PASO 1: Convertir el diccionario a bytes según el perfil
+        contenido = self._serializar(tarea['datos'])
+
+        # PASO 2: Escribir un archivo temporal; la foto actual no se toca
+        # hasta que el temporal esté completo en el disco
+        ruta_temporal = self._ruta_completa + ".tmp"
+        self._escribir_temporal(contenido, ruta_temporal)
+        ruta_binaria_temporal = self._escribir_binaria_temporal(tarea['datos'], ".tmp")
+
+        # PASO 3: Reemplazar la foto de forma atómica
+        # El candado evita chocar con una compactación en segundo plano
+        with self._candado_foto:
+            self._reemplazar_foto(ruta_temporal, contenido)
+            self._reemplazar_binaria(ruta_binaria_temporal)
+
+            # PASO 4: La foto ya incluye todos los cambios, el diario sobra
+            if self._diario is not None:
+                self._diario.truncar()
+            self._secuencia_foto = tarea['secuencia']
+
+    def confirmar_guardado(self, tarea: dict) -> None:
+        """
+        FASE 3: Da por guardados los cambios incluidos en la tarea
+        ==========================================================
+        Debe llamarse desde el hilo que modifica el inventario, después de
+        que ejecutar_guardado() terminó sin errores. Los cambios que
+        llegaron mientras se escribía siguen pendientes.
+
+        Parámetros:
+        -----------
+        tarea : dict
+            Tarea ya escrita en disco
+        """
+        inventario = tarea['inventario']
+        inventario.confirmar_cambios_guardados(tarea['cantidad'])
+        self._inventario_sincronizado = inventario
+
+        if tarea['tipo'] == 'sqlite' and self._consultas_sql:
+            inventario.establecer_motor_consultas(self._sqlite)
+
+        # Si el diario creció demasiado, compactarlo sin bloquear la interfaz
+        if tarea['tipo'] == 'diario' and self._diario_excede_limite():
+            self.compactar()
+
+    def cancelar_guardado(self, tarea: dict) -> None:
+        """
+        Descarta una tarea que no se pudo escribir
+        ==========================================
+        Los cambios incluidos siguen pendientes y se vuelven a intentar en el
+        próximo guardado. Debe llamarse desde el hilo que modifica el
+        inventario.
+
+        Parámetros:
+        -----------
+        tarea : dict
+            Tarea cuya escritura falló
+        """
+        tarea['inventario'].liberar_cambios_sellados()
+
     # ==================== MÉTODO PRINCIPAL: CARGAR ====================
 
     def cargar_inventario(self) -> Optional[Inventario]:
@@ -167,9 +851,9 @@ class GestorPersistencia:
 
         Proceso:
         --------
-        1. Verificar si el archivo existe
+        1. Verificar si el archivo (o su copia anterior) existe
         2. Si no existe, crear uno nuevo vacío
-        3. Si existe, leer el archivo JSON
+        3. Si existe, leer el archivo JSON; si está dañado, la copia anterior
         4. Convertir el JSON a objeto Inventario usando from_dict()
         5. Retornar el inventario cargado
 
@@ -181,22 +865,49 @@ class GestorPersistencia:
         ...     print(f"Productos cargados: {inventario.obtener_cantidad_total_productos()}")
         """
         try:
+            # Con backend SQLite, la base de datos se crea si no existe
+            if self._sqlite is not None:
+                inventario = self._sqlite.cargar(perezoso=self._carga_perezosa,
+                                                 almacen=self._almacen)
+                self._inventario_sincronizado = inventario
+                if self._consultas_sql:
+                    inventario.establecer_motor_consultas(self._sqlite)
+                return inventario
+
             # PASO 1: Verificar si el archivo existe
-            if not os.path.exists(self._ruta_completa):
+            # (si solo queda la copia anterior, se carga esa)
+            if (not os.path.exists(self._ruta_completa)
+                    and not os.path.exists(self._ruta_anterior)):
                 # Si no existe, crear un inventario nuevo vacío
                 print("Archivo no encontrado. Creando nuevo inventario...")
-                inventario_nuevo = Inventario()
+                inventario_nuevo = Inventario(perezoso=self._carga_perezosa,
+                                              almacen=self._almacen)
                 self.guardar_inventario(inventario_nuevo)
                 return inventario_nuevo
 
-            # PASO 2: Abrir y leer el archivo JSON
-            # 'r' = read (lectura)
-            with open(self._ruta_completa, 'r', encoding='utf-8') as archivo:
-                # Cargar el contenido JSON como diccionario Python
-                datos = json.load(archivo)
+            # PASO 2 y 3: Leer el archivo JSON (comprimido o no) registro por
+            # registro y armar el Inventario directamente, o leer la copia
+            # anterior si el archivo está incompleto o dañado
+            inventario, self._secuencia = self._leer_foto()
+            self._secuencia_foto = self._secuencia
+
+            # PASO 4: En modo diario, volver a aplicar los cambios posteriores
+            if self._diario is not None:
+                self._reproducir_diario(inventario)
 
-            # PASO 3: Convertir el diccionario a objeto Inventario
-            return Inventario.from_dict(datos)
+                # Si quedó un segmento sin compactar (cierre inesperado) o el
+                # diario es muy largo, compactar para que la próxima carga sea corta
+                if self._foto_verificada and (self._diario.hay_segmento_rotado()
+                                              or self._diario_excede_limite()):
+                    self.compactar()
+
+            # Si se usó la copia anterior, el próximo guardado debe escribir
+            # una foto completa para reparar el archivo dañado
+            if self._foto_verificada:
+                self._inventario_sincronizado = inventario
+            else:
+                self._inventario_sincronizado = None
+            return inventario
 
         except json.JSONDecodeError as e:
             # Error específico: el archivo JSON está mal formado
@@ -208,6 +919,194 @@ class GestorPersistencia:
             print(f"Error al cargar el inventario: {str(e)}")
             return None
 
+    def _reproducir_diario(self, inventario: Inventario) -> None:
+        """
+        Aplica sobre el inventario los cambios guardados en el diario (privado)
+        ======================================================================
+        Solo se aplican los registros con secuencia mayor a la de la foto,
+        porque los anteriores ya están incluidos en ella.
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario recién cargado desde la foto
+        """
+        secuencia_foto = self._secuencia
+        for registro in self._diario.leer():
+            numero = registro.get('s', 0)
+            if numero <= secuencia_foto:
+                continue
+            try:
+                inventario.aplicar_cambio(registro)
+            except (ValueError, KeyError) as e:
+                print(f"Diario: no se pudo aplicar el registro {numero}: {str(e)}")
+            self._secuencia = max(self._secuencia, numero)
+
+    # ==================== COMPACTACIÓN DEL DIARIO ====================
+
+    def _diario_excede_limite(self) -> bool:
+        """
+        Indica si el diario superó alguno de los límites de compactación
+
+        Retorna:
+        --------
+        bool : True si hay que compactar
+        """
+        return (self._diario.cantidad_registros >= self._max_registros_diario
+                or self._diario.tamano_bytes() >= self._max_bytes_diario)
+
+    def compactar(self, en_segundo_plano: bool = True) -> bool:
+        """
+        Junta la foto y el diario en una foto nueva
+        ===========================================
+        El diario actual se rota (se renombra, es instantáneo) y un hilo
+        aparte lee la foto del disco, le aplica el segmento rotado y escribe
+        la foto nueva. El inventario en memoria no se toca, por lo que la
+        interfaz puede seguir trabajando y agregando cambios al diario nuevo.
+
+        Parámetros:
+        -----------
+        en_segundo_plano : bool, opcional
+            Si es True (por defecto) la compactación corre en un hilo aparte.
+            Con False se ejecuta en el hilo actual y termina antes de retornar.
+
+        Retorna:
+        --------
+        bool : True si se inició la compactación, False si no hacía falta
+               o ya había una en curso
+
+        Ejemplo:
+        --------
+        >>> gestor = GestorPersistencia(modo_diario=True)
+        >>> gestor.compactar(en_segundo_plano=False)
+        """
+        if self._diario is None or not self.existe_archivo():
+            return False
+        if self._hilo_compactacion is not None and self._hilo_compactacion.is_alive():
+            return False
+
+        # Si ya hay un segmento rotado (compactación interrumpida) se reutiliza
+        if not self._diario.hay_segmento_rotado() and not self._diario.rotar():
+            return False
+
+        if not en_segundo_plano:
+            self._compactar_segmento_rotado()
+            return True
+
+        # daemon=True: el hilo no impide cerrar el programa. Si se corta a la
+        # mitad no pasa nada, porque la foto se reemplaza de forma atómica
+        self._hilo_compactacion = threading.Thread(
+            target=self._compactar_segmento_rotado, name="compactacion-diario", daemon=True)
+        self._hilo_compactacion.start()
+        return True
+
+    def _compactar_segmento_rotado(self) -> None:
+        """
+        Escribe una foto nueva con la foto actual + el segmento rotado (privado)
+        =======================================================================
+        Trabaja solo con archivos, nunca con el inventario que usa la interfaz.
+        """
+        try:
+            # PASO 1: Leer la foto actual desde el disco
+            # (perezoso: la compactación solo vuelve a escribir los datos)
+            inventario, secuencia_inicial = self._leer_inventario(self._ruta_completa,
+                                                                  perezoso=True)
+
+            # PASO 2: Aplicar los registros del segmento rotado
+            secuencia = secuencia_inicial
+            for registro in self._diario.leer_rotado():
+                numero = registro.get('s', 0)
+                if numero <= secuencia:
+                    continue
+                try:
+                    inventario.aplicar_cambio(registro)
+                except (ValueError, KeyError) as e:
+                    print(f"Compactación: no se pudo aplicar el registro {numero}: {str(e)}")
+                secuencia = numero
+
+            nuevos = inventario.to_dict()
+            nuevos['secuencia'] = secuencia
+
+            # PASO 3: Escribir la foto nueva en un archivo temporal
+            ruta_temporal = self._ruta_completa + ".compactando"
+            contenido = self._serializar(nuevos)
+            self._escribir_temporal(contenido, ruta_temporal)
+            ruta_binaria_temporal = self._escribir_binaria_temporal(nuevos, ".compactando")
+
+            # PASO 4: Reemplazar la foto y borrar el segmento ya incluido
+            with self._candado_foto:
+                # Si mientras tanto se guardó una foto completa más nueva,
+                # esta compactación ya no sirve
+                if self._secuencia_foto > secuencia_inicial:
+                    os.remove(ruta_temporal)
+                    if ruta_binaria_temporal is not None:
+                        os.remove(ruta_binaria_temporal)
+                    return
+                # os.replace() cambia el archivo de forma atómica
+                self._reemplazar_foto(ruta_temporal, contenido)
+                self._reemplazar_binaria(ruta_binaria_temporal)
+                self._diario.eliminar_rotado()
+                self._secuencia_foto = secuencia
+
+        except Exception as e:
+            # El segmento rotado se conserva y se reintenta en la próxima carga
+            print(f"Error al compactar el diario: {str(e)}")
+
+    def esperar_compactacion(self, tiempo_maximo: Optional[float] = None) -> None:
+        """
+        Espera a que termine la compactación en curso, si la hay
+        ========================================================
+
+        Parámetros:
+        -----------
+        tiempo_maximo : float, opcional
+            Segundos máximos de espera. None espera sin límite.
+        """
+        if self._hilo_compactacion is not None:
+            self._hilo_compactacion.join(tiempo_maximo)
+
+    def sincronizar(self) -> None:
+        """
+        Fuerza la escritura física en disco de los cambios del diario
+        =============================================================
+        Conviene llamarlo antes de cerrar la aplicación. Sin modo diario
+        no hace nada.
+        """
+        if self._diario is not None:
+            self._diario.sincronizar()
+
+    # ==================== FOTO BINARIA (SOLO CONSULTA) ====================
+
+    def abrir_foto_binaria(self) -> Optional[FotoBinaria]:
+        """
+        Abre la foto binaria para hacer consultas sin cargar el inventario
+        ==================================================================
+        Pensado para terminales que solo consultan: abrir la foto no lee
+        los productos, y las consultas (valor total, stock bajo...) recorren
+        las columnas del archivo sin crear objetos Producto.
+
+        Retorna:
+        --------
+        FotoBinaria | None : Foto abierta (hay que cerrarla con cerrar() o
+                             usarla con 'with'), o None si no existe o no
+                             se pudo leer
+
+        Ejemplo:
+        --------
+        >>> gestor = GestorPersistencia(foto_binaria=True)
+        >>> foto = gestor.abrir_foto_binaria()
+        >>> if foto:
+        ...     with foto:
+        ...         print(f"Valor total: ${foto.obtener_valor_total_inventario():,.2f}")
+        """
+        if not os.path.exists(self._ruta_binaria):
+            return None
+        try:
+            return FotoBinaria(self._ruta_binaria)
+        except (ValueError, OSError) as e:
+            print(f"No se pudo abrir la foto binaria: {str(e)}")
+            return None
+
     # ==================== MÉTODOS AUXILIARES ====================
 
     def existe_archivo(self) -> bool:
@@ -278,18 +1177,35 @@ class GestorPersistencia:
 
             # Construir el nombre del archivo de backup
             # Ejemplo: "inventario_agrocol" + "_backup_" + "20250113_153045" + ".json"
-            nombre_base = os.path.splitext(self._archivo)[0]  # Quita la extensión
-            nombre_backup = f"{nombre_base}_backup_{sufijo}.json"
+            nombre_base, extension = os.path.splitext(self._archivo)  # Separa la extensión
+            if nombre_base.lower().endswith('.json'):
+                # "inventario.json.gz" -> "inventario" + ".json.gz"
+                nombre_base, extension = nombre_base[:-5], nombre_base[-5:] + extension
+            nombre_backup = f"{nombre_base}_backup_{sufijo}{extension or '.json'}"
             ruta_backup = os.path.join(os.getcwd(), nombre_backup)
 
-            # Leer el contenido del archivo original
-            with open(self._ruta_completa, 'r', encoding='utf-8') as origen:
+            # Una base de datos SQLite se copia con su propia API de respaldo
+            if self._sqlite is not None:
+                self._sqlite.respaldar(ruta_backup)
+                print(f"Backup creado: {nombre_backup}")
+                return True
+
+            # Leer el contenido del archivo original (en binario, porque
+            # puede estar comprimido)
+            with open(self._ruta_completa, 'rb') as origen:
                 contenido = origen.read()
 
             # Escribir el contenido en el archivo de backup
-            with open(ruta_backup, 'w', encoding='utf-8') as destino:
+            with open(ruta_backup, 'wb') as destino:
                 destino.write(contenido)
 
+            # En modo diario la foto sola no está al día: copiar también el diario
+            if self._diario is not None and self._diario.existe():
+                with open(self._diario.ruta, 'r', encoding='utf-8') as origen:
+                    contenido_diario = origen.read()
+                with open(ruta_backup + ".log", 'w', encoding='utf-8') as destino:
+                    destino.write(contenido_diario)
+
             print(f"Backup creado: {nombre_backup}")
             return True
 
@@ -321,8 +1237,23 @@ class GestorPersistencia:
         try:
             # Verificar que el archivo exista antes de intentar eliminarlo
             if self.existe_archivo():
+                # Cerrar la base de datos antes de borrar su archivo
+                if self._sqlite is not None:
+                    self._sqlite.cerrar()
+
                 # os.remove() elimina el archivo del disco
                 os.remove(self._ruta_completa)
+                # La copia anterior y las verificaciones tampoco sirven ya
+                for ruta in (self._ruta_completa + self.EXTENSION_VERIFICACION,
+                             self._ruta_binaria,
+                             self._ruta_anterior,
+                             self._ruta_anterior + self.EXTENSION_VERIFICACION):
+                    if os.path.exists(ruta):
+                        os.remove(ruta)
+                self._foto_verificada = False
+                # El diario no sirve sin su foto: eliminarlo también
+                if self._diario is not None:
+                    self._diario.truncar()
                 print(f"Archivo eliminado: {self._archivo}")
                 return True
             else:
@@ -0,0 +1,262 @@
+"""
+Módulo planificador.py
+======================
+Archivo que contiene la clase PlanificadorGuardado para el sistema AgroCol SAS.
+
+El planificador decide CUÁNDO se guarda el inventario. En lugar de escribir
+el archivo después de cada cambio, junta varios cambios seguidos en un solo
+guardado. Por ejemplo, recibir 200 bultos en la bodega uno por uno produce
+unos pocos guardados en lugar de 200.
+
+Políticas disponibles:
+----------------------
+- inmediato: guarda después de cada cambio (comportamiento original)
+- debounce : guarda cuando pasan N milisegundos sin cambios nuevos
+- lotes    : guarda cada N cambios o cada T segundos, lo que ocurra primero
+
+En debounce y lotes nunca pasa más de max_segundos entre el primer cambio
+sin guardar y su guardado, aunque los cambios no paren de llegar.
+
+Configuración por instalación:
+------------------------------
+La política se puede escribir como texto, por ejemplo en una variable de
+entorno (ver desde_texto):
+    "inmediato"
+    "debounce:500"     (500 ms sin cambios)
+    "lotes:50:10"      (cada 50 cambios o cada 10 segundos)
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import time  # Para medir el tiempo entre cambios
+from typing import Callable, Optional  # Para anotar funciones y valores opcionales
+
+# Importar las clases del dominio y de persistencia
+from ..modelos import Inventario
+from .trabajador import TrabajadorGuardado
+
+
+class PlanificadorGuardado:
+    """
+    Clase PlanificadorGuardado
+    ==========================
+    Recibe los avisos de cambio de la interfaz y pide los guardados al
+    TrabajadorGuardado según la política elegida.
+
+    No usa hilos ni temporizadores propios: la interfaz debe llamar a
+    revisar() periódicamente (por ejemplo con root.after cada 100 ms).
+
+    Atributos:
+    ----------
+    _trabajador : TrabajadorGuardado
+        Trabajador que escribe los guardados en segundo plano (privado)
+    _politica : str
+        'inmediato', 'debounce' o 'lotes' (privado)
+    _espera : float
+        Segundos sin cambios que espera la política debounce (privado)
+    _max_cambios : int
+        Cambios que disparan un guardado en la política lotes (privado)
+    _max_segundos : float
+        Tiempo máximo que un cambio puede quedar sin guardar (privado)
+    _reloj : Callable[[], float]
+        Función que da la hora actual en segundos (privado)
+    _inventario : Inventario | None
+        Inventario con cambios que todavía no se pidió guardar (privado)
+    _cambios_sin_guardar : int
+        Cambios avisados desde el último guardado pedido (privado)
+    _primer_cambio : float
+        Hora del primer cambio sin guardar (privado)
+    _ultimo_cambio : float
+        Hora del último cambio avisado (privado)
+    """
+
+    # Políticas de guardado disponibles
+    POLITICAS = ('inmediato', 'debounce', 'lotes')
+
+    def __init__(self, trabajador: TrabajadorGuardado, politica: str = 'inmediato',
+                 espera_ms: int = 500, max_cambios: int = 50, max_segundos: float = 10.0,
+                 reloj: Callable[[], float] = time.monotonic):
+        """
+        Constructor de la clase PlanificadorGuardado
+        ============================================
+
+        Parámetros:
+        -----------
+        trabajador : TrabajadorGuardado
+            Trabajador que escribe los guardados
+        politica : str, opcional
+            'inmediato' (por defecto), 'debounce' o 'lotes'
+        espera_ms : int, opcional
+            Milisegundos sin cambios antes de guardar (política debounce)
+        max_cambios : int, opcional
+            Cantidad de cambios que dispara un guardado (política lotes)
+        max_segundos : float, opcional
+            Tiempo máximo que un cambio puede quedar sin guardar
+        reloj : función, opcional
+            Fuente de la hora actual (se puede reemplazar en pruebas)
+
+        Excepciones:
+        ------------
+        ValueError : Si la política no existe o algún valor no es positivo
+
+        Ejemplo de uso:
+        ---------------
+        >>> planificador = PlanificadorGuardado(trabajador, 'lotes', max_cambios=50)
+        """
+        if politica not in self.POLITICAS:
+            raise ValueError(f"Política de guardado desconocida: {politica}")
+        if espera_ms <= 0 or max_cambios <= 0 or max_segundos <= 0:
+            raise ValueError("Los parámetros de la política deben ser mayores a cero")
+
+        self._trabajador = trabajador
+        self._politica = politica
+        self._espera = espera_ms / 1000
+        self._max_cambios = max_cambios
+        self._max_segundos = max_segundos
+        self._reloj = reloj
+
+        self._inventario: Optional[Inventario] = None
+        self._cambios_sin_guardar = 0
+        self._primer_cambio = 0.0
+        self._ultimo_cambio = 0.0
+
+    @classmethod
+    def desde_texto(cls, trabajador: TrabajadorGuardado, texto: str) -> 'PlanificadorGuardado':
+        """
+        Crea un planificador a partir de una política escrita como texto
+        ================================================================
+
+        Formatos aceptados:
+        -------------------
+        "inmediato"
+        "debounce:<milisegundos>"
+        "lotes:<cambios>:<segundos>"
+
+        Parámetros:
+        -----------
+        trabajador : TrabajadorGuardado
+            Trabajador que escribe los guardados
+        texto : str
+            Política en formato de texto
+
+        Retorna:
+        --------
+        PlanificadorGuardado : Planificador configurado
+
+        Excepciones:
+        ------------
+        ValueError : Si el texto no tiene un formato válido
+
+        Ejemplo:
+        --------
+        >>> PlanificadorGuardado.desde_texto(trabajador, "debounce:300")
+        """
+        partes = [parte.strip() for parte in texto.strip().lower().split(':')]
+        politica = partes[0]
+
+        if politica == 'inmediato' and len(partes) == 1:
+            return cls(trabajador, 'inmediato')
+        if politica == 'debounce' and len(partes) == 2:
+            return cls(trabajador, 'debounce', espera_ms=int(partes[1]))
+        if politica == 'lotes' and len(partes) == 3:
+            return cls(trabajador, 'lotes', max_cambios=int(partes[1]),
+                       max_segundos=float(partes[2]))
+
+        raise ValueError(f"Política de guardado no válida: {texto!r}")
+
+    # ==================== PROPIEDADES ====================
+
+    @property
+    def politica(self) -> str:
+        """
+        Getter de la política de guardado
+
+        Retorna:
+        --------
+        str : 'inmediato', 'debounce' o 'lotes'
+        """
+        return self._politica
+
+    # ==================== MÉTODOS PÚBLICOS ====================
+
+    def registrar_cambio(self, inventario: Inventario) -> None:
+        """
+        Avisa que el inventario cambió y debe guardarse en algún momento
+        ================================================================
+        Con la política inmediato el guardado se pide ahora mismo; con las
+        demás se pide más tarde, desde revisar().
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario que cambió
+        """
+        ahora = self._reloj()
+        if self._cambios_sin_guardar == 0:
+            self._primer_cambio = ahora
+        self._inventario = inventario
+        self._cambios_sin_guardar += 1
+        self._ultimo_cambio = ahora
+
+        if self._politica == 'inmediato':
+            self.guardar_ahora()
+        elif self._politica == 'lotes' and self._cambios_sin_guardar >= self._max_cambios:
+            self.guardar_ahora()
+
+    def revisar(self) -> None:
+        """
+        Pide el guardado si ya se cumplió la condición de la política
+        =============================================================
+        Debe llamarse periódicamente desde el hilo de la interfaz.
+        """
+        if self._cambios_sin_guardar == 0:
+            return
+
+        ahora = self._reloj()
+        # Ningún cambio espera más de max_segundos, en ninguna política
+        if ahora - self._primer_cambio >= self._max_segundos:
+            self.guardar_ahora()
+        elif self._politica == 'debounce' and ahora - self._ultimo_cambio >= self._espera:
+            self.guardar_ahora()
+
+    def guardar_ahora(self) -> None:
+        """
+        Pide el guardado de inmediato, sin esperar a la política
+        (por ejemplo, desde el menú Archivo > Guardar)
+        """
+        if self._inventario is None:
+            return
+        inventario = self._inventario
+        self._inventario = None
+        self._cambios_sin_guardar = 0
+        self._trabajador.solicitar_guardado(inventario)
+
+    def hay_cambios_sin_guardar(self) -> bool:
+        """
+        Indica si hay cambios avisados que todavía no se pidió guardar
+
+        Retorna:
+        --------
+        bool : True si hay un guardado programado
+        """
+        return self._cambios_sin_guardar > 0
+
+    def vaciar(self, tiempo_maximo: Optional[float] = None) -> bool:
+        """
+        Pide el guardado pendiente y espera a que se escriba
+        ====================================================
+        Se usa al cerrar la aplicación para no perder los últimos cambios.
+
+        Parámetros:
+        -----------
+        tiempo_maximo : float, opcional
+            Segundos máximos de espera. None espera sin límite.
+
+        Retorna:
+        --------
+        bool : True si todo se escribió sin errores
+        """
+        self.guardar_ahora()
+        return self._trabajador.vaciar(tiempo_maximo)
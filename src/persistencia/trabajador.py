@@ -0,0 +1,263 @@
+"""
+Módulo trabajador.py
+====================
+Archivo que contiene la clase TrabajadorGuardado para el sistema AgroCol SAS.
+
+El trabajador escribe el inventario en disco desde un hilo aparte, para
+que la ventana no se congele mientras se convierte a JSON y se escribe.
+
+¿Cómo se reparte el trabajo?
+----------------------------
+Tkinter solo puede usarse desde el hilo principal, y el inventario tampoco
+está pensado para usarse desde dos hilos a la vez. Por eso el guardado se
+divide en tres fases (ver GestorPersistencia):
+
+1. preparar_guardado  -> hilo principal: copia lo que hay que escribir
+2. ejecutar_guardado  -> hilo trabajador: serializa y escribe en disco
+3. confirmar_guardado -> hilo principal: descarta los cambios ya escritos
+
+El hilo principal se entera de que el hilo trabajador terminó llamando
+periódicamente a procesar() (por ejemplo con root.after cada 100 ms).
+
+Ráfagas de guardados:
+---------------------
+Si se pide guardar varias veces mientras hay una escritura en curso, todas
+esas peticiones se juntan en UNA sola escritura al terminar la actual.
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import queue      # Colas seguras para pasar datos entre hilos
+import threading  # Para escribir en disco en segundo plano
+import time       # Para medir el tiempo máximo de espera
+from typing import Callable, Optional  # Para anotar funciones y valores opcionales
+
+# Importar las clases del dominio y de persistencia
+from ..modelos import Inventario
+from .persistencia import GestorPersistencia
+
+
+class TrabajadorGuardado:
+    """
+    Clase TrabajadorGuardado
+    ========================
+    Hilo en segundo plano que escribe los guardados del inventario.
+
+    Solo hay UNA escritura en curso a la vez; las peticiones que llegan
+    mientras tanto se juntan y se atienden cuando termina.
+
+    Atributos:
+    ----------
+    _gestor : GestorPersistencia
+        Gestor que sabe preparar, escribir y confirmar un guardado (privado)
+    _al_terminar : Callable[[bool, str | None], None] | None
+        Función que se llama (en el hilo principal) al terminar cada
+        escritura, con (exito, mensaje_de_error) (privado)
+    _tareas : queue.Queue
+        Tareas que esperan ser escritas por el hilo trabajador (privado)
+    _resultados : queue.Queue
+        Tareas ya escritas, con su error si lo hubo (privado)
+    _tarea_en_curso : dict | None
+        Tarea que el hilo trabajador está escribiendo (privado)
+    _inventario_solicitado : Inventario | None
+        Inventario con un guardado pedido que todavía no empezó (privado)
+    _hilo : threading.Thread | None
+        Hilo trabajador (se crea con el primer guardado) (privado)
+
+    Ejemplo de uso (con tkinter):
+    -----------------------------
+    >>> trabajador = TrabajadorGuardado(gestor, al_terminar=mostrar_resultado)
+    >>> trabajador.solicitar_guardado(inventario)   # No bloquea
+    >>> root.after(100, revisar)                    # revisar() llama a procesar()
+    >>> trabajador.vaciar()                         # Al salir: esperar todo
+    """
+
+    def __init__(self, gestor: GestorPersistencia,
+                 al_terminar: Optional[Callable[[bool, Optional[str]], None]] = None):
+        """
+        Constructor de la clase TrabajadorGuardado
+        ==========================================
+
+        Parámetros:
+        -----------
+        gestor : GestorPersistencia
+            Gestor de persistencia que hace el guardado
+        al_terminar : función, opcional
+            Se llama con (exito, mensaje_de_error) después de cada escritura
+        """
+        self._gestor = gestor
+        self._al_terminar = al_terminar
+        self._tareas: queue.Queue = queue.Queue()
+        self._resultados: queue.Queue = queue.Queue()
+        self._tarea_en_curso: Optional[dict] = None
+        self._inventario_solicitado: Optional[Inventario] = None
+        self._hilo: Optional[threading.Thread] = None
+
+    # ==================== MÉTODOS DEL HILO PRINCIPAL ====================
+
+    def solicitar_guardado(self, inventario: Inventario) -> None:
+        """
+        Pide guardar el inventario sin esperar a que se escriba
+        =======================================================
+        Si no hay ninguna escritura en curso, la copia de los datos se toma
+        ahora mismo y se entrega al hilo trabajador. Si ya hay una, el
+        pedido queda anotado y se atiende al terminar la actual.
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario a guardar
+        """
+        self._inventario_solicitado = inventario
+        self._despachar()
+
+    def procesar(self) -> None:
+        """
+        Atiende las escrituras terminadas (llamar periódicamente)
+        =========================================================
+        Confirma o cancela cada tarea terminada, avisa con al_terminar y,
+        si quedó un pedido anotado, empieza la siguiente escritura.
+        """
+        while True:
+            try:
+                tarea, error = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            self._terminar_tarea(tarea, error)
+
+        self._despachar()
+
+    def hay_guardado_pendiente(self) -> bool:
+        """
+        Indica si hay una escritura en curso o un pedido sin atender
+
+        Retorna:
+        --------
+        bool : True si todavía falta escribir algo que se pidió guardar
+        """
+        return self._tarea_en_curso is not None or self._inventario_solicitado is not None
+
+    def vaciar(self, tiempo_maximo: Optional[float] = None) -> bool:
+        """
+        Espera a que se escriba todo lo que se pidió guardar
+        ====================================================
+        Se usa al cerrar la aplicación: garantiza que el último guardado
+        pedido llegue al disco antes de salir.
+
+        Parámetros:
+        -----------
+        tiempo_maximo : float, opcional
+            Segundos máximos de espera. None espera sin límite.
+
+        Retorna:
+        --------
+        bool : True si todo se escribió sin errores
+        """
+        limite = None if tiempo_maximo is None else time.monotonic() + tiempo_maximo
+        todo_bien = True
+
+        while self.hay_guardado_pendiente():
+            self._despachar()
+            if self._tarea_en_curso is None:
+                # El pedido no tenía nada nuevo que escribir
+                continue
+
+            espera = None if limite is None else max(0.0, limite - time.monotonic())
+            try:
+                tarea, error = self._resultados.get(timeout=espera)
+            except queue.Empty:
+                return False
+            self._terminar_tarea(tarea, error)
+            todo_bien = todo_bien and error is None
+
+            # Si falló, no se reintenta en un bucle sin fin
+            if error is not None:
+                self._inventario_solicitado = None
+
+        return todo_bien
+
+    def detener(self) -> None:
+        """
+        Termina el hilo trabajador (después de la escritura en curso)
+        """
+        if self._hilo is not None:
+            self._tareas.put(None)
+            self._hilo.join()
+            self._hilo = None
+
+    # ==================== MÉTODOS INTERNOS ====================
+
+    def _despachar(self) -> None:
+        """
+        Empieza la siguiente escritura si no hay una en curso (privado)
+        """
+        if self._tarea_en_curso is not None or self._inventario_solicitado is None:
+            return
+
+        inventario = self._inventario_solicitado
+        self._inventario_solicitado = None
+
+        try:
+            tarea = self._gestor.preparar_guardado(inventario)
+        except Exception as e:
+            self._avisar(False, str(e))
+            return
+        if tarea is None:
+            # No había nada nuevo que escribir
+            return
+
+        self._tarea_en_curso = tarea
+        if self._hilo is None:
+            # daemon=True: el hilo no impide que el programa termine
+            self._hilo = threading.Thread(target=self._ejecutar,
+                                          name="trabajador-guardado", daemon=True)
+            self._hilo.start()
+        self._tareas.put(tarea)
+
+    def _terminar_tarea(self, tarea: dict, error: Optional[str]) -> None:
+        """
+        Confirma o cancela una tarea ya escrita y avisa (privado)
+
+        Parámetros:
+        -----------
+        tarea : dict
+            Tarea que terminó
+        error : str | None
+            Mensaje de error, o None si se escribió bien
+        """
+        self._tarea_en_curso = None
+        if error is None:
+            self._gestor.confirmar_guardado(tarea)
+        else:
+            print(f"Error al guardar el inventario: {error}")
+            self._gestor.cancelar_guardado(tarea)
+        self._avisar(error is None, error)
+
+    def _avisar(self, exito: bool, error: Optional[str]) -> None:
+        """
+        Llama a la función al_terminar, si hay una (privado)
+        """
+        if self._al_terminar is not None:
+            self._al_terminar(exito, error)
+
+    # ==================== MÉTODO DEL HILO TRABAJADOR ====================
+
+    def _ejecutar(self) -> None:
+        """
+        Bucle del hilo trabajador (privado)
+        ==================================
+        Toma cada tarea de la cola, la escribe y deja el resultado en la
+        cola de resultados. Nunca toca el inventario ni la interfaz.
+        """
+        while True:
+            tarea = self._tareas.get()
+            if tarea is None:
+                # Señal para terminar (ver detener)
+                return
+            try:
+                self._gestor.ejecutar_guardado(tarea)
+                self._resultados.put((tarea, None))
+            except Exception as e:
+                self._resultados.put((tarea, str(e)))
@@ -0,0 +1,11 @@
+"""
+Paquete tests
+=============
+Pruebas automáticas del sistema de gestión de inventario AgroCol SAS.
+
+Se ejecutan desde la carpeta del proyecto con:
+
+    python -m unittest discover tests
+
+(o con pytest, si está instalado).
+"""
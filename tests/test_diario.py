@@ -0,0 +1,224 @@
+"""
+Módulo test_diario.py
+=====================
+Pruebas del modo diario de GestorPersistencia: los cambios se agregan a
+<archivo>.log y al cargar se vuelven a aplicar sobre la foto. También la
+compactación, que junta la foto con el diario en una foto nueva.
+
+Cada prueba trabaja en una carpeta temporal, así nunca toca el archivo
+inventario_agrocol.json del proyecto.
+
+Autor: Estudiante de Ingeniería en Desarrollo de Software
+Fecha: 2025
+"""
+
+# Importar módulos necesarios de Python
+import contextlib  # Para silenciar los mensajes que imprime el diario
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Importar las clases del sistema
+from src.modelos import Inventario, Producto, Proveedor
+from src.persistencia import GestorPersistencia
+from src.persistencia.diario import DiarioCambios
+
+
+class PruebaDiario(unittest.TestCase):
+    """
+    Clase base: carpeta temporal y un inventario pequeño ya guardado
+    """
+
+    def setUp(self):
+        """
+        Crea la carpeta temporal y guarda la primera foto del inventario
+        """
+        self.carpeta = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.carpeta, "inventario.json")
+        self.gestor = self.crear_gestor()
+
+        self.inventario = Inventario()
+        proveedor = Proveedor("PROV001", "Agroinsumos", "3001234567", "ventas@agro.com")
+        self.inventario.agregar_proveedor(proveedor)
+        self.inventario.agregar_producto(
+            Producto("FERT001", "Urea", "kg", "01/01/2025", proveedor, 2500.0, 100.0, 20.0))
+        self.assertTrue(self.gestor.guardar_inventario(self.inventario))
+
+    def tearDown(self):
+        """
+        Borra la carpeta temporal
+        """
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+    def crear_gestor(self, **opciones) -> GestorPersistencia:
+        """
+        Crea un gestor en modo diario sobre el archivo de la prueba
+        """
+        return GestorPersistencia(self.ruta, modo_diario=True, **opciones)
+
+    def recargar(self) -> Inventario:
+        """
+        Carga el inventario con un gestor nuevo (como al abrir la aplicación)
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.crear_gestor().cargar_inventario()
+
+
+class TestIdaYVuelta(PruebaDiario):
+    """
+    Lo que se guarda en el diario se recupera igual al cargar
+    """
+
+    def test_cambios_se_recuperan_al_cargar(self):
+        proveedor = self.inventario.obtener_proveedor("PROV001")
+        self.inventario.agregar_stock("FERT001", 15)
+        self.inventario.retirar_stock("FERT001", 5)
+        self.inventario.agregar_producto(
+            Producto("SEM001", "Semilla de maíz", "kg", "02/01/2025", proveedor, 9000.0, 3.0, 10.0))
+        self.assertTrue(self.gestor.guardar_inventario(self.inventario))
+
+        # Los cambios van al diario; la foto no se reescribe
+        self.assertTrue(os.path.exists(self.ruta + ".log"))
+
+        cargado = self.recargar()
+        self.assertEqual(cargado.to_dict(), self.inventario.to_dict())
+        self.assertEqual(cargado.obtener_producto("FERT001").cantidad, 110.0)
+
+    def test_eliminar_producto(self):
+        self.inventario.eliminar_producto("FERT001")
+        self.assertTrue(self.gestor.guardar_inventario(self.inventario))
+
+        self.assertIsNone(self.recargar().obtener_producto("FERT001"))
+
+    def test_varios_guardados_seguidos(self):
+        for _ in range(5):
+            self.inventario.agregar_stock("FERT001", 1)
+            self.assertTrue(self.gestor.guardar_inventario(self.inventario))
+
+        self.assertEqual(self.recargar().obtener_producto("FERT001").cantidad, 105.0)
+
+
+class TestFinalCortado(PruebaDiario):
+    """
+    Un cierre inesperado puede dejar la última línea del diario a medias
+    """
+
+    def cortar_diario(self):
+        """
+        Simula un cierre a mitad de una escritura: una línea sin terminar
+        """
+        with open(self.ruta + ".log", 'a', encoding='utf-8') as archivo:
+            archivo.write('{"s":99,"op":"st')
+
+    def test_linea_cortada_se_ignora(self):
+        self.inventario.agregar_stock("FERT001", 5)
+        self.assertTrue(self.gestor.guardar_inventario(self.inventario))
+        self.cortar_diario()
+
+        self.assertEqual(self.recargar().obtener_producto("FERT001").cantidad, 105.0)
+
+    def test_cambios_despues_del_corte_no_se_pierden(self):
+        self.inventario.agregar_stock("FERT001", 5)
+        self.assertTrue(self.gestor.guardar_inventario(self.inventario))
+        self.cortar_diario()
+
+        # Reabrir y seguir trabajando: el primer registro nuevo no debe
+        # quedar pegado a la línea cortada
+        gestor = self.crear_gestor()
+        with contextlib.redirect_stdout(io.StringIO()):
+            inventario = gestor.cargar_inventario()
+        inventario.agregar_stock("FERT001", 7)
+        self.assertTrue(gestor.guardar_inventario(inventario))
+
+        self.assertEqual(self.recargar().obtener_producto("FERT001").cantidad, 112.0)
+
+    def test_fsync_fallido_deja_el_diario_como_estaba(self):
+        self.inventario.agregar_stock("FERT001", 5)
+        self.assertTrue(self.gestor.guardar_inventario(self.inventario))
+        tamano_antes = os.path.getsize(self.ruta + ".log")
+
+        self.inventario.agregar_stock("FERT001", 3)
+        falla = OSError(28, "No queda espacio en el disco")
+        with mock.patch('os.fsync', side_effect=falla), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(self.gestor.guardar_inventario(self.inventario))
+
+        # ftruncate recortó lo escrito antes del fsync fallido
+        self.assertEqual(os.path.getsize(self.ruta + ".log"), tamano_antes)
+
+        # Al reintentar, el cambio queda escrito UNA sola vez
+        self.assertTrue(self.gestor.guardar_inventario(self.inventario))
+        self.assertEqual(self.recargar().obtener_producto("FERT001").cantidad, 108.0)
+
+
+class TestCompactacion(PruebaDiario):
+    """
+    Después de compactar, cargar da el mismo inventario
+    """
+
+    def agregar_y_guardar(self, veces: int, gestor=None):
+        """
+        Suma 1 al stock de FERT001 y guarda, 'veces' veces
+        """
+        gestor = gestor or self.gestor
+        for _ in range(veces):
+            self.inventario.agregar_stock("FERT001", 1)
+            self.assertTrue(gestor.guardar_inventario(self.inventario))
+
+    def test_cambios_despues_de_compactar(self):
+        self.agregar_y_guardar(5)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(self.gestor.compactar(en_segundo_plano=False))
+        self.assertFalse(os.path.exists(self.ruta + ".log.1"))
+
+        # Los cambios nuevos van a un diario vacío, encima de la foto nueva
+        self.agregar_y_guardar(3)
+        cargado = self.recargar()
+        self.assertEqual(cargado.obtener_producto("FERT001").cantidad, 108.0)
+        self.assertEqual(cargado.to_dict(), self.inventario.to_dict())
+
+    def test_compactacion_en_segundo_plano(self):
+        # Con un límite de 10 registros la compactación se dispara sola
+        # mientras se siguen agregando cambios
+        self.gestor = self.crear_gestor(max_registros_diario=10)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.inventario = self.gestor.cargar_inventario()
+            self.agregar_y_guardar(35)
+            self.gestor.esperar_compactacion()
+
+        # La foto ya incluye parte de los cambios
+        with open(self.ruta, 'r', encoding='utf-8') as archivo:
+            self.assertGreater(json.load(archivo)['secuencia'], 0)
+        self.assertEqual(self.recargar().obtener_producto("FERT001").cantidad, 135.0)
+
+    def test_compactacion_fallida_conserva_el_segmento(self):
+        self.agregar_y_guardar(4)
+        # Un error de disco al leer el segmento corta la compactación
+        with mock.patch.object(DiarioCambios, 'leer_rotado',
+                               side_effect=OSError(5, "Error de entrada/salida")), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.gestor.compactar(en_segundo_plano=False)
+        self.assertTrue(os.path.exists(self.ruta + ".log.1"))
+
+        # Al cargar se aplican el segmento rotado y después el diario nuevo
+        self.agregar_y_guardar(2)
+        self.assertEqual(self.recargar().obtener_producto("FERT001").cantidad, 106.0)
+
+    def test_segmento_ya_incluido_no_se_aplica_dos_veces(self):
+        # Cierre justo después de reemplazar la foto: el segmento rotado
+        # sigue en disco aunque sus cambios ya están en la foto nueva
+        self.agregar_y_guardar(4)
+        with mock.patch.object(DiarioCambios, 'eliminar_rotado'), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.gestor.compactar(en_segundo_plano=False)
+        self.assertTrue(os.path.exists(self.ruta + ".log.1"))
+
+        self.assertEqual(self.recargar().obtener_producto("FERT001").cantidad, 104.0)
+
+
+if __name__ == '__main__':
+    unittest.main()